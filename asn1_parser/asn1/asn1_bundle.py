@@ -1,6 +1,9 @@
 from typing import List, Optional, Dict, Set
 
 from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.grammar_elements.definitions import Definitions
+from asn1_parser.asn1.layout_engine import LayoutEngine, SequenceLayout
+from asn1_parser.asn1.symbol_table import SymbolTable
 from asn1_parser.generators.cfs.module_sorter import ModuleSorter
 
 
@@ -9,23 +12,51 @@ class ASN1Bundle:
         self,
         modules: List[Asn1Module],
         simple_defs_used: Dict[str, Set[str]],
+        symbol_table: Optional[SymbolTable] = None,
     ) -> None:
         self.modules = modules
         self.simple_def_uses: Dict[str, Set[str]] = simple_defs_used
+        if symbol_table is None:
+            symbol_table = SymbolTable(modules)
+        self.symbol_table = symbol_table
+        self.modules_ordered: Optional[List[Asn1Module]] = None
+        self.definitions_ordered: Dict[str, List[Definitions]] = {}
+        self.layout_engine = LayoutEngine(symbol_table)
 
     def get_module(self, module_name: str) -> Optional[Asn1Module]:
         assert len(self.modules) > 0
-        for module in self.modules:
-            if module.get_module_name() == module_name:
-                return module
-        return None
+        return self.symbol_table.get_module(module_name)
+
+    def get_symbol_table(self) -> SymbolTable:
+        return self.symbol_table
 
     def get_modules(self) -> List[Asn1Module]:
         return self.modules
 
     def get_modules_ordered(self) -> List[Asn1Module]:
-        copy_of_module_list = self.get_modules().copy()
-        return ModuleSorter.create_ordered_import_list(copy_of_module_list)
+        if self.modules_ordered is None:
+            self.modules_ordered = ModuleSorter.create_ordered_import_list(
+                self.get_modules()
+            )
+        return self.modules_ordered
+
+    def get_definitions_ordered(self, module: Asn1Module) -> List[Definitions]:
+        """
+        Returns the definitions of the module, each one after the definitions
+        it uses. The order is computed once per module.
+        """
+        module_name = module.get_module_name()
+        if module_name not in self.definitions_ordered:
+            self.definitions_ordered[
+                module_name
+            ] = ModuleSorter.get_definitions_sorted_by_dependency(module)
+        return self.definitions_ordered[module_name]
+
+    def get_layout(self, type_name: str) -> SequenceLayout:
+        """
+        Returns the layout of the SEQUENCE, computed once per bundle.
+        """
+        return self.layout_engine.get_layout(type_name)
 
     def get_modules_names(self) -> List[str]:
         return [module.get_module_name() for module in self.modules]
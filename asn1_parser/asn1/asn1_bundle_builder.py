@@ -1,20 +1,28 @@
+import os
 from typing import Dict, Tuple, List, Optional, Union, Set
 from collections import Counter
 
 from asn1_parser.asn1.asn1_bundle import ASN1Bundle
+from asn1_parser.asn1.grammar_elements.array import Array
+from asn1_parser.asn1.grammar_elements.asn1_type import Asn1Type
 from asn1_parser.asn1.grammar_elements.choice import Choice
 from asn1_parser.asn1.grammar_elements.enumerated import Enumerated
 from asn1_parser.asn1.grammar_elements.key_type_pair import KeyTypePair
 from asn1_parser.asn1.grammar_elements.simple_definition import SimpleDefinition
 from asn1_parser.asn1.validation.asn1_bundle_validator import (
     ASN1BundleValidator,
-    ASN1ConsistencyError,
 )
+from asn1_parser.asn1.validation.errors import ASN1ConsistencyError
 from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
-from asn1_parser.asn1.grammar_elements.definitions import Definitions
 from asn1_parser.asn1.grammar_elements.sequence import Sequence
+from asn1_parser.asn1.module_index import ModuleIndex
+from asn1_parser.asn1.parse_cache import ParseCache
+from asn1_parser.asn1.validation.validation_cache import ValidationCache
 from asn1_parser.asn1.parser import Asn1Parser
+from asn1_parser.asn1.symbol_table import SymbolTable
+from asn1_parser.cli.manifest import GenerationJobConfig, Manifest
 from asn1_parser.cli.cli_arg_parser import (
+    GenerateAllCommandConfig,
     GenerateBinaryCommandConfig,
     GenerateCCommandConfig,
     GenerateCosmosCommandConfig,
@@ -23,6 +31,8 @@ from asn1_parser.cli.cli_arg_parser import (
 
 
 class ASN1BundleBuilder:
+    _INDEX_FILE_NAME = "module-index.json"
+
     @staticmethod
     def build(modules: List[Asn1Module]) -> ASN1Bundle:
         asn_models: Dict[str, Tuple[Asn1Module, Optional[List[str]]]] = {}
@@ -42,74 +52,186 @@ class ASN1BundleBuilder:
 
         ASN1BundleBuilder._resolve_dependencies(asn_models)
 
-        ASN1BundleBuilder._resolve_types(modules)
+        symbol_table = SymbolTable(modules)
+        ASN1BundleBuilder._resolve_types(modules, symbol_table)
 
-        return ASN1Bundle(modules, bundle_simple_defs_used)
+        return ASN1Bundle(modules, bundle_simple_defs_used, symbol_table)
 
     @staticmethod
-    def build_from_cfs_config(config: GenerateCFSCommandConfig) -> ASN1Bundle:
-        modules: List[Asn1Module] = Asn1Parser.parse_from_files(
-            *config.input_paths
+    def build_from_cfs_config(
+        config: GenerateCFSCommandConfig,
+        parse_cache: Optional[ParseCache] = None,
+    ) -> ASN1Bundle:
+        modules = ASN1BundleBuilder._parse_input_files(
+            config.input_paths, config.jobs, config.fast_parser, parse_cache
         )
 
         ASN1BundleBuilder._validate_unique_module_names(modules, config)
         bundle = ASN1BundleBuilder.build(modules)
-        ASN1BundleValidator.validate_bundle_from_config(config, bundle)
+        ASN1BundleValidator.validate_bundle_from_config(
+            config, bundle, ASN1BundleBuilder._get_validation_cache(parse_cache)
+        )
 
         return bundle
 
     @staticmethod
     def build_from_cosmos_config(
         config: GenerateCosmosCommandConfig,
+        parse_cache: Optional[ParseCache] = None,
     ) -> ASN1Bundle:
-        modules: List[Asn1Module] = Asn1Parser.parse_from_files(
-            *config.input_paths
+        # Only the generated module and the modules it imports are needed.
+        modules = ASN1BundleBuilder._parse_input_files(
+            config.input_paths,
+            config.jobs,
+            config.fast_parser,
+            parse_cache,
+            root_module_names=config.asn1_modules,
         )
 
         bundle = ASN1BundleBuilder.build(modules)
-        ASN1BundleValidator.validate_bundle(bundle)
+        ASN1BundleValidator.validate_bundle(
+            bundle, ASN1BundleBuilder._get_validation_cache(parse_cache)
+        )
 
         return bundle
 
     @staticmethod
-    def build_from_c_config(config: GenerateCCommandConfig) -> ASN1Bundle:
-        modules: List[Asn1Module] = Asn1Parser.parse_from_files(
-            *config.input_paths
+    def build_from_c_config(
+        config: GenerateCCommandConfig,
+        parse_cache: Optional[ParseCache] = None,
+    ) -> ASN1Bundle:
+        modules = ASN1BundleBuilder._parse_input_files(
+            config.input_paths, config.jobs, config.fast_parser, parse_cache
         )
 
         ASN1BundleBuilder._validate_unique_module_names(modules, config)
         bundle = ASN1BundleBuilder.build(modules)
-        ASN1BundleValidator.validate_bundle_from_config(config, bundle)
+        ASN1BundleValidator.validate_bundle_from_config(
+            config, bundle, ASN1BundleBuilder._get_validation_cache(parse_cache)
+        )
 
         return bundle
 
     @staticmethod
     def build_from_binary_config(
         config: GenerateBinaryCommandConfig,
+        parse_cache: Optional[ParseCache] = None,
     ) -> ASN1Bundle:
-        modules: List[Asn1Module] = Asn1Parser.parse_from_files(
-            *config.input_paths
+        modules = ASN1BundleBuilder._parse_input_files(
+            config.input_paths, config.jobs, config.fast_parser, parse_cache
         )
 
         ASN1BundleBuilder._validate_unique_module_names(modules, config)
         bundle = ASN1BundleBuilder.build(modules)
-        ASN1BundleValidator.validate_bundle_from_config(config, bundle)
+        ASN1BundleValidator.validate_bundle_from_config(
+            config, bundle, ASN1BundleBuilder._get_validation_cache(parse_cache)
+        )
+
+        return bundle
+
+    @staticmethod
+    def build_from_manifest(
+        config: GenerateAllCommandConfig,
+        manifest: Manifest,
+        parse_cache: Optional[ParseCache] = None,
+    ) -> ASN1Bundle:
+        """
+        Parses and validates the input files of the manifest once, for all
+        its jobs.
+        """
+        modules = ASN1BundleBuilder._parse_input_files(
+            manifest.get_input_paths(),
+            config.jobs,
+            config.fast_parser,
+            parse_cache,
+        )
+
+        job_configs = manifest.get_job_configs()
+        for job_config in job_configs:
+            if not isinstance(job_config, GenerateCosmosCommandConfig):
+                ASN1BundleBuilder._validate_unique_module_names(
+                    modules, job_config
+                )
+        bundle = ASN1BundleBuilder.build(modules)
+        ASN1BundleValidator.validate_bundle(
+            bundle, ASN1BundleBuilder._get_validation_cache(parse_cache)
+        )
+        for job_config in job_configs:
+            if not isinstance(job_config, GenerateCosmosCommandConfig):
+                ASN1BundleValidator.check_missing_modules(job_config, bundle)
 
         return bundle
 
     @staticmethod
     def build_from_texts(
         texts: List[str],
+        config: Optional[GenerationJobConfig] = None,
     ) -> ASN1Bundle:
+        """
+        With the config of a generator, the texts are parsed and validated
+        as its input files would be.
+        """
         modules: List[Asn1Module] = Asn1Parser.parse_from_text_multimodule(
-            texts
+            texts, use_fast_parser=config is not None and config.fast_parser
         )
 
-        bundle = ASN1BundleBuilder.build(modules)
-        ASN1BundleValidator.validate_bundle(bundle)
+        if config is None or isinstance(config, GenerateCosmosCommandConfig):
+            bundle = ASN1BundleBuilder.build(modules)
+            ASN1BundleValidator.validate_bundle(bundle)
+        else:
+            ASN1BundleBuilder._validate_unique_module_names(modules, config)
+            bundle = ASN1BundleBuilder.build(modules)
+            ASN1BundleValidator.validate_bundle_from_config(config, bundle)
 
         return bundle
 
+    @staticmethod
+    def _get_validation_cache(
+        parse_cache: Optional[ParseCache],
+    ) -> Optional[ValidationCache]:
+        if parse_cache is None:
+            return None
+        return parse_cache.get_validation_cache()
+
+    @staticmethod
+    def _parse_input_files(
+        input_paths: List[str],
+        jobs: int,
+        fast_parser: bool,
+        parse_cache: Optional[ParseCache],
+        root_module_names: Optional[List[str]] = None,
+    ) -> List[Asn1Module]:
+        """
+        Parses the input files, folders expanded. With root_module_names,
+        only these modules and the modules they import are parsed.
+        """
+        index_path: Optional[str] = None
+        if parse_cache is not None:
+            index_path = os.path.join(
+                parse_cache.get_cache_dir(), ASN1BundleBuilder._INDEX_FILE_NAME
+            )
+        module_index = ModuleIndex(input_paths, index_path)
+
+        def parse_files(file_paths: List[str]) -> List[Asn1Module]:
+            if parse_cache is None:
+                modules = Asn1Parser.parse_from_files(
+                    *file_paths, jobs=jobs, use_fast_parser=fast_parser
+                )
+            else:
+                modules = parse_cache.parse_from_files(
+                    *file_paths, jobs=jobs, use_fast_parser=fast_parser
+                )
+            # one module per file, in the order of the files
+            for file_path, module in zip(file_paths, modules):
+                module.set_file_path(file_path)
+            return modules
+
+        if root_module_names is None:
+            return parse_files(module_index.get_file_paths())
+        return module_index.load_reachable_modules(
+            root_module_names, parse_files
+        )
+
     @staticmethod
     def _filter_dependencies(
         module: Asn1Module,
@@ -140,23 +262,34 @@ class ASN1BundleBuilder:
                     module.add_imported_module(asn_models[dependency][0])
 
     @staticmethod
-    def _resolve_types(modules: List[Asn1Module]) -> None:
+    def _resolve_types(
+        modules: List[Asn1Module], symbol_table: SymbolTable
+    ) -> None:
         """
         Walk all the types and fix the ones which only have the name as a string
-        (t.asn1_type.type is None).
+        (t.asn1_type.type is None): the fields of SEQUENCE and CHOICE, the
+        elements of arrays and the types of simple definitions. Types of the
+        ASN.1 builtins keep None.
         Useful when calling get_size_bits() on a type.
         """
-        all_definitions: Dict[str, Definitions] = {}
         for module in modules:
             for definition in module.get_definitions():
-                all_definitions[definition.get_type_name()] = definition
-
-        for definition in all_definitions.values():
-            if isinstance(definition, Sequence):
-                for member in definition.get_children():
-                    typ = member.get_asn_type()
+                asn_types: List[Asn1Type] = []
+                if isinstance(definition, (Sequence, Choice)):
+                    asn_types = [
+                        member.get_asn_type()
+                        for member in definition.get_children()
+                    ]
+                elif isinstance(definition, SimpleDefinition):
+                    asn_types = [definition.get_asn_type()]
+
+                for typ in asn_types:
+                    while isinstance(typ.get_type(), Array):
+                        typ = typ.get_type().get_asn_type()
                     if typ.get_type() is None:
-                        type_def = all_definitions.get(typ.get_type_name())
+                        type_def = symbol_table.get_definition(
+                            typ.get_type_name()
+                        )
                         typ.set_type(type_def)
 
     @staticmethod
@@ -0,0 +1,585 @@
+import re
+from typing import (
+    Any,
+    Callable,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from asn1_parser.asn1.grammar_elements.array import Array
+from asn1_parser.asn1.grammar_elements.asn1_comment import Asn1Comment
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.grammar_elements.asn1_string import Asn1String
+from asn1_parser.asn1.grammar_elements.asn1_type import Asn1Type
+from asn1_parser.asn1.grammar_elements.choice import Choice
+from asn1_parser.asn1.grammar_elements.components_item import (
+    ComponentsItem,
+    ComponentsItemLast,
+    ComponentsItemNotLast,
+)
+from asn1_parser.asn1.grammar_elements.definitions import Definitions
+from asn1_parser.asn1.grammar_elements.enumerated import Enumerated
+from asn1_parser.asn1.grammar_elements.enumerated_item import (
+    EnumeratedItem,
+    EnumeratedItemLast,
+    EnumeratedItemNotLast,
+)
+from asn1_parser.asn1.grammar_elements.import_item import ImportItem
+from asn1_parser.asn1.grammar_elements.key_type_pair import (
+    KeyTypePair,
+    KeyTypePairLast,
+    KeyTypePairNotLast,
+)
+from asn1_parser.asn1.grammar_elements.sequence import Sequence
+from asn1_parser.asn1.grammar_elements.simple_definition import SimpleDefinition
+from asn1_parser.asn1.grammar_elements.with_components import WithComponents
+
+_T = TypeVar("_T")
+
+# The terminals of GRAMMAR (asn1_parser/asn1/grammar.py) and of the textX base
+# types it uses. They must be kept in sync with the grammar: the differential
+# test compares both parsers on every module of the test suites.
+_WHITESPACE = re.compile(r"[\t\n\r ]*")
+_NAME_LOWER = re.compile(r"[a-z][a-z\d]*(-[a-z\d]+)*", re.MULTILINE)
+_NAME_CAPITAL = re.compile(r"[A-Z][a-z\d]*(-[a-z\d]+)*", re.MULTILINE)
+_INT = re.compile(r"[-+]?[0-9]+\b", re.MULTILINE)
+_STRICTFLOAT = re.compile(
+    r"[+-]?(((\d+\.(\d*)?|\.\d+)([eE][+-]?\d+)?)|((\d+)([eE][+-]?\d+)))"
+    r"(?<=[\w\.])(?![\w\.])",
+    re.MULTILINE,
+)
+_SPACES = re.compile(r" *")
+_UNIT = re.compile(r"[%A-Za-z\d\/\^]+", re.MULTILINE)
+_COMMENT = re.compile(r"[A-Za-z0-9\*\(\)\.\/%:, -_]+$", re.MULTILINE)
+
+
+class FastParserError(Exception):
+    """
+    Raised when the fast parser meets input it does not handle. The caller is
+    expected to parse the input again with textX, which reports the error.
+    """
+
+
+class _NoMatch(Exception):
+    # Raised, and caught, on every failed alternative: it carries no message
+    # so that backtracking stays cheap.
+    pass
+
+
+_NO_MATCH = _NoMatch()
+
+
+def _allocate(cls: Type[_T]) -> _T:
+    # Like textX, objects are allocated before their children are parsed, so
+    # that the children can be given their parent, and initialized once all
+    # their attributes are known.
+    instance: _T = cls.__new__(cls)
+    return instance
+
+
+class FastParser:
+    """
+    Hand-written recursive descent parser for GRAMMAR.
+
+    It follows the PEG semantics textX gives to the grammar (ordered choices,
+    greedy repetitions, whitespace skipped before every terminal except in
+    the noskipws rules), so whenever it accepts a module, textX would have
+    built the same objects. It does not run the processors: see
+    ModelWalker.get_processing_order.
+    """
+
+    def __init__(self, input_text: str) -> None:
+        self._text = input_text
+        self._position = 0
+        self._furthest_position = 0
+
+    def parse(self) -> Asn1Module:
+        try:
+            return self._parse_module()
+        except _NoMatch:
+            line = self._text.count("\n", 0, self._furthest_position) + 1
+            column = self._furthest_position - (
+                self._text.rfind("\n", 0, self._furthest_position)
+            )
+            raise FastParserError(  # pylint: disable=raise-missing-from
+                f"unexpected input at {line}:{column}"
+            )
+
+    #####
+    # terminals
+    #####
+
+    def _fail(self) -> _NoMatch:
+        if self._position > self._furthest_position:
+            self._furthest_position = self._position
+        # Raising the same instance again would extend its traceback, which
+        # keeps every frame it went through alive.
+        return _NO_MATCH.with_traceback(None)
+
+    def _skip_whitespace(self) -> None:
+        match = _WHITESPACE.match(self._text, self._position)
+        assert match is not None
+        self._position = match.end()
+
+    def _skip_spaces(self) -> None:
+        # (' ')* in the noskipws rules
+        match = _SPACES.match(self._text, self._position)
+        assert match is not None
+        self._position = match.end()
+
+    def _literal(self, literal: str, skip_whitespace: bool = True) -> None:
+        if skip_whitespace:
+            self._skip_whitespace()
+        if not self._text.startswith(literal, self._position):
+            raise self._fail()
+        self._position += len(literal)
+
+    def _optional_literal(self, literal: str) -> bool:
+        # only used in noskipws rules
+        if not self._text.startswith(literal, self._position):
+            return False
+        self._position += len(literal)
+        return True
+
+    def _regex(
+        self, pattern: Pattern[str], skip_whitespace: bool = True
+    ) -> str:
+        if skip_whitespace:
+            self._skip_whitespace()
+        match = pattern.match(self._text, self._position)
+        if match is None or not match.group():
+            raise self._fail()
+        self._position = match.end()
+        return match.group()
+
+    def _int(self, skip_whitespace: bool = True) -> int:
+        return int(self._regex(_INT, skip_whitespace))
+
+    def _strict_float(self, skip_whitespace: bool = True) -> float:
+        return float(self._regex(_STRICTFLOAT, skip_whitespace))
+
+    #####
+    # repetitions
+    #####
+
+    def _optional(self, parse: Callable[[], _T]) -> Optional[_T]:
+        position = self._position
+        try:
+            return parse()
+        except _NoMatch:
+            self._position = position
+            return None
+
+    def _zero_or_more(self, parse: Callable[[], _T]) -> List[_T]:
+        results: List[_T] = []
+        while True:
+            position = self._position
+            try:
+                results.append(parse())
+            except _NoMatch:
+                self._position = position
+                return results
+
+    def _one_or_more(
+        self, parse: Callable[[], _T], separator: Optional[str] = None
+    ) -> List[_T]:
+        results = [parse()]
+        while True:
+            position = self._position
+            try:
+                if separator is not None:
+                    self._literal(separator)
+                results.append(parse())
+            except _NoMatch:
+                self._position = position
+                return results
+
+    #####
+    # rules
+    #####
+
+    def _parse_module(self) -> Asn1Module:
+        module = _allocate(Asn1Module)
+        self._literal("Module-")
+        module_name = self._regex(_NAME_LOWER)
+        self._literal("DEFINITIONS AUTOMATIC TAGS ::= BEGIN")
+        comment = self._parse_optional_comment(module)
+
+        import_items: List[ImportItem] = []
+        comment_import: Optional[Asn1Comment] = None
+        position = self._position
+        try:
+            self._literal("IMPORTS")
+            import_items = self._one_or_more(
+                lambda: self._parse_import_item(module)
+            )
+            self._literal(";")
+            comment_import = self._parse_optional_comment(module)
+        except _NoMatch:
+            self._position = position
+            import_items = []
+            comment_import = None
+
+        definitions = self._one_or_more(lambda: self._parse_definition(module))
+        self._literal("END")
+        self._skip_whitespace()
+        if self._position != len(self._text):
+            raise self._fail()
+
+        Asn1Module.__init__(
+            module,
+            module_name=module_name,
+            definitions=definitions,
+            comment=comment,
+            comment_import=comment_import,
+            import_items=import_items,
+        )
+        return module
+
+    def _parse_import_item(self, parent: Asn1Module) -> ImportItem:
+        import_item = _allocate(ImportItem)
+        definitions = self._one_or_more(
+            lambda: self._regex(_NAME_CAPITAL), separator=","
+        )
+        self._literal("FROM Module-")
+        module_name = self._regex(_NAME_LOWER)
+        comment = self._parse_optional_comment(import_item)
+        ImportItem.__init__(
+            import_item,
+            definitions=definitions,
+            module_name=module_name,
+            comment=comment,
+            parent=parent,
+        )
+        return import_item
+
+    def _parse_optional_comment(self, parent: Any) -> Asn1Comment:
+        # Like textX, None when there is no comment, although the grammar
+        # elements annotate their comment as always present.
+        return cast(
+            Asn1Comment, self._optional(lambda: self._parse_comment(parent))
+        )
+
+    def _parse_comment(self, parent: Any) -> Asn1Comment:
+        # noskipws
+        comment = _allocate(Asn1Comment)
+        self._skip_spaces()
+        self._literal("--", skip_whitespace=False)
+        self._skip_spaces()
+        is_little_endian = self._optional_literal("ENDIANNESS(LITTLE)")
+        self._skip_spaces()
+
+        unit = ""
+        position = self._position
+        try:
+            self._literal("[", skip_whitespace=False)
+            unit = self._regex(_UNIT, skip_whitespace=False)
+            self._literal("]", skip_whitespace=False)
+        except _NoMatch:
+            self._position = position
+            unit = ""
+        self._skip_spaces()
+
+        text = self._optional(
+            lambda: self._regex(_COMMENT, skip_whitespace=False)
+        )
+        Asn1Comment.__init__(
+            comment,
+            parent=parent,
+            comment=text if text is not None else "",
+            unit=unit,
+            is_little_endian=is_little_endian,
+        )
+        return comment
+
+    def _parse_definition(self, parent: Asn1Module) -> Definitions:
+        parse_alternatives: List[Callable[[Asn1Module], Definitions]] = [
+            self._parse_choice,
+            self._parse_enumerated,
+            self._parse_sequence,
+            self._parse_simple_definition,
+        ]
+        position = self._position
+        for parse_alternative in parse_alternatives:
+            try:
+                return parse_alternative(parent)
+            except _NoMatch:
+                self._position = position
+        raise self._fail()
+
+    def _parse_enumerated(self, parent: Asn1Module) -> Enumerated:
+        enumerated = _allocate(Enumerated)
+        type_name = self._regex(_NAME_CAPITAL)
+        self._literal("::= ENUMERATED {")
+        comment = self._parse_optional_comment(enumerated)
+        enum: List[EnumeratedItem] = self._zero_or_more(
+            lambda: self._parse_enumerated_item(
+                EnumeratedItemNotLast, enumerated
+            )
+        )
+        enum.append(self._parse_enumerated_item(EnumeratedItemLast, enumerated))
+        self._literal("}")
+        Enumerated.__init__(
+            enumerated,
+            type_name=type_name,
+            comment=comment,
+            parent=parent,
+            enum=enum,
+        )
+        return enumerated
+
+    def _parse_enumerated_item(
+        self, item_class: Type[EnumeratedItem], parent: Enumerated
+    ) -> EnumeratedItem:
+        item = _allocate(item_class)
+        key = self._regex(_NAME_LOWER)
+        pos = 0
+        position = self._position
+        try:
+            self._literal("(")
+            pos = self._int()
+            self._literal(")")
+        except _NoMatch:
+            self._position = position
+            pos = 0
+        if item_class is EnumeratedItemNotLast:
+            self._literal(",")
+        comment = self._parse_optional_comment(item)
+        EnumeratedItem.__init__(
+            item, key=key, pos=pos, comment=comment, parent=parent
+        )
+        return item
+
+    def _parse_choice(self, parent: Asn1Module) -> Choice:
+        choice = _allocate(Choice)
+        type_name, comment, members = self._parse_members(
+            choice, "::= CHOICE {"
+        )
+        Choice.__init__(
+            choice,
+            type_name=type_name,
+            comment=comment,
+            parent=parent,
+            choice=members,
+        )
+        return choice
+
+    def _parse_sequence(self, parent: Asn1Module) -> Sequence:
+        sequence = _allocate(Sequence)
+        type_name, comment, members = self._parse_members(
+            sequence, "::= SEQUENCE {"
+        )
+        Sequence.__init__(
+            sequence,
+            type_name=type_name,
+            comment=comment,
+            parent=parent,
+            seq=members,
+        )
+        return sequence
+
+    def _parse_members(
+        self, definition: Union[Choice, Sequence], header: str
+    ) -> Tuple[str, Asn1Comment, List[KeyTypePair]]:
+        type_name = self._regex(_NAME_CAPITAL)
+        self._literal(header)
+        comment = self._parse_optional_comment(definition)
+        members: List[KeyTypePair] = self._zero_or_more(
+            lambda: self._parse_key_type_pair(KeyTypePairNotLast, definition)
+        )
+        members.append(self._parse_key_type_pair(KeyTypePairLast, definition))
+        self._literal("}")
+        return type_name, comment, members
+
+    def _parse_simple_definition(self, parent: Asn1Module) -> SimpleDefinition:
+        definition = _allocate(SimpleDefinition)
+        type_name = self._regex(_NAME_CAPITAL)
+        self._literal("::=")
+        asn_type = self._parse_asn1_type(definition)
+        comment = self._parse_optional_comment(definition)
+        SimpleDefinition.__init__(
+            definition,
+            type_name=type_name,
+            comment=comment,
+            parent=parent,
+            asn_type=asn_type,
+        )
+        return definition
+
+    def _parse_key_type_pair(
+        self, pair_class: Type[KeyTypePair], parent: Any
+    ) -> KeyTypePair:
+        key_type_pair = _allocate(pair_class)
+        key = self._regex(_NAME_LOWER)
+        asn_type = self._parse_asn1_type(key_type_pair)
+        with_components: Optional[WithComponents] = None
+
+        if pair_class is KeyTypePairNotLast:
+            # key asn_type ',' comment? | key asn_type comment? WITH ',': both
+            # alternatives start the same way, only the end is retried
+            position = self._position
+            try:
+                self._literal(",")
+                comment = self._parse_optional_comment(key_type_pair)
+            except _NoMatch:
+                self._position = position
+                comment = self._parse_optional_comment(key_type_pair)
+                with_components = self._parse_with_components(key_type_pair)
+                self._literal(",")
+        else:
+            comment = self._parse_optional_comment(key_type_pair)
+            with_components = self._optional(
+                lambda: self._parse_with_components(key_type_pair)
+            )
+
+        KeyTypePair.__init__(
+            key_type_pair,
+            key=key,
+            asn_type=asn_type,
+            comment=comment,
+            with_components=with_components,  # type: ignore
+            parent=parent,
+        )
+        return key_type_pair
+
+    def _parse_asn1_type(self, parent: Any) -> Asn1Type:
+        # noskipws, including the rules it uses
+        asn_type = _allocate(Asn1Type)
+        self._literal(" ", skip_whitespace=False)
+        begin: Any = None
+        end: Any = None
+        type_name: Any
+
+        if self._optional_literal("REAL"):
+            type_name = "REAL"
+            position = self._position
+            try:
+                self._literal("(", skip_whitespace=False)
+                begin = self._strict_float(skip_whitespace=False)
+                self._literal(" .. ", skip_whitespace=False)
+                end = self._strict_float(skip_whitespace=False)
+                self._literal(")", skip_whitespace=False)
+            except _NoMatch:
+                self._position = position
+                begin = end = None
+        elif self._optional_literal("INTEGER"):
+            type_name = "INTEGER"
+            position = self._position
+            try:
+                self._literal("(", skip_whitespace=False)
+                begin = self._int(skip_whitespace=False)
+                self._literal("..", skip_whitespace=False)
+                end = self._int(skip_whitespace=False)
+                self._literal(")", skip_whitespace=False)
+            except _NoMatch:
+                self._position = position
+                begin = end = None
+        elif self._optional_literal("NULL"):
+            type_name = "NULL"
+        elif self._optional_literal("BOOLEAN"):
+            type_name = "BOOLEAN"
+        else:
+            type_name = self._optional(
+                lambda: self._parse_asn1_string(asn_type)
+            )
+            if type_name is None:
+                type_name = self._optional(lambda: self._parse_array(asn_type))
+            if type_name is None:
+                type_name = self._regex(_NAME_CAPITAL, skip_whitespace=False)
+
+        Asn1Type.__init__(
+            asn_type, begin=begin, end=end, type_name=type_name, parent=parent
+        )
+        return asn_type
+
+    def _parse_asn1_string(self, parent: Asn1Type) -> Asn1String:
+        asn1_string = _allocate(Asn1String)
+        if self._optional_literal("IA5String"):
+            type_name = "IA5String"
+        elif self._optional_literal("NumericString"):
+            type_name = "NumericString"
+        else:
+            raise self._fail()
+        self._literal(" (SIZE (", skip_whitespace=False)
+        length = self._int(skip_whitespace=False)
+        self._literal("))", skip_whitespace=False)
+        Asn1String.__init__(
+            asn1_string, length=length, type_name=type_name, parent=parent
+        )
+        return asn1_string
+
+    def _parse_array(self, parent: Asn1Type) -> Array:
+        array = _allocate(Array)
+        self._literal("SEQUENCE (SIZE (", skip_whitespace=False)
+        length = self._int(skip_whitespace=False)
+        self._literal(")) OF", skip_whitespace=False)
+        asn_type = self._parse_asn1_type(array)
+        Array.__init__(array, asn_type=asn_type, length=length, parent=parent)
+        return array
+
+    def _parse_with_components(self, parent: Any) -> WithComponents:
+        with_components = _allocate(WithComponents)
+        self._literal("(WITH COMPONENTS {")
+        comment = self._parse_optional_comment(with_components)
+        components: List[ComponentsItem] = self._zero_or_more(
+            lambda: self._parse_components_item(
+                ComponentsItemNotLast, with_components
+            )
+        )
+        components.append(
+            self._parse_components_item(ComponentsItemLast, with_components)
+        )
+        self._literal("})")
+        WithComponents.__init__(
+            with_components,
+            components=components,
+            comment=comment,
+            parent=parent,
+        )
+        return with_components
+
+    def _parse_components_item(
+        self, item_class: Type[ComponentsItem], parent: WithComponents
+    ) -> ComponentsItem:
+        item = _allocate(item_class)
+        key = self._regex(_NAME_LOWER)
+        value = self._parse_components_value(item)
+        if item_class is ComponentsItemNotLast:
+            self._literal(",")
+        comment = self._parse_optional_comment(item)
+        ComponentsItem.__init__(
+            item,
+            key=key,
+            value=value,
+            comment=comment,
+            parent=parent,
+        )
+        return item
+
+    def _parse_components_value(self, parent: ComponentsItem) -> Any:
+        parse_values: List[Callable[[], Any]] = [
+            self._int,
+            self._strict_float,
+            lambda: self._keyword("TRUE"),
+            lambda: self._keyword("FALSE"),
+        ]
+        position = self._position
+        for parse_value in parse_values:
+            try:
+                self._literal("(")
+                value = parse_value()
+                self._literal(")")
+                return value
+            except _NoMatch:
+                self._position = position
+        return self._parse_with_components(parent)
+
+    def _keyword(self, keyword: str) -> str:
+        self._literal(keyword)
+        return keyword
@@ -2,6 +2,8 @@ from typing import Any
 
 
 class Asn1Comment:
+    __slots__ = ("_comment", "_unit", "_is_little_endian", "_parent")
+
     def __init__(
         self, parent: Any, comment: str, unit: str, is_little_endian: bool
     ) -> None:
@@ -27,3 +29,18 @@ class Asn1Comment:
 
     def get_parent(self) -> Any:
         return self._parent
+
+    # Without __dict__, textX reads the attributes of the rule through these
+    # properties.
+
+    @property
+    def comment(self) -> str:
+        return self._comment
+
+    @property
+    def unit(self) -> str:
+        return self._unit
+
+    @property
+    def is_little_endian(self) -> bool:
+        return self._is_little_endian
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from asn1_parser.asn1.grammar_elements.asn1_comment import Asn1Comment
 from asn1_parser.asn1.grammar_elements.definitions import Definitions
@@ -6,7 +6,7 @@ from asn1_parser.asn1.grammar_elements.import_item import ImportItem
 from asn1_parser.log.logger import Logger
 
 
-class Asn1Module:
+class Asn1Module:  # pylint: disable=too-many-instance-attributes
     _logger = Logger(__name__)
     PREDEFINED_LIST = [
         "BOOLEAN",
@@ -34,6 +34,17 @@ class Asn1Module:
         self._comment_import = comment_import
         self._import_items = import_items
         self._imported_modules: List[Asn1Module] = imported_modules
+        self._text_digest: Optional[str] = None
+        self._file_path: Optional[str] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # textX attaches its metamodel and parser to the model root; they are
+        # not needed once the module is parsed and they cannot be pickled.
+        return {
+            name: value
+            for name, value in vars(self).items()
+            if not name.startswith("_tx_")
+        }
 
     def __str__(self) -> str:
         return (
@@ -71,6 +82,26 @@ class Asn1Module:
             return self._import_items
         return []
 
+    def get_text_digest(self) -> Optional[str]:
+        """
+        Returns the SHA-256 of the text the module was parsed from, or None
+        if the module was not parsed from a text.
+        """
+        return self._text_digest
+
+    def set_text_digest(self, text_digest: str) -> None:
+        self._text_digest = text_digest
+
+    def get_file_path(self) -> Optional[str]:
+        """
+        Returns the path of the input file the module was parsed from, or
+        None if the module was not parsed from an input file.
+        """
+        return self._file_path
+
+    def set_file_path(self, file_path: str) -> None:
+        self._file_path = file_path
+
     def add_imported_module(self, module: "Asn1Module") -> None:
         # TODO check if object already in list
         # self._imported_modules
@@ -7,6 +7,8 @@ from asn1_parser.utils.size import (
 
 
 class Asn1Type:
+    __slots__ = ("_type_name", "_begin", "_end", "_c_type", "_type", "_parent")
+
     def __init__(
         self, begin: float, end: float, type_name: Any, parent: Any
     ) -> None:
@@ -96,3 +98,19 @@ class Asn1Type:
             "Should never be reached. Trying to get the bit size of a asn1 type"
             f" which is None or the c_type is None. [{self}]"
         )
+
+    # Without __dict__, textX reads the attributes of the rule through these
+    # properties.
+
+    @property
+    def type_name(self) -> Any:
+        # the Array or Asn1String, so that textX visits the types they hold
+        return self._type if self._type is not None else self._type_name
+
+    @property
+    def begin(self) -> float:
+        return self._begin
+
+    @property
+    def end(self) -> float:
+        return self._end
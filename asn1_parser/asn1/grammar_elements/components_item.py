@@ -5,6 +5,8 @@ from asn1_parser.log.logger import Logger
 
 
 class ComponentsItem:
+    __slots__ = ("_key", "_value", "_comment", "_parent")
+
     _logger = Logger(__name__)
 
     def __init__(
@@ -48,10 +50,25 @@ class ComponentsItem:
     def set_value(self, outside_value: Any) -> None:
         self._value = outside_value
 
+    # Without __dict__, textX reads the attributes of the rule through these
+    # properties.
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    @property
+    def comment(self) -> Asn1Comment:
+        return self._comment
+
 
 class ComponentsItemNotLast(ComponentsItem):
-    pass
+    __slots__ = ()
 
 
 class ComponentsItemLast(ComponentsItem):
-    pass
+    __slots__ = ()
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from asn1_parser.asn1.grammar_elements.asn1_comment import Asn1Comment
 from asn1_parser.log.logger import Logger
@@ -14,6 +14,8 @@ class Definitions:
         self._comment = comment
         Definitions._logger.debug(f"comment: {self._comment}")
         self._parent = parent
+        # set by get_size_bits() once the bundle links the types
+        self._size_bits: Optional[int] = None
 
     def __str__(self) -> str:
         return self._type_name
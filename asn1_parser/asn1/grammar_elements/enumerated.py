@@ -30,11 +30,16 @@ class Enumerated(Definitions):
 
     def set_enum(self, outside_enum: List[EnumeratedItem]) -> None:
         self._enum = outside_enum
+        self._size_bits = None
 
     def get_size_bits(self) -> int:
         """
         Returns the minimum size, in bits, needed to encode this object.
+        The size is computed once.
         """
-        values = [e.get_pos() for e in self.get_enum()]
-        last_value = max(values)
-        return last_value.bit_length()  # int.bit_length() is a Python builtin
+        if self._size_bits is None:
+            values = [e.get_pos() for e in self.get_enum()]
+            last_value = max(values)
+            # int.bit_length() is a Python builtin
+            self._size_bits = last_value.bit_length()
+        return self._size_bits
@@ -31,3 +31,6 @@ class ImportItem:
 
     def get_module_name(self) -> str:
         return self._module_name
+
+    def get_comment(self) -> Asn1Comment:
+        return self._comment
@@ -7,6 +7,8 @@ from asn1_parser.log.logger import Logger
 
 
 class KeyTypePair:
+    __slots__ = ("_key", "_asn_type", "_comment", "_with_components", "_parent")
+
     _logger = Logger(__name__)
 
     def __init__(  # pylint: disable=too-many-arguments
@@ -49,6 +51,9 @@ class KeyTypePair:
     def get_asn_type(self) -> Asn1Type:
         return self._asn_type
 
+    def set_asn_type(self, asn_type: Asn1Type) -> None:
+        self._asn_type = asn_type
+
     def get_with_components(self) -> WithComponents:
         return self._with_components
 
@@ -58,14 +63,29 @@ class KeyTypePair:
         """
         return self.get_asn_type().get_size_bits()
 
+    # Without __dict__, textX reads the attributes of the rule through these
+    # properties.
+
+    @property
+    def key(self) -> str:
+        return self._key
+
     @property
     def asn_type(self) -> Asn1Type:
         return self._asn_type
 
+    @property
+    def comment(self) -> Asn1Comment:
+        return self._comment
+
+    @property
+    def with_components(self) -> WithComponents:
+        return self._with_components
+
 
 class KeyTypePairNotLast(KeyTypePair):
-    pass
+    __slots__ = ()
 
 
 class KeyTypePairLast(KeyTypePair):
-    pass
+    __slots__ = ()
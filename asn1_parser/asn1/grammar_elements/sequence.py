@@ -32,10 +32,13 @@ class Sequence(Definitions):
     def get_size_bits(self) -> int:
         """
         Returns the minimum size, in bits, needed to encode this object.
+        The size is computed once.
         """
-        bit_size = 0
+        if self._size_bits is None:
+            bit_size = 0
 
-        for member in self.get_children():
-            bit_size += member.get_size_bits()
+            for member in self.get_children():
+                bit_size += member.get_size_bits()
 
-        return bit_size
+            self._size_bits = bit_size
+        return self._size_bits
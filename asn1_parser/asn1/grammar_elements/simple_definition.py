@@ -33,5 +33,8 @@ class SimpleDefinition(Definitions):
     def get_size_bits(self) -> int:
         """
         Returns the minimum size, in bits, needed to encode this object.
+        The size is computed once.
         """
-        return self.get_asn_type().get_size_bits()
+        if self._size_bits is None:
+            self._size_bits = self.get_asn_type().get_size_bits()
+        return self._size_bits
@@ -0,0 +1,283 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+from asn1_parser.asn1.grammar_elements.array import Array
+from asn1_parser.asn1.grammar_elements.asn1_string import Asn1String
+from asn1_parser.asn1.grammar_elements.choice import Choice
+from asn1_parser.asn1.grammar_elements.enumerated import Enumerated
+from asn1_parser.asn1.grammar_elements.key_type_pair import KeyTypePair
+from asn1_parser.asn1.grammar_elements.sequence import Sequence
+from asn1_parser.asn1.grammar_elements.simple_definition import SimpleDefinition
+from asn1_parser.asn1.symbol_table import SymbolTable
+from asn1_parser.utils.size import TypeEnum, get_bit_size
+
+
+class FieldLayout:  # pylint: disable=too-many-instance-attributes
+    """
+    A field of a flattened SEQUENCE: a field of a basic type, a simple
+    definition, an ENUMERATED or an array of them. Fields of nested
+    SEQUENCEs are part of the layout of the outer SEQUENCE; the fields of an
+    array of SEQUENCE are the ones of its first element, repeated for each
+    element.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        fields: Tuple[KeyTypePair, ...],
+        bit_offset: int,
+        bit_width: int,
+        c_type: TypeEnum,
+        begin: float,
+        end: float,
+        states: List[str],
+        array_length: Optional[int],
+        repetitions: int = 1,
+    ) -> None:
+        self._fields = fields
+        self._bit_offset = bit_offset
+        self._bit_width = bit_width
+        self._c_type = c_type
+        self._begin = begin
+        self._end = end
+        self._states = states
+        self._array_length = array_length
+        self._repetitions = repetitions
+
+    def __str__(self) -> str:
+        return (
+            f"{'.'.join(self.get_path())}: {self._c_type.value} "
+            f"{self._bit_width} bits at bit {self._bit_offset}"
+        )
+
+    def get_fields(self) -> Tuple[KeyTypePair, ...]:
+        """
+        Returns the fields leading to this one, from the field of the outer
+        SEQUENCE down to this field.
+        """
+        return self._fields
+
+    def get_field(self) -> KeyTypePair:
+        return self._fields[-1]
+
+    def get_path(self) -> Tuple[str, ...]:
+        return tuple(field.get_key() for field in self._fields)
+
+    def get_bit_offset(self) -> int:
+        """
+        Returns the offset of the field from the start of the message, in
+        bits.
+        """
+        return self._bit_offset
+
+    def get_byte_offset(self) -> int:
+        """
+        Returns the offset of the byte the field starts in.
+        """
+        return self._bit_offset // 8
+
+    def get_bit_width(self) -> int:
+        """
+        Returns the width of the field, of one element for arrays.
+        """
+        return self._bit_width
+
+    def get_size_bits(self) -> int:
+        """
+        Returns the width of the field, of all elements for arrays.
+        """
+        if self._array_length is None:
+            return self._bit_width
+        return self._bit_width * self._array_length
+
+    def get_c_type(self) -> TypeEnum:
+        return self._c_type
+
+    def get_begin(self) -> float:
+        return self._begin
+
+    def get_end(self) -> float:
+        return self._end
+
+    def get_states(self) -> List[str]:
+        """
+        Returns the names of the values of BOOLEAN and ENUMERATED fields.
+        """
+        return self._states
+
+    def get_array_length(self) -> Optional[int]:
+        return self._array_length
+
+    def is_array(self) -> bool:
+        return self._array_length is not None
+
+    def get_repetitions(self) -> int:
+        """
+        Returns how many times the field is repeated, once per element of
+        the arrays of SEQUENCE holding it: its offset is the one in their
+        first elements.
+        """
+        return self._repetitions
+
+    def is_little_endian(self) -> Optional[bool]:
+        comment = self.get_field().get_comment()
+        if comment is None:
+            return None
+        return comment.is_item_little_endian()
+
+    def embed(
+        self, field: KeyTypePair, bit_offset: int, repetitions: int = 1
+    ) -> "FieldLayout":
+        """
+        Returns this field as part of a SEQUENCE field starting at
+        bit_offset, or of an array of repetitions SEQUENCEs.
+        """
+        return FieldLayout(
+            (field,) + self._fields,
+            bit_offset + self._bit_offset,
+            self._bit_width,
+            self._c_type,
+            self._begin,
+            self._end,
+            self._states,
+            self._array_length,
+            self._repetitions * repetitions,
+        )
+
+
+class SequenceLayout:
+    """
+    The packed layout of a SEQUENCE: its fields, nested SEQUENCEs
+    flattened, one after the other without padding between them.
+    """
+
+    def __init__(
+        self, sequence: Sequence, fields: List[FieldLayout], size_bits: int
+    ) -> None:
+        self._sequence = sequence
+        self._fields = fields
+        self._size_bits = size_bits
+        self._fields_by_path: Dict[Tuple[str, ...], FieldLayout] = {
+            field.get_path(): field for field in fields
+        }
+
+    def get_sequence(self) -> Sequence:
+        return self._sequence
+
+    def get_fields(self) -> List[FieldLayout]:
+        return self._fields
+
+    def get_field(self, path: Tuple[str, ...]) -> Optional[FieldLayout]:
+        """
+        Returns the field found by following the keys of the path, or None.
+        """
+        return self._fields_by_path.get(path)
+
+    def get_size_bits(self) -> int:
+        return self._size_bits
+
+    def get_size_bytes(self) -> int:
+        return math.ceil(self.get_size_bits() / 8)
+
+    def get_padding_bits(self) -> int:
+        """
+        Returns the bits needed after the last field to end on a byte.
+        """
+        return self.get_size_bytes() * 8 - self.get_size_bits()
+
+
+class LayoutEngine:
+    """
+    Computes the layouts of the SEQUENCEs of a bundle, once per SEQUENCE:
+    the layout of a nested SEQUENCE is reused by every SEQUENCE holding it.
+    The types must be resolved and the bundle validated.
+    """
+
+    def __init__(self, symbol_table: SymbolTable) -> None:
+        self._symbol_table = symbol_table
+        self._layouts: Dict[str, SequenceLayout] = {}
+
+    def get_layout(self, type_name: str) -> SequenceLayout:
+        layout = self._layouts.get(type_name)
+        if layout is None:
+            definition = self._symbol_table.get_definition(type_name)
+            if not isinstance(definition, Sequence):
+                raise ValueError(f"'{type_name}' is not a SEQUENCE")
+            layout = self._compute_layout(definition)
+            self._layouts[type_name] = layout
+        return layout
+
+    def _compute_layout(self, sequence: Sequence) -> SequenceLayout:
+        fields: List[FieldLayout] = []
+        bit_offset = 0
+        for field in sequence.get_children():
+            asn_type = field.get_asn_type()
+            array_length: Optional[int] = None
+            if isinstance(asn_type.get_type(), Array):
+                # the layout of an array is the one of its elements
+                array_length = asn_type.get_type().get_length()
+                asn_type = asn_type.get_type().get_asn_type()
+            type_name = asn_type.get_type_name()
+            field_type = asn_type.get_type()
+
+            c_type = asn_type.get_c_type()
+            begin = asn_type.get_begin()
+            end = asn_type.get_end()
+            states: List[str] = []
+            # resolve ASN.1 types directly
+            if type_name in ("INTEGER", "REAL"):
+                pass
+            elif type_name == "BOOLEAN":
+                states = ["False", "True"]
+            elif isinstance(field_type, Asn1String):
+                end = field_type.get_length()
+            else:
+                definition = self._symbol_table.get_definition(type_name)
+                if isinstance(definition, SimpleDefinition):
+                    c_type = definition.get_asn_type().get_c_type()
+                    begin = definition.get_asn_type().get_begin()
+                    end = definition.get_asn_type().get_end()
+                elif isinstance(definition, Enumerated):
+                    states = definition.get_states()
+                    c_type = TypeEnum.A_UINT
+                    begin = 0
+                    end = len(states) - 1
+                elif isinstance(definition, Sequence):
+                    # the elements of an array of SEQUENCE follow each other
+                    repetitions = 1 if array_length is None else array_length
+                    inner_layout = self.get_layout(type_name)
+                    fields.extend(
+                        inner_field.embed(field, bit_offset, repetitions)
+                        for inner_field in inner_layout.get_fields()
+                    )
+                    bit_offset += inner_layout.get_size_bits() * repetitions
+                    continue
+                elif isinstance(definition, Choice):
+                    raise NotImplementedError(
+                        f"'{field.get_key()}' in '{sequence.get_type_name()}'"
+                        ": CHOICE has no layout yet"
+                    )
+                else:
+                    raise ValueError(
+                        f"Type '{type_name}' used in "
+                        f"'{sequence.get_type_name()}' is not defined"
+                    )
+
+            if c_type is None:
+                raise NotImplementedError(
+                    f"c_type is None for {type_name}. "
+                    "The value should never be None."
+                )
+            field_layout = FieldLayout(
+                (field,),
+                bit_offset,
+                get_bit_size(c_type, begin, end),
+                c_type,
+                begin,
+                end,
+                states,
+                array_length,
+            )
+            fields.append(field_layout)
+            bit_offset += field_layout.get_size_bits()
+
+        return SequenceLayout(sequence, fields, bit_offset)
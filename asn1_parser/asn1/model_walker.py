@@ -0,0 +1,90 @@
+from typing import Any, List
+
+from asn1_parser.asn1.grammar_elements.array import Array
+from asn1_parser.asn1.grammar_elements.asn1_comment import Asn1Comment
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.grammar_elements.asn1_string import Asn1String
+from asn1_parser.asn1.grammar_elements.asn1_type import Asn1Type
+from asn1_parser.asn1.grammar_elements.choice import Choice
+from asn1_parser.asn1.grammar_elements.components_item import ComponentsItem
+from asn1_parser.asn1.grammar_elements.enumerated import Enumerated
+from asn1_parser.asn1.grammar_elements.enumerated_item import EnumeratedItem
+from asn1_parser.asn1.grammar_elements.import_item import ImportItem
+from asn1_parser.asn1.grammar_elements.key_type_pair import KeyTypePair
+from asn1_parser.asn1.grammar_elements.sequence import Sequence
+from asn1_parser.asn1.grammar_elements.simple_definition import SimpleDefinition
+from asn1_parser.asn1.grammar_elements.with_components import WithComponents
+
+
+class ModelWalker:
+    """
+    Walks the objects of a parsed module, before ASN1BundleBuilder links the
+    types to the definitions they refer to.
+    """
+
+    @classmethod
+    def get_processing_order(cls, module: Asn1Module) -> List[Any]:
+        """
+        Returns the objects of the module in the order in which textX calls
+        their object processors: depth-first, children before their parent,
+        children in the order of the attributes of their rule.
+        """
+        processing_order: List[Any] = []
+        cls._add_in_processing_order(module, processing_order)
+        return processing_order
+
+    @classmethod
+    def _add_in_processing_order(
+        cls, model_object: Any, processing_order: List[Any]
+    ) -> None:
+        children: List[Any] = []
+        if isinstance(model_object, Asn1Module):
+            children = [
+                model_object.get_comment(),
+                *model_object.get_import_items(),
+                model_object.get_comment_import(),
+                *model_object.get_definitions(),
+            ]
+        elif isinstance(model_object, ImportItem):
+            children = [model_object.get_comment()]
+        elif isinstance(model_object, Enumerated):
+            children = [model_object.get_comment(), *model_object.get_enum()]
+        elif isinstance(model_object, (Choice, Sequence)):
+            children = [
+                model_object.get_comment(),
+                *model_object.get_children(),
+            ]
+        elif isinstance(model_object, SimpleDefinition):
+            children = [
+                model_object.get_asn_type(),
+                model_object.get_comment(),
+            ]
+        elif isinstance(model_object, EnumeratedItem):
+            children = [model_object.get_comment()]
+        elif isinstance(model_object, KeyTypePair):
+            children = [
+                model_object.get_asn_type(),
+                model_object.get_comment(),
+                model_object.get_with_components(),
+            ]
+        elif isinstance(model_object, WithComponents):
+            children = [
+                model_object.get_comment(),
+                *model_object.get_components(),
+            ]
+        elif isinstance(model_object, ComponentsItem):
+            children = [model_object.get_value(), model_object.get_comment()]
+        elif isinstance(model_object, Asn1Type):
+            children = [model_object.get_type()]
+        elif isinstance(model_object, Array):
+            children = [model_object.get_asn_type()]
+        elif isinstance(model_object, Asn1String):
+            children = []
+        elif not isinstance(model_object, Asn1Comment):
+            # strings and numbers
+            return
+
+        for child in children:
+            if child is not None and not isinstance(child, str):
+                cls._add_in_processing_order(child, processing_order)
+        processing_order.append(model_object)
@@ -0,0 +1,75 @@
+import sys
+from typing import Any, Dict, Tuple
+
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.grammar_elements.asn1_type import Asn1Type
+from asn1_parser.asn1.grammar_elements.choice import Choice
+from asn1_parser.asn1.grammar_elements.sequence import Sequence
+from asn1_parser.asn1.model_walker import ModelWalker
+
+
+class ModuleCompactor:
+    """
+    Shrinks a parsed module once its processors have run:
+
+    - drops what textX leaves on the objects: the _tx_* bookkeeping (on the
+      module, the parser and its parse tree) and the public copies of the
+      attributes of the rules,
+    - drops the _parent back-references, which only the processors use,
+    - interns the names, which repeat across fields and modules,
+    - makes the fields of the module share one Asn1Type when their types
+      are identical and not yet linked to a definition, e.g. every Uint8-t
+      field.
+
+    The grammar elements that are allocated per field use __slots__, so
+    there is nothing to strip from them but their back-reference.
+    """
+
+    _INTERNED_ATTRIBUTES = ("_key", "_type_name", "_module_name", "_unit")
+
+    @classmethod
+    def compact(cls, module: Asn1Module) -> None:
+        for model_object in ModelWalker.get_processing_order(module):
+            if hasattr(model_object, "__dict__"):
+                cls._strip_textx_attributes(model_object)
+            if model_object is not module:
+                setattr(model_object, "_parent", None)
+            for attribute in cls._INTERNED_ATTRIBUTES:
+                value = getattr(model_object, attribute, None)
+                if isinstance(value, str):
+                    setattr(model_object, attribute, sys.intern(value))
+
+        cls._share_identical_types(module)
+
+    @staticmethod
+    def _strip_textx_attributes(model_object: Any) -> None:
+        textx_attributes = [
+            name
+            for name in vars(model_object)
+            if not name.startswith("_") or name.startswith("_tx_")
+        ]
+        for name in textx_attributes:
+            delattr(model_object, name)
+
+    @staticmethod
+    def _share_identical_types(module: Asn1Module) -> None:
+        # ASN1BundleBuilder links the types of the fields to the definitions
+        # they name: a shared type is linked once, to the definition all its
+        # fields would have been linked to.
+        shared_types: Dict[Tuple[Any, ...], Asn1Type] = {}
+        for definition in module.get_definitions():
+            if not isinstance(definition, (Choice, Sequence)):
+                continue
+            for member in definition.get_children():
+                asn_type = member.get_asn_type()
+                if asn_type.get_type() is not None:
+                    continue
+                type_key = (
+                    asn_type.get_type_name(),
+                    type(asn_type.get_begin()),
+                    asn_type.get_begin(),
+                    type(asn_type.get_end()),
+                    asn_type.get_end(),
+                    asn_type.get_c_type(),
+                )
+                member.set_asn_type(shared_types.setdefault(type_key, asn_type))
@@ -0,0 +1,215 @@
+import glob
+import json
+import os
+import re
+import tempfile
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.log.logger import Logger
+
+
+class ModuleIndex:
+    """
+    Index of the module names defined by the input files, built by reading
+    only the 'Module-<name> DEFINITIONS' header of each file. Folders given as
+    input paths stand for the *.asn files they contain.
+
+    The index can be kept in a JSON file, in which case only the files whose
+    modification time or size changed are read again.
+    """
+
+    _logger = Logger(__name__)
+
+    # 'Module-'module_name=NameLower 'DEFINITIONS ...' in GRAMMAR
+    _HEADER = re.compile(
+        r"[\t\n\r ]*Module-[\t\n\r ]*([a-z][a-z\d]*(?:-[a-z\d]+)*)"
+        r"[\t\n\r ]*DEFINITIONS"
+    )
+    _HEADER_CHUNK_SIZE = 4096
+
+    def __init__(
+        self, input_paths: List[str], index_path: Optional[str] = None
+    ) -> None:
+        self._index_path = index_path
+        self._file_paths = self._expand_input_paths(input_paths)
+        # file path -> (modification time in ns, size, module name)
+        self._entries: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        self._scanned = 0
+
+        stored_entries = self._load_entries()
+        for file_path in self._file_paths:
+            file_stat = os.stat(file_path)
+            stored_entry = stored_entries.get(os.path.abspath(file_path))
+            if stored_entry is not None and stored_entry[:2] == (
+                file_stat.st_mtime_ns,
+                file_stat.st_size,
+            ):
+                self._entries[file_path] = stored_entry
+                continue
+            self._entries[file_path] = (
+                file_stat.st_mtime_ns,
+                file_stat.st_size,
+                self._scan_module_name(file_path),
+            )
+            self._scanned += 1
+
+        if self._scanned > 0:
+            stored_entries.update(
+                (os.path.abspath(file_path), entry)
+                for file_path, entry in self._entries.items()
+            )
+            self._store_entries(
+                {
+                    file_path: entry
+                    for file_path, entry in stored_entries.items()
+                    if os.path.exists(file_path)
+                }
+            )
+
+    def get_file_paths(self) -> List[str]:
+        """
+        Returns the input files, folders expanded, in the input order.
+        """
+        return self._file_paths
+
+    def get_scanned_count(self) -> int:
+        """
+        Returns how many headers were read, as opposed to taken from the
+        index file.
+        """
+        return self._scanned
+
+    def get_module_name(self, file_path: str) -> Optional[str]:
+        """
+        Returns the name of the module defined by the file, or None if the
+        file does not start with a module header.
+        """
+        return self._entries[file_path][2]
+
+    def get_file_paths_of_module(self, module_name: str) -> List[str]:
+        return [
+            file_path
+            for file_path in self._file_paths
+            if self.get_module_name(file_path) == module_name
+        ]
+
+    def load_reachable_modules(
+        self,
+        root_module_names: List[str],
+        parse_files: Callable[[List[str]], List[Asn1Module]],
+    ) -> List[Asn1Module]:
+        """
+        Parses the root modules and, following their imports, the modules
+        they depend on, and nothing else. The modules are returned in the
+        input order. Each round of imports is parsed in one call to
+        parse_files.
+
+        Files without a readable header are always parsed, so that their
+        errors are reported as when every file is parsed. If a root module
+        is not in the index, every file is parsed.
+        """
+        if any(
+            not self.get_file_paths_of_module(module_name)
+            for module_name in root_module_names
+        ):
+            return parse_files(self._file_paths)
+
+        parsed_modules: Dict[str, Asn1Module] = {}
+        visited_names: Set[str] = set()
+        paths_to_parse = [
+            file_path
+            for file_path in self._file_paths
+            if self.get_module_name(file_path) is None
+        ]
+        names_to_load = list(root_module_names)
+        while names_to_load or paths_to_parse:
+            for module_name in names_to_load:
+                if module_name not in visited_names:
+                    visited_names.add(module_name)
+                    paths_to_parse.extend(
+                        self.get_file_paths_of_module(module_name)
+                    )
+            names_to_load = []
+            if not paths_to_parse:
+                break
+
+            modules = parse_files(paths_to_parse)
+            for file_path, module in zip(paths_to_parse, modules):
+                parsed_modules[file_path] = module
+                names_to_load.extend(
+                    import_item.get_module_name()
+                    for import_item in module.get_import_items()
+                )
+            paths_to_parse = []
+
+        self._logger.debug(
+            f"parsed {len(parsed_modules)} of {len(self._file_paths)} files"
+        )
+        return [
+            parsed_modules[file_path]
+            for file_path in self._file_paths
+            if file_path in parsed_modules
+        ]
+
+    @staticmethod
+    def _expand_input_paths(input_paths: List[str]) -> List[str]:
+        file_paths: List[str] = []
+        for input_path in input_paths:
+            if os.path.isdir(input_path):
+                file_paths.extend(
+                    sorted(glob.glob(os.path.join(input_path, "*.asn")))
+                )
+            else:
+                assert os.path.exists(
+                    input_path
+                ), f"File does not exist: {input_path}"
+                file_paths.append(input_path)
+        return file_paths
+
+    @classmethod
+    def _scan_module_name(cls, file_path: str) -> Optional[str]:
+        with open(file_path, "r", encoding="utf8") as input_file:
+            header = ""
+            while True:
+                chunk = input_file.read(cls._HEADER_CHUNK_SIZE)
+                header += chunk
+                match = cls._HEADER.match(header)
+                if match is not None:
+                    return match.group(1)
+                if not chunk or len(header.lstrip()) > cls._HEADER_CHUNK_SIZE:
+                    return None
+
+    def _load_entries(self) -> Dict[str, Tuple[int, int, Optional[str]]]:
+        if self._index_path is None:
+            return {}
+        try:
+            with open(self._index_path, "r", encoding="utf8") as index_file:
+                stored_entries = json.load(index_file)
+            return {
+                file_path: (mtime_ns, size, module_name)
+                for file_path, (mtime_ns, size, module_name) in (
+                    stored_entries.items()
+                )
+            }
+        except FileNotFoundError:
+            return {}
+        except Exception:  # pylint: disable=broad-except
+            # truncated or written by an incompatible version: scan again
+            self._logger.warning(f"discarding unreadable {self._index_path}")
+            return {}
+
+    def _store_entries(
+        self, entries: Dict[str, Tuple[int, int, Optional[str]]]
+    ) -> None:
+        if self._index_path is None:
+            return
+        index_dir = os.path.dirname(os.path.abspath(self._index_path))
+        os.makedirs(index_dir, exist_ok=True)
+        # write then rename, so that concurrent runs never read half an index
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=index_dir, suffix=".tmp"
+        )
+        with os.fdopen(file_descriptor, "w", encoding="utf8") as index_file:
+            json.dump(entries, index_file)
+        os.replace(temporary_path, self._index_path)
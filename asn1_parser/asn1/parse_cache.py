@@ -0,0 +1,205 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import List, Optional, Tuple, Union
+
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.parser import Asn1Parser
+from asn1_parser.asn1.validation.validation_cache import ValidationCache
+from asn1_parser.cli.cli_arg_parser import (
+    GenerateAllCommandConfig,
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+    GenerateCFSCommandConfig,
+    GenerateCosmosCommandConfig,
+    LintCommandConfig,
+)
+from asn1_parser.log.logger import Logger
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed modules, keyed by the SHA-256 of the module text
+    and of the grammar fingerprint. Only the modules missing from the cache
+    go through textX. The least recently used entries are evicted once the
+    cache grows over its size limit.
+    """
+
+    _logger = Logger(__name__)
+
+    _ENTRY_SUFFIX = ".pickle"
+
+    def __init__(self, cache_dir: str, max_size_bytes: int) -> None:
+        self._cache_dir = cache_dir
+        self._max_size_bytes = max_size_bytes
+        self._hits = 0
+        self._misses = 0
+        self._validation_cache: Optional[ValidationCache] = None
+
+    @classmethod
+    def create_from_config(
+        cls,
+        config: Union[
+            GenerateAllCommandConfig,
+            GenerateBinaryCommandConfig,
+            GenerateCCommandConfig,
+            GenerateCFSCommandConfig,
+            GenerateCosmosCommandConfig,
+            LintCommandConfig,
+        ],
+    ) -> Optional["ParseCache"]:
+        """
+        Returns the cache selected on the command line, or None if the cache
+        is disabled.
+        """
+        if config.cache_dir is None:
+            return None
+        return cls(config.cache_dir, config.cache_size * 1024 * 1024)
+
+    def get_cache_dir(self) -> str:
+        return self._cache_dir
+
+    def get_hits(self) -> int:
+        return self._hits
+
+    def get_misses(self) -> int:
+        return self._misses
+
+    def get_validation_cache(self) -> ValidationCache:
+        """
+        Returns the cache of the validation results, kept next to the parsed
+        modules.
+        """
+        if self._validation_cache is None:
+            self._validation_cache = ValidationCache.create_in_dir(
+                self._cache_dir
+            )
+        return self._validation_cache
+
+    def get_summary(self) -> str:
+        summary = (
+            f"parse cache: {self._hits} hit(s), {self._misses} miss(es) "
+            f"in {self._cache_dir}"
+        )
+        if self._validation_cache is not None:
+            summary += (
+                f"\nvalidation cache: {self._validation_cache.get_hits()} "
+                f"hit(s), {self._validation_cache.get_misses()} miss(es)"
+            )
+        return summary
+
+    def load_from_text(self, input_text: str) -> Optional[Asn1Module]:
+        """
+        Returns the module parsed from the text if it is in the cache, or
+        None.
+        """
+        module = self._load(self._get_key(input_text))
+        if module is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return module
+
+    def store_from_text(self, input_text: str, module: Asn1Module) -> None:
+        self._store(self._get_key(input_text), module)
+
+    def parse_from_files(
+        self,
+        *input_file_paths: str,
+        jobs: int = 1,
+        use_fast_parser: bool = False,
+    ) -> List[Asn1Module]:
+        """
+        Same as Asn1Parser.parse_from_files, loading the unchanged modules
+        from the cache.
+        """
+        input_texts: List[str] = []
+        for input_file_path in input_file_paths:
+            assert os.path.exists(
+                input_file_path
+            ), f"File does not exist: {input_file_path}"
+            with open(input_file_path, "r", encoding="utf8") as input_file:
+                input_texts.append(input_file.read())
+
+        keys = [self._get_key(input_text) for input_text in input_texts]
+        modules: List[Optional[Asn1Module]] = [self._load(key) for key in keys]
+        missing: List[Tuple[int, str]] = [
+            (index, input_texts[index])
+            for index, module in enumerate(modules)
+            if module is None
+        ]
+        self._hits += len(modules) - len(missing)
+        self._misses += len(missing)
+
+        if missing:
+            parsed_modules = Asn1Parser.parse_from_text_multimodule(
+                [input_text for _, input_text in missing],
+                jobs=jobs,
+                use_fast_parser=use_fast_parser,
+            )
+            for (index, _), module in zip(missing, parsed_modules):
+                self._store(keys[index], module)
+                modules[index] = module
+            self.evict()
+
+        return [module for module in modules if module is not None]
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits in its
+        size limit.
+        """
+        entries: List[Tuple[float, int, str]] = []
+        for entry_name in os.listdir(self._cache_dir):
+            if not entry_name.endswith(self._ENTRY_SUFFIX):
+                continue
+            entry_path = os.path.join(self._cache_dir, entry_name)
+            entry_stat = os.stat(entry_path)
+            entries.append(
+                (entry_stat.st_mtime, entry_stat.st_size, entry_path)
+            )
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self._max_size_bytes:
+                break
+            self._logger.debug(f"evicting {entry_path}")
+            os.remove(entry_path)
+            total_size -= size
+
+    @staticmethod
+    def _get_key(input_text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(Asn1Parser.get_grammar_fingerprint().encode("utf-8"))
+        digest.update(input_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key + self._ENTRY_SUFFIX)
+
+    def _load(self, key: str) -> Optional[Asn1Module]:
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                module: Asn1Module = pickle.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except Exception:  # pylint: disable=broad-except
+            # truncated or written by an incompatible version: parse again
+            self._logger.warning(f"discarding unreadable {entry_path}")
+            os.remove(entry_path)
+            return None
+        # mark the entry as recently used for the eviction
+        os.utime(entry_path)
+        return module
+
+    def _store(self, key: str, module: Asn1Module) -> None:
+        os.makedirs(self._cache_dir, exist_ok=True)
+        # write then rename, so that concurrent runs never read half an entry
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self._cache_dir, suffix=".tmp"
+        )
+        with os.fdopen(file_descriptor, "wb") as entry_file:
+            pickle.dump(module, entry_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self._get_entry_path(key))
@@ -1,8 +1,17 @@
+import functools
+import hashlib
+import inspect
+import itertools
+import multiprocessing
 import os
-from typing import List
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
+import textx
 from textx import metamodel_from_str
+from textx.metamodel import TextXMetaModel
 
+from asn1_parser.asn1.fast_parser import FastParser, FastParserError
 from asn1_parser.asn1.grammar import GRAMMAR
 from asn1_parser.asn1.grammar_elements.array import Array
 from asn1_parser.asn1.grammar_elements.asn1_comment import Asn1Comment
@@ -28,6 +37,8 @@ from asn1_parser.asn1.grammar_elements.key_type_pair import (
 from asn1_parser.asn1.grammar_elements.sequence import Sequence
 from asn1_parser.asn1.grammar_elements.simple_definition import SimpleDefinition
 from asn1_parser.asn1.grammar_elements.with_components import WithComponents
+from asn1_parser.asn1.model_walker import ModelWalker
+from asn1_parser.asn1.module_compactor import ModuleCompactor
 from asn1_parser.asn1.processor import (
     check_comment,
     check_enumerated,
@@ -37,6 +48,8 @@ from asn1_parser.asn1.processor import (
     null_exception_catch,
     str_to_bool,
 )
+from asn1_parser.asn1.validation.errors import ASN1ConsistencyError
+from asn1_parser.asn1.worker_error import WorkerError
 from asn1_parser.log.logger import Logger
 
 
@@ -64,7 +77,7 @@ class Asn1Parser:
         WithComponents,
     ]
 
-    _obj_processor = {
+    _obj_processor: Dict[str, Callable[..., None]] = {
         # "Asn1Comment": endianness_to_bool,
         "Asn1Comment": check_comment,
         "Asn1Type": asn1_type,
@@ -76,42 +89,212 @@ class Asn1Parser:
         "SimpleDefinition": null_exception_catch,
     }
 
+    # checks of the whole module, run once the object processors ran; each
+    # yields every error it finds
+    _model_processors: List[
+        Callable[[Asn1Module], Iterator[ASN1ConsistencyError]]
+    ] = [
+        model_processor_check_used_types_defined,
+    ]
+
+    # The metamodel is expensive to build (textX parses GRAMMAR with its own
+    # PEG parser), so it is built once per process and reused for every
+    # module.
+    _meta_model: Optional[TextXMetaModel] = None
+    _grammar_fingerprint: Optional[str] = None
+
     @classmethod
-    def parse_from_files(cls, *input_file_paths: str) -> List[Asn1Module]:
-        input_texts = []
+    def get_meta_model(cls) -> TextXMetaModel:
+        """
+        Returns the textX metamodel of the ASN.1 grammar, building it on the
+        first call.
+        """
+        if cls._meta_model is None:
+            cls._logger.debug("building the ASN.1 metamodel")
+            meta_model = metamodel_from_str(GRAMMAR, classes=cls.used_classes)
+            meta_model.register_obj_processors(cls._obj_processor)
+            cls._meta_model = meta_model
+        return cls._meta_model
+
+    @classmethod
+    def get_grammar_fingerprint(cls) -> str:
+        """
+        Returns a hash of everything that determines the shape of a parsed
+        module: the grammar, the textX version, and the sources of the user
+        classes, of the registered processors and of the modules that build
+        the objects besides textX (FastParser, ModelWalker, ModuleCompactor),
+        so that editing any of them invalidates whatever is keyed by this
+        fingerprint.
+        """
+        if cls._grammar_fingerprint is None:
+            processors: List[Tuple[str, Callable[..., Any]]] = list(
+                cls._obj_processor.items()
+            )
+            processors.extend(
+                ("<model>", processor) for processor in cls._model_processors
+            )
+            source_modules: Set[str] = {
+                used_class.__module__ for used_class in cls.used_classes
+            }
+            source_modules.update(
+                processor.__module__ for _, processor in processors
+            )
+            source_modules.update(
+                (
+                    FastParser.__module__,
+                    ModelWalker.__module__,
+                    ModuleCompactor.__module__,
+                )
+            )
+
+            digest = hashlib.sha256()
+            digest.update(GRAMMAR.encode("utf-8"))
+            digest.update(textx.__version__.encode("utf-8"))
+            for rule_name, processor in processors:
+                digest.update(f"{rule_name}:{processor.__qualname__}".encode())
+            for module_name in sorted(source_modules):
+                module_path = inspect.getsourcefile(sys.modules[module_name])
+                if module_path is None:
+                    # e.g. a bytecode-only install: the fingerprint would not
+                    # see edits to these classes or processors
+                    raise FileNotFoundError(
+                        f"Cannot fingerprint {module_name}: no source file"
+                    )
+                with open(module_path, "rb") as module_file:
+                    digest.update(module_file.read())
+            cls._grammar_fingerprint = digest.hexdigest()
+        return cls._grammar_fingerprint
+
+    @classmethod
+    def parse_from_files(
+        cls,
+        *input_file_paths: str,
+        jobs: int = 1,
+        use_fast_parser: bool = False,
+    ) -> List[Asn1Module]:
         for input_file_path in input_file_paths:
             assert os.path.exists(
                 input_file_path
             ), f"File does not exist: {input_file_path}"
 
+        input_texts = []
+        for input_file_path in input_file_paths:
             with open(input_file_path, "r", encoding="utf8") as input_file:
                 input_texts.append(input_file.read())
 
-        return cls.parse_from_text_multimodule(input_texts=input_texts)
+        return cls.parse_from_text_multimodule(
+            input_texts, jobs=jobs, use_fast_parser=use_fast_parser
+        )
 
     @classmethod
     def parse_from_text(
-        cls, input_text: str, is_multimodule: bool = False
+        cls,
+        input_text: str,
+        is_multimodule: bool = False,
+        use_fast_parser: bool = False,
+        errors: Optional[List[ASN1ConsistencyError]] = None,
     ) -> Asn1Module:
+        """
+        Parses and compacts one module. With use_fast_parser, the module is
+        parsed by FastParser, falling back to textX when FastParser rejects
+        it.
+
+        The checks of the module raise their first error. With an errors
+        list, every error is appended to it instead.
+        """
         cls._logger.debug("parsing ASN.1 string")
-        meta_model = metamodel_from_str(GRAMMAR, classes=cls.used_classes)
-        meta_model.register_obj_processors(cls._obj_processor)
-        meta_model.register_model_processor(
-            model_processor_check_used_types_defined
-        )
-        asn_model: Asn1Module = meta_model.model_from_str(input_text)
+        asn_model: Optional[Asn1Module] = None
+        if use_fast_parser:
+            asn_model = cls._parse_with_fast_parser(input_text)
+        if asn_model is None:
+            meta_model = cls.get_meta_model()
+            asn_model = meta_model.model_from_str(input_text)
+        assert asn_model is not None
+        checks = [
+            model_processor(asn_model)
+            for model_processor in cls._model_processors
+        ]
         if not is_multimodule:
-            model_processor_check_used_components_defined(asn_model)
+            checks.append(
+                model_processor_check_used_components_defined(asn_model)
+            )
+        for error in itertools.chain.from_iterable(checks):
+            if errors is None:
+                raise error
+            errors.append(error)
+        ModuleCompactor.compact(asn_model)
+        asn_model.set_text_digest(
+            hashlib.sha256(input_text.encode("utf-8")).hexdigest()
+        )
+        return asn_model
+
+    @classmethod
+    def _parse_with_fast_parser(cls, input_text: str) -> Optional[Asn1Module]:
+        try:
+            asn_model = FastParser(input_text).parse()
+        except FastParserError as error:
+            # textX reports the error, or parses what FastParser does not
+            # handle
+            cls._logger.debug(f"falling back to textX: {error}")
+            return None
+
+        # same processors, in the same order, as textX
+        for model_object in ModelWalker.get_processing_order(asn_model):
+            processor = cls._obj_processor.get(type(model_object).__name__)
+            if processor is not None:
+                processor(model_object)
         return asn_model
 
     @classmethod
     def parse_from_text_multimodule(
-        cls, input_texts: List[str]
+        cls,
+        input_texts: List[str],
+        jobs: int = 1,
+        use_fast_parser: bool = False,
     ) -> List[Asn1Module]:
+        """
+        Parses the given texts and returns the modules in the input order.
+        With jobs > 1, the texts are spread over that many worker processes;
+        the first error in input order is raised, as in the serial path.
+        """
         asn1_modules: List[Asn1Module] = []
 
-        for input_text in input_texts:
-            module = cls.parse_from_text(input_text, True)
-            asn1_modules.append(module)
+        processes = min(jobs, len(input_texts))
+        if processes <= 1:
+            for input_text in input_texts:
+                module = cls.parse_from_text(input_text, True, use_fast_parser)
+                asn1_modules.append(module)
 
+            return asn1_modules
+
+        cls._logger.debug(
+            f"parsing {len(input_texts)} modules with {processes} processes"
+        )
+        with multiprocessing.Pool(processes=processes) as pool:
+            results = pool.map(
+                functools.partial(
+                    _parse_text_in_worker, use_fast_parser=use_fast_parser
+                ),
+                input_texts,
+            )
+
+        for parsed_module, error in results:
+            if error is not None:
+                raise error.get_exception()
+            assert parsed_module is not None
+            asn1_modules.append(parsed_module)
         return asn1_modules
+
+
+def _parse_text_in_worker(
+    input_text: str, use_fast_parser: bool = False
+) -> Tuple[Optional[Asn1Module], Optional[WorkerError]]:
+    # Errors are returned rather than raised so that the parent process
+    # can report the first failing module in input order.
+    try:
+        return (
+            Asn1Parser.parse_from_text(input_text, True, use_fast_parser),
+            None,
+        )
+    except Exception as exception:  # pylint: disable=broad-except
+        return None, WorkerError(exception)
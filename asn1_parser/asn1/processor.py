@@ -1,7 +1,16 @@
-from typing import Any, List, Optional, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from textx.exceptions import TextXSyntaxError
-from textx.metamodel import TextXMetaModel
 
 from asn1_parser.asn1.grammar_elements.asn1_comment import Asn1Comment
 from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
@@ -9,13 +18,14 @@ from asn1_parser.asn1.grammar_elements.asn1_string import Asn1String
 from asn1_parser.asn1.grammar_elements.asn1_type import Asn1Type
 from asn1_parser.asn1.grammar_elements.choice import Choice
 from asn1_parser.asn1.grammar_elements.components_item import ComponentsItem
+from asn1_parser.asn1.grammar_elements.definitions import Definitions
 from asn1_parser.asn1.grammar_elements.enumerated import Enumerated
 from asn1_parser.asn1.grammar_elements.key_type_pair import KeyTypePair
 from asn1_parser.asn1.grammar_elements.sequence import Sequence
 from asn1_parser.asn1.grammar_elements.simple_definition import SimpleDefinition
 from asn1_parser.asn1.grammar_elements.with_components import WithComponents
+from asn1_parser.asn1.validation.errors import ASN1ConsistencyError
 
-from asn1_parser.utils.array import flatten
 from asn1_parser.utils.size import (
     ASN1_POSIX_RANGE,
     DOUBLE_MAX,
@@ -38,32 +48,23 @@ _PREDEFINED_LIST: List[str] = [
 ]
 
 
-def _check_types_once_defined(model: Asn1Module) -> List[str]:
+def _check_types_once_defined(model: Asn1Module) -> Set[str]:
     # ASN.1 types
-    defined_types: List[str] = _PREDEFINED_LIST.copy()
+    defined_types: Set[str] = set(_PREDEFINED_LIST)
     # get imported types, assume that imported types are defined
-    if model.get_import_items() is not None:
-        defined_types.extend(
-            flatten(
-                [items.get_definitions() for items in model.get_import_items()]
-            )
-        )
+    for items in model.get_import_items():
+        defined_types.update(items.get_definitions())
     # get new defined types
-    defined_types.extend(
-        [definition.get_type_name() for definition in model.get_definitions()]
+    defined_types.update(
+        definition.get_type_name() for definition in model.get_definitions()
     )
     return defined_types
 
 
 def model_processor_check_used_types_defined(
-    model: Asn1Module, _: TextXMetaModel
-) -> None:
-    # pylint: disable=import-outside-toplevel
-    from asn1_parser.asn1.validation.asn1_bundle_validator import (
-        ASN1ConsistencyError,
-    )
-
-    defined_types: List[str] = _check_types_once_defined(model)
+    model: Asn1Module,
+) -> Iterator[ASN1ConsistencyError]:
+    defined_types: Set[str] = _check_types_once_defined(model)
     for definition in model.get_definitions():
         key_type_pair_list: List[KeyTypePair] = []
         if isinstance(definition, (Sequence, Choice)):
@@ -76,77 +77,113 @@ def model_processor_check_used_types_defined(
             if isinstance(type_name, str):
                 if type_name not in defined_types:
                     module = model.get_module_name()
-                    raise ASN1ConsistencyError(
-                        f"Type '{type_name}' used in '{module}' is not defined"
+                    yield ASN1ConsistencyError(
+                        f"Type '{type_name}' used in '{module}' is not defined",
+                        module_name=module,
+                        definition_name=definition.get_type_name(),
+                        field_path=(key_type_pair.get_key(),),
                     )
 
 
-def model_processor_check_used_components_defined(model: Asn1Module) -> None:
-    all_sequences: List[Sequence] = [
-        s for s in model.get_definitions() if isinstance(s, Sequence)
-    ]
+def model_processor_check_used_components_defined(
+    model: Asn1Module,
+) -> Iterator[ASN1ConsistencyError]:
+    sequence_keys = get_sequence_keys(model.get_definitions())
     for definition in model.get_definitions():
+        yield from check_sequence_components(
+            model.get_module_name(), definition, sequence_keys
+        )
+
+
+def get_sequence_keys(
+    definitions: Iterable[Definitions],
+) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    Returns the type name of each key of the sequences, by sequence type
+    name, so that a WITH COMPONENTS is checked with lookups only. A
+    sequence defined twice maps to None: it is not a valid reference.
+    """
+    sequence_keys: Dict[str, Optional[Dict[str, str]]] = {}
+    for definition in definitions:
         if isinstance(definition, Sequence):
-            for seq_item in definition.get_children():
-                type_name: str = seq_item.get_asn_type().get_type_name()
-                with_component: WithComponents = seq_item.get_with_components()
-                _check_with_component(
-                    model.get_module_name(),
+            type_name = definition.get_type_name()
+            if type_name in sequence_keys:
+                sequence_keys[type_name] = None
+                continue
+            keys: Dict[str, str] = {}
+            for item in definition.get_children():
+                keys.setdefault(
+                    item.get_key(), item.get_asn_type().get_type_name()
+                )
+            sequence_keys[type_name] = keys
+    return sequence_keys
+
+
+def check_sequence_components(
+    module_name: str,
+    definition: Definitions,
+    sequence_keys: Dict[str, Optional[Dict[str, str]]],
+) -> Iterator[ASN1ConsistencyError]:
+    """
+    Yields the errors of the WITH COMPONENTS of the fields of the definition,
+    checked against the keys of the sequences they constrain.
+    """
+    if isinstance(definition, Sequence):
+        for seq_item in definition.get_children():
+            with_component: WithComponents = seq_item.get_with_components()
+            if with_component is not None:
+                yield from _check_with_component(
+                    module_name,
                     with_component,
-                    all_sequences,
-                    type_name,
+                    sequence_keys,
+                    seq_item.get_asn_type().get_type_name(),
                     definition.get_type_name(),
+                    (seq_item.get_key(),),
                 )
 
 
-def _check_with_component(
+def _check_with_component(  # pylint: disable=too-many-arguments
     module_name: str,
     with_component: WithComponents,
-    all_sequences: List[Sequence],
+    sequence_keys: Dict[str, Optional[Dict[str, str]]],
     type_name: str,
     def_type_name: str,
-) -> None:
-
-    if with_component is not None:
-        # pylint: disable=import-outside-toplevel
-        from asn1_parser.asn1.validation.asn1_bundle_validator import (
-            ASN1ConsistencyError,
-        )
-
-        # find the definition of the sequence used by this WITH COMPONENTS
-        sequence: List[Sequence] = [
-            s for s in all_sequences if s.get_type_name() == type_name
-        ]
-        if len(sequence) == 1:
-            seq: List[KeyTypePair] = sequence[0].get_children()
-            allowed_keys: List[str] = [s.get_key() for s in seq]
-            for component in with_component.get_components():
-                # go through all components and check whether they are defined
-                # or not
-                component_key: str = component.get_key()
-                if component_key not in allowed_keys:
-                    raise ASN1ConsistencyError(
-                        f"'{component_key}' in '{def_type_name}' is not a "
-                        "valid key"
-                    )
-                component_value = component.get_value()
-                # when a WITH COMPONENTS component has an inner WITH COMPONENTS
-                if isinstance(component_value, WithComponents):
-                    type_name_inner: str = [
-                        s.get_asn_type().get_type_name()
-                        for s in seq
-                        if s.get_key() == component_key
-                    ][0]
-                    _check_with_component(
-                        module_name,
-                        component_value,
-                        all_sequences,
-                        type_name_inner,
-                        def_type_name,
-                    )
-        elif type_name not in _PREDEFINED_LIST:
-            raise ASN1ConsistencyError(
-                f"used type '{type_name}' in '{def_type_name}' is not defined"
+    field_path: Tuple[str, ...],
+) -> Iterator[ASN1ConsistencyError]:
+    # the keys of the sequence used by this WITH COMPONENTS
+    allowed_keys = sequence_keys.get(type_name)
+    if allowed_keys is None:
+        if type_name not in _PREDEFINED_LIST:
+            yield ASN1ConsistencyError(
+                f"used type '{type_name}' in '{def_type_name}' is not defined",
+                module_name=module_name,
+                definition_name=def_type_name,
+                field_path=field_path,
+            )
+        return
+
+    for component in with_component.get_components():
+        component_key: str = component.get_key()
+        component_path = field_path + (component_key,)
+        type_name_inner = allowed_keys.get(component_key)
+        if type_name_inner is None:
+            yield ASN1ConsistencyError(
+                f"'{component_key}' in '{def_type_name}' is not a valid key",
+                module_name=module_name,
+                definition_name=def_type_name,
+                field_path=component_path,
+            )
+            continue
+        component_value = component.get_value()
+        # when a WITH COMPONENTS component has an inner WITH COMPONENTS
+        if isinstance(component_value, WithComponents):
+            yield from _check_with_component(
+                module_name,
+                component_value,
+                sequence_keys,
+                type_name_inner,
+                def_type_name,
+                component_path,
             )
 
 
@@ -215,38 +252,32 @@ def asn1_type(model: Asn1Type) -> None:
 
 
 def check_posix(model: SimpleDefinition) -> None:
-    # pylint: disable=import-outside-toplevel
-    from asn1_parser.asn1.validation.asn1_bundle_validator import (
-        ASN1ConsistencyError,
-    )
-
     name = model.get_type_name()
     posix = ASN1_POSIX_RANGE.get(name)
     if posix:
         begin = model.get_asn_type().get_begin()
         end = model.get_asn_type().get_end()
         if posix.get("begin") != begin or posix.get("end") != end:
-            # pylint: disable=import-outside-toplevel
-
             raise ASN1ConsistencyError(
                 f"Range [{begin} - {end}] doesn't match "
-                f"with the used POSIX definition ({name})."
+                f"with the used POSIX definition ({name}).",
+                definition_name=name,
             )
 
 
 def null_exception_catch(model: Union[KeyTypePair, SimpleDefinition]) -> None:
     if model.get_asn_type().get_type_name() == "NULL":
-        # pylint: disable=import-outside-toplevel
-        from asn1_parser.asn1.validation.asn1_bundle_validator import (
-            ASN1ConsistencyError,
-        )
-
         raise ASN1ConsistencyError(
             "Unexpected type: NULL. The NULL type is supported by"
             "the ASN.1 standard but its use is forbidden by the"
             "APG tool to avoid any confusion that could be caused"
             "by the presence of the NULL type in the generated C"
-            "and COSMOS artifacts."
+            "and COSMOS artifacts.",
+            definition_name=(
+                model.get_type_name()
+                if isinstance(model, SimpleDefinition)
+                else None
+            ),
         )
 
     if isinstance(model, SimpleDefinition):
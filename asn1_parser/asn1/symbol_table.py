@@ -0,0 +1,68 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.grammar_elements.definitions import Definitions
+
+
+class SymbolTable:
+    """
+    Lookup tables of a bundle, built once from its modules: the modules by
+    name, the definitions by type name together with the module defining
+    them, and the types each module imports, by imported module.
+
+    When a name is defined twice, the first definition in the module order
+    is kept; ASN1BundleValidator reports the duplicates.
+    """
+
+    def __init__(self, modules: List[Asn1Module]) -> None:
+        self._modules: Dict[str, Asn1Module] = {}
+        self._definitions: Dict[str, Tuple[Definitions, Asn1Module]] = {}
+        self._module_definitions: Dict[str, Dict[str, Definitions]] = {}
+        self._imports: Dict[str, Dict[str, Set[str]]] = {}
+
+        for module in modules:
+            module_name = module.get_module_name()
+            self._modules.setdefault(module_name, module)
+
+            module_definitions = self._module_definitions.setdefault(
+                module_name, {}
+            )
+            for definition in module.get_definitions():
+                type_name = definition.get_type_name()
+                self._definitions.setdefault(type_name, (definition, module))
+                module_definitions.setdefault(type_name, definition)
+
+            imports = self._imports.setdefault(module_name, {})
+            for import_item in module.get_import_items():
+                imports.setdefault(import_item.get_module_name(), set()).update(
+                    import_item.get_definitions()
+                )
+
+    def get_module(self, module_name: str) -> Optional[Asn1Module]:
+        return self._modules.get(module_name)
+
+    def get_definition(self, type_name: str) -> Optional[Definitions]:
+        entry = self._definitions.get(type_name)
+        if entry is None:
+            return None
+        return entry[0]
+
+    def get_defining_module(self, type_name: str) -> Optional[Asn1Module]:
+        entry = self._definitions.get(type_name)
+        if entry is None:
+            return None
+        return entry[1]
+
+    def get_module_definitions(
+        self, module_name: str
+    ) -> Dict[str, Definitions]:
+        """
+        Returns the definitions of the module by type name.
+        """
+        return self._module_definitions.get(module_name, {})
+
+    def get_imports(self, module_name: str) -> Dict[str, Set[str]]:
+        """
+        Returns the type names the module imports, by imported module name.
+        """
+        return self._imports.get(module_name, {})
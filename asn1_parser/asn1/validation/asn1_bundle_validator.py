@@ -1,24 +1,34 @@
-from typing import List, Union, Dict
+import hashlib
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Union
 
 from asn1_parser.asn1.asn1_bundle import ASN1Bundle
 from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
-from asn1_parser.asn1.grammar_elements.definitions import Definitions
 from asn1_parser.asn1.processor import (
-    model_processor_check_used_components_defined,
+    check_sequence_components,
+    get_sequence_keys,
 )
+from asn1_parser.asn1.validation.errors import ASN1ConsistencyError
 from asn1_parser.cli.cli_arg_parser import (
     GenerateBinaryCommandConfig,
     GenerateCCommandConfig,
     GenerateCFSCommandConfig,
 )
-from asn1_parser.utils.array import flatten
 
-
-class ASN1ConsistencyError(Exception):
-    pass
+if TYPE_CHECKING:
+    # the cache fingerprints the parser, which imports this module
+    from asn1_parser.asn1.validation.validation_cache import (
+        ErrorEntry,
+        ValidationCache,
+    )
 
 
 class ASN1BundleValidator:
+    # checks run module by module, in this order, before the duplicate
+    # definitions; the order of the definitions is checked last
+    _IMPORTS_CHECK = "imports"
+    _COMPONENTS_CHECK = "components"
+    _DEFINITIONS_CHECK = "definitions"
+
     @staticmethod
     def validate_bundle_from_config(
         config: Union[
@@ -27,79 +37,291 @@ class ASN1BundleValidator:
             GenerateBinaryCommandConfig,
         ],
         bundle: ASN1Bundle,
+        validation_cache: Optional["ValidationCache"] = None,
     ) -> None:
-        ASN1BundleValidator.validate_bundle(bundle)
+        ASN1BundleValidator.validate_bundle(bundle, validation_cache)
         ASN1BundleValidator.check_missing_modules(config, bundle)
 
     @staticmethod
-    def validate_bundle(bundle: ASN1Bundle) -> None:
-        ASN1BundleValidator._check_imported_types_and_check_components(bundle)
-        ASN1BundleValidator._check_bundle_for_duplicate_definitions(bundle)
+    def validate_bundle(
+        bundle: ASN1Bundle, validation_cache: Optional["ValidationCache"] = None
+    ) -> None:
+        """
+        Raises the first error of the bundle. With a validation cache, only
+        the modules that changed, or whose imported modules changed, are
+        checked.
+        """
+        if validation_cache is None:
+            # the checks stop at the first error
+            for error in ASN1BundleValidator._iter_errors(bundle):
+                raise error
+            return
+        errors = ASN1BundleValidator.collect_errors(bundle, validation_cache)
+        if errors:
+            raise errors[0]
 
     @staticmethod
-    def _check_imported_types_and_check_components(bundle: ASN1Bundle) -> None:
-        for asn_module in bundle.get_modules():
-            # Checking that imports are defined.
-            for imported_module in asn_module.get_imported_modules():
-                imp_definitions: List[str] = [
-                    definition.get_type_name()
-                    for definition in imported_module.get_definitions()
-                ]
-                imp_types = flatten(
-                    [
-                        item.get_definitions()
-                        for item in asn_module.get_import_items()
-                        if item.get_module_name()
-                        == imported_module.get_module_name()
-                    ]
-                )
+    def collect_errors(
+        bundle: ASN1Bundle, validation_cache: Optional["ValidationCache"] = None
+    ) -> List[ASN1ConsistencyError]:
+        """
+        Returns every error found in the bundle, in the order validate_bundle
+        would find them.
+        """
+        if validation_cache is None:
+            return list(ASN1BundleValidator._iter_errors(bundle))
+
+        module_names = bundle.get_modules_names()
+        if len(set(module_names)) < len(module_names):
+            # the cache is indexed by module name
+            return list(ASN1BundleValidator._iter_errors(bundle))
+        return ASN1BundleValidator._collect_errors_incrementally(
+            bundle, validation_cache
+        )
+
+    @staticmethod
+    def _iter_errors(bundle: ASN1Bundle) -> Iterator[ASN1ConsistencyError]:
+        for module in bundle.get_modules():
+            yield from ASN1BundleValidator._check_imported_types(bundle, module)
+        sequence_keys = ASN1BundleValidator._get_sequence_keys(bundle)
+        for module in bundle.get_modules():
+            yield from ASN1BundleValidator._check_components(
+                module, sequence_keys
+            )
+        yield from ASN1BundleValidator._check_bundle_for_duplicate_definitions(
+            bundle
+        )
+        # import cycles and recursive definitions; the orders are kept for
+        # the generators
+        modules: List[Asn1Module] = bundle.get_modules()
+        try:
+            modules = bundle.get_modules_ordered()
+        except ASN1ConsistencyError as error:
+            yield error
+        for module in modules:
+            yield from ASN1BundleValidator._check_definitions_order(
+                bundle, module
+            )
+
+    @staticmethod
+    def _collect_errors_incrementally(
+        bundle: ASN1Bundle, validation_cache: "ValidationCache"
+    ) -> List[ASN1ConsistencyError]:
+        modules = bundle.get_modules()
+        validation_cache.update_names(modules)
+        # a type defined twice is no valid WITH COMPONENTS reference: the
+        # results of a module also depend on the types defined twice
+        duplicates_digest = hashlib.sha256(
+            "\n".join(sorted(validation_cache.get_duplicates())).encode()
+        ).hexdigest()
+        fingerprints = validation_cache.get_fingerprints(modules)
 
-                undefined = set(imp_types) - set(imp_definitions)
-                if undefined:
-                    raise ASN1ConsistencyError(
-                        f"Error parsing '{asn_module.get_module_name()}': "
-                        + f"Imports {undefined} From "
-                        + f"'{imported_module.get_module_name()}' not found."
+        results: Dict[str, Dict[str, List["ErrorEntry"]]] = {}
+        sequence_keys: Optional[Dict[str, Optional[Dict[str, str]]]] = None
+        for module in modules:
+            module_name = module.get_module_name()
+            fingerprint = fingerprints[module_name]
+            if fingerprint is not None:
+                fingerprint = f"{fingerprint}-{duplicates_digest}"
+            module_results = validation_cache.get_results(fingerprint)
+            if module_results is None:
+                if sequence_keys is None:
+                    sequence_keys = ASN1BundleValidator._get_sequence_keys(
+                        bundle
                     )
+                module_results = ASN1BundleValidator._check_module(
+                    bundle, module, sequence_keys
+                )
+                validation_cache.set_results(fingerprint, module_results)
+            results[module_name] = module_results
+        validation_cache.store()
+
+        def get_errors(
+            module: Asn1Module, check: str
+        ) -> List[ASN1ConsistencyError]:
+            return [
+                ASN1ConsistencyError(
+                    message,
+                    module_name=module_name,
+                    definition_name=name,
+                    field_path=tuple(field_path),
+                )
+                for message, module_name, name, field_path in results[
+                    module.get_module_name()
+                ][check]
+            ]
+
+        errors: List[ASN1ConsistencyError] = []
+        for check in (
+            ASN1BundleValidator._IMPORTS_CHECK,
+            ASN1BundleValidator._COMPONENTS_CHECK,
+        ):
+            for module in modules:
+                errors.extend(get_errors(module, check))
+        errors.extend(
+            ASN1BundleValidator._check_duplicates_from_index(
+                bundle, validation_cache
+            )
+        )
+        try:
+            modules = bundle.get_modules_ordered()
+        except ASN1ConsistencyError as error:
+            errors.append(error)
+        for module in modules:
+            errors.extend(
+                get_errors(module, ASN1BundleValidator._DEFINITIONS_CHECK)
+            )
+        return errors
+
+    @staticmethod
+    def _check_module(
+        bundle: ASN1Bundle,
+        module: Asn1Module,
+        sequence_keys: Dict[str, Optional[Dict[str, str]]],
+    ) -> Dict[str, List["ErrorEntry"]]:
+        """
+        Returns the errors of the checks run module by module, by check name.
+        """
+        checks: Dict[str, Iterator[ASN1ConsistencyError]] = {
+            ASN1BundleValidator._IMPORTS_CHECK: (
+                ASN1BundleValidator._check_imported_types(bundle, module)
+            ),
+            ASN1BundleValidator._COMPONENTS_CHECK: (
+                ASN1BundleValidator._check_components(module, sequence_keys)
+            ),
+            ASN1BundleValidator._DEFINITIONS_CHECK: (
+                ASN1BundleValidator._check_definitions_order(bundle, module)
+            ),
+        }
+        return {
+            check: [
+                (
+                    str(error),
+                    error.module_name,
+                    error.definition_name,
+                    list(error.field_path),
+                )
+                for error in errors
+            ]
+            for check, errors in checks.items()
+        }
+
+    @staticmethod
+    def _check_imported_types(
+        bundle: ASN1Bundle, asn_module: Asn1Module
+    ) -> Iterator[ASN1ConsistencyError]:
+        symbol_table = bundle.get_symbol_table()
+        # Checking that imports are defined.
+        imports = symbol_table.get_imports(asn_module.get_module_name())
+        for imported_module in asn_module.get_imported_modules():
+            imp_definitions = symbol_table.get_module_definitions(
+                imported_module.get_module_name()
+            )
+            imp_types = imports.get(imported_module.get_module_name(), set())
+
+            undefined = imp_types - imp_definitions.keys()
+            if undefined:
+                yield ASN1ConsistencyError(
+                    f"Error parsing '{asn_module.get_module_name()}': "
+                    + f"Imports {undefined} From "
+                    + f"'{imported_module.get_module_name()}' not found.",
+                    module_name=asn_module.get_module_name(),
+                )
 
-        # Check components. Create a helper graph with only one module.
-        definitions: List[Definitions] = []
-        for asn_model in bundle.get_modules():
-            definitions.extend(asn_model.get_definitions())
-        helper_asn: Asn1Module = Asn1Module(
-            "helper", definitions, None, None, None
+    @staticmethod
+    def _get_sequence_keys(
+        bundle: ASN1Bundle,
+    ) -> Dict[str, Optional[Dict[str, str]]]:
+        # the WITH COMPONENTS of a module may constrain the sequences of any
+        # module of the bundle; their keys are indexed once
+        return get_sequence_keys(
+            definition
+            for asn_model in bundle.get_modules()
+            for definition in asn_model.get_definitions()
         )
-        model_processor_check_used_components_defined(helper_asn)
-        del helper_asn
+
+    @staticmethod
+    def _check_components(
+        asn_model: Asn1Module,
+        sequence_keys: Dict[str, Optional[Dict[str, str]]],
+    ) -> Iterator[ASN1ConsistencyError]:
+        for definition in asn_model.get_definitions():
+            yield from check_sequence_components(
+                asn_model.get_module_name(), definition, sequence_keys
+            )
 
     @staticmethod
     def _check_bundle_for_duplicate_definitions(
         bundle: ASN1Bundle,
-    ) -> None:
+    ) -> Iterator[ASN1ConsistencyError]:
         already_defined: Dict[str, str] = {}
         for module in bundle.get_modules():
             for definition in module.get_definitions():
-                if isinstance(definition, Definitions):
-                    if definition.get_type_name() in already_defined:
-                        def_location_in_dict = already_defined[
-                            definition.get_type_name()
-                        ]
-                        # Check to see if the type is defined twice in the same
-                        # file, or if it is defined in different files
-                        definition_location = (
-                            f"{def_location_in_dict}"
-                            if def_location_in_dict == module.get_module_name()
-                            else f"{def_location_in_dict} and "
-                            f"{module.get_module_name()}"
-                        )
-                        raise ASN1ConsistencyError(
-                            f"The type {definition.get_type_name()} "
-                            f"was already defined in "
-                            f"{definition_location}"
-                        )
-                    already_defined[
-                        definition.get_type_name()
-                    ] = module.get_module_name()
+                error = ASN1BundleValidator._check_duplicate_definition(
+                    definition.get_type_name(),
+                    module.get_module_name(),
+                    already_defined,
+                )
+                if error is not None:
+                    yield error
+
+    @staticmethod
+    def _check_duplicates_from_index(
+        bundle: ASN1Bundle, validation_cache: "ValidationCache"
+    ) -> Iterator[ASN1ConsistencyError]:
+        """
+        Same as _check_bundle_for_duplicate_definitions, going only through
+        the modules defining a type defined twice.
+        """
+        duplicates = validation_cache.get_duplicates()
+        defining_modules = {
+            module_name
+            for type_name in duplicates
+            for module_name in validation_cache.get_definers(type_name)
+        }
+        already_defined: Dict[str, str] = {}
+        for module_name in bundle.get_modules_names():
+            if module_name not in defining_modules:
+                continue
+            for type_name in validation_cache.get_type_names(module_name):
+                if type_name not in duplicates:
+                    continue
+                error = ASN1BundleValidator._check_duplicate_definition(
+                    type_name, module_name, already_defined
+                )
+                if error is not None:
+                    yield error
+
+    @staticmethod
+    def _check_duplicate_definition(
+        type_name: str, module_name: str, already_defined: Dict[str, str]
+    ) -> Optional[ASN1ConsistencyError]:
+        if type_name not in already_defined:
+            already_defined[type_name] = module_name
+            return None
+        def_location_in_dict = already_defined[type_name]
+        # Check to see if the type is defined twice in the same file, or if
+        # it is defined in different files
+        definition_location = (
+            f"{def_location_in_dict}"
+            if def_location_in_dict == module_name
+            else f"{def_location_in_dict} and {module_name}"
+        )
+        return ASN1ConsistencyError(
+            f"The type {type_name} was already defined in "
+            f"{definition_location}",
+            module_name=module_name,
+            definition_name=type_name,
+        )
+
+    @staticmethod
+    def _check_definitions_order(
+        bundle: ASN1Bundle, module: Asn1Module
+    ) -> Iterator[ASN1ConsistencyError]:
+        try:
+            bundle.get_definitions_ordered(module)
+        except ASN1ConsistencyError as error:
+            yield error
 
     @staticmethod
     def check_missing_modules(
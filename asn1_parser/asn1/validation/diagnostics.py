@@ -0,0 +1,437 @@
+import functools
+import json
+import multiprocessing
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from textx.exceptions import TextXError
+
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.module_index import ModuleIndex
+from asn1_parser.asn1.parse_cache import ParseCache
+from asn1_parser.asn1.parser import Asn1Parser
+from asn1_parser.asn1.validation.asn1_bundle_validator import (
+    ASN1BundleValidator,
+)
+from asn1_parser.asn1.validation.errors import ASN1ConsistencyError
+from asn1_parser.asn1.validation.validation_cache import ValidationCache
+from asn1_parser.log.logger import Logger
+
+
+class Diagnostic:
+    """
+    An error found in an input file. The line, the column, the module and
+    the definition are None when they are not known.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        file_path: str,
+        message: str,
+        line: Optional[int] = None,
+        column: Optional[int] = None,
+        module_name: Optional[str] = None,
+        definition_name: Optional[str] = None,
+    ) -> None:
+        self._file_path = file_path
+        self._message = message
+        self._line = line
+        self._column = column
+        self._module_name = module_name
+        self._definition_name = definition_name
+
+    def __str__(self) -> str:
+        location = self._file_path
+        if self._line is not None:
+            location += f":{self._line}"
+            if self._column is not None:
+                location += f":{self._column}"
+        if self._definition_name is not None:
+            location += f": {self._definition_name}"
+        return f"{location}: {self._message}"
+
+    def get_file_path(self) -> str:
+        return self._file_path
+
+    def get_message(self) -> str:
+        return self._message
+
+    def get_line(self) -> Optional[int]:
+        return self._line
+
+    def get_column(self) -> Optional[int]:
+        return self._column
+
+    def get_module_name(self) -> Optional[str]:
+        return self._module_name
+
+    def get_definition_name(self) -> Optional[str]:
+        return self._definition_name
+
+    def get_sort_key(self) -> Tuple[str, int, int, str]:
+        return (
+            self._file_path,
+            self._line or 0,
+            self._column or 0,
+            self._message,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": self._file_path,
+            "line": self._line,
+            "column": self._column,
+            "module": self._module_name,
+            "definition": self._definition_name,
+            "message": self._message,
+        }
+
+    @classmethod
+    def create_from_exception(
+        cls, file_path: str, input_text: str, exception: Exception
+    ) -> "Diagnostic":
+        """
+        Returns the diagnostic of an error raised while parsing or
+        validating the module of the file.
+        """
+        if isinstance(exception, TextXError):
+            return cls(
+                file_path,
+                exception.message,
+                line=exception.line,
+                column=exception.col,
+            )
+        module_name: Optional[str] = None
+        definition_name: Optional[str] = None
+        field_path: Tuple[str, ...] = ()
+        message = str(exception)
+        if isinstance(exception, ASN1ConsistencyError):
+            module_name = exception.module_name
+            definition_name = exception.definition_name
+            field_path = exception.field_path
+        elif not isinstance(exception, SyntaxError):
+            message = f"{type(exception).__name__}: {message}"
+        return cls(
+            file_path,
+            message,
+            line=cls._find_line(input_text, definition_name, field_path),
+            module_name=module_name,
+            definition_name=definition_name,
+        )
+
+    @staticmethod
+    def _find_line(
+        input_text: str,
+        definition_name: Optional[str],
+        field_path: Tuple[str, ...] = (),
+    ) -> int:
+        """
+        Returns the line of the last key of the field path found in the
+        definition, or of the definition when none is, or of the module
+        header when the definition is not known or not found.
+        """
+        match: Optional[Any] = None
+        if definition_name is not None:
+            match = re.search(
+                rf"^[\t ]*{re.escape(definition_name)}\s*::=",
+                input_text,
+                re.MULTILINE,
+            )
+        if match is not None:
+            # each key is looked for after the previous one, as a whole name
+            for key in field_path:
+                key_match = re.compile(
+                    rf"(?<![\w-]){re.escape(key)}(?![\w-])"
+                ).search(input_text, match.end())
+                if key_match is None:
+                    break
+                match = key_match
+        if match is None:
+            match = re.search(r"\bDEFINITIONS\b", input_text)
+        if match is None:
+            return 1
+        return input_text.count("\n", 0, match.start()) + 1
+
+
+class DiagnosticsCollector:
+    """
+    Validates the modules of the input files and collects every error
+    instead of stopping at the first one. The files are parsed, with the
+    checks of their own module, in worker processes; the checks across
+    modules run on the bundle of the modules that could be parsed.
+    """
+
+    _logger = Logger(__name__)
+
+    @classmethod
+    def collect(  # pylint: disable=too-many-arguments,too-many-locals
+        cls,
+        input_paths: List[str],
+        jobs: int = 1,
+        use_fast_parser: bool = False,
+        parse_cache: Optional[ParseCache] = None,
+        changed_file_paths: Optional[List[str]] = None,
+    ) -> List[Diagnostic]:
+        """
+        Returns the errors of the input files, sorted by file and line.
+
+        With a parse cache, the unchanged files are not parsed again and the
+        unchanged modules are not validated again. With changed files, only
+        the errors of the changed files and of the files importing their
+        modules, directly or not, are returned.
+        """
+        module_index = ModuleIndex(input_paths, None)
+        file_paths = module_index.get_file_paths()
+
+        results = cls._parse_files(
+            file_paths, jobs, use_fast_parser, parse_cache
+        )
+
+        diagnostics: List[Diagnostic] = []
+        modules: Dict[str, Asn1Module] = {}
+        file_paths_by_module: Dict[str, str] = {}
+        for file_path, (module, file_diagnostics) in zip(file_paths, results):
+            if module is None:
+                diagnostics.extend(file_diagnostics)
+                continue
+            module_name = module.get_module_name()
+            if module_name in modules:
+                diagnostics.append(
+                    cls._create_diagnostic(
+                        file_path,
+                        ASN1ConsistencyError(
+                            f"The module {module_name} is also defined in "
+                            f"{file_paths_by_module[module_name]}",
+                            module_name=module_name,
+                        ),
+                    )
+                )
+                continue
+            modules[module_name] = module
+            file_paths_by_module[module_name] = file_path
+
+        checked_file_paths: Optional[Set[str]] = None
+        if changed_file_paths is not None:
+            checked_file_paths = cls._get_affected_file_paths(
+                file_paths, changed_file_paths, modules, file_paths_by_module
+            )
+
+        # modules the index found, whether they could be parsed or not
+        known_module_names: Set[str] = {
+            module_name
+            for module_name in map(module_index.get_module_name, file_paths)
+            if module_name is not None
+        }
+        for module_name, error in cls._exclude_incomplete_modules(
+            modules, known_module_names
+        ):
+            diagnostics.append(
+                cls._create_diagnostic(file_paths_by_module[module_name], error)
+            )
+
+        bundle = ASN1BundleBuilder.build(list(modules.values()))
+        validation_cache: Optional[ValidationCache] = None
+        if parse_cache is not None:
+            validation_cache = parse_cache.get_validation_cache()
+        for error in ASN1BundleValidator.collect_errors(
+            bundle, validation_cache
+        ):
+            file_path = ""
+            if error.module_name is not None:
+                file_path = file_paths_by_module.get(error.module_name, "")
+            diagnostics.append(cls._create_diagnostic(file_path, error))
+
+        if checked_file_paths is not None:
+            diagnostics = [
+                diagnostic
+                for diagnostic in diagnostics
+                if diagnostic.get_file_path() in checked_file_paths
+            ]
+        return sorted(diagnostics, key=Diagnostic.get_sort_key)
+
+    @classmethod
+    def _parse_files(
+        cls,
+        file_paths: List[str],
+        jobs: int,
+        use_fast_parser: bool,
+        parse_cache: Optional[ParseCache],
+    ) -> List[Tuple[Optional[Asn1Module], List[Diagnostic]]]:
+        results: List[Tuple[Optional[Asn1Module], List[Diagnostic]]] = [
+            (None, [])
+        ] * len(file_paths)
+        input_texts: Dict[str, str] = {}
+        missing: List[int] = []
+        for index, file_path in enumerate(file_paths):
+            module: Optional[Asn1Module] = None
+            if parse_cache is not None:
+                with open(file_path, "r", encoding="utf8") as input_file:
+                    input_texts[file_path] = input_file.read()
+                module = parse_cache.load_from_text(input_texts[file_path])
+            if module is None:
+                missing.append(index)
+            else:
+                results[index] = (module, [])
+        if not missing:
+            return results
+
+        processes = min(jobs, len(missing))
+        parse_file = functools.partial(
+            _parse_file_for_diagnostics, use_fast_parser=use_fast_parser
+        )
+        missing_paths = [file_paths[index] for index in missing]
+        if processes <= 1:
+            parsed = [parse_file(file_path) for file_path in missing_paths]
+        else:
+            cls._logger.debug(
+                f"validating {len(missing)} modules with {processes} "
+                "processes"
+            )
+            with multiprocessing.Pool(processes=processes) as pool:
+                parsed = pool.map(parse_file, missing_paths)
+
+        for index, result in zip(missing, parsed):
+            results[index] = result
+            module = result[0]
+            if parse_cache is not None and module is not None:
+                parse_cache.store_from_text(
+                    input_texts[file_paths[index]], module
+                )
+        if parse_cache is not None:
+            parse_cache.evict()
+        return results
+
+    @staticmethod
+    def _get_affected_file_paths(
+        file_paths: List[str],
+        changed_file_paths: List[str],
+        modules: Dict[str, Asn1Module],
+        file_paths_by_module: Dict[str, str],
+    ) -> Set[str]:
+        """
+        Returns the input files among the changed files, with the files of
+        the modules importing their modules, directly or not.
+        """
+        changed = {
+            os.path.abspath(file_path) for file_path in changed_file_paths
+        }
+        affected_file_paths = {
+            file_path
+            for file_path in file_paths
+            if os.path.abspath(file_path) in changed
+        }
+
+        importers: Dict[str, Set[str]] = {}
+        for module_name, module in modules.items():
+            for import_item in module.get_import_items():
+                importers.setdefault(import_item.get_module_name(), set()).add(
+                    module_name
+                )
+        module_names = [
+            module_name
+            for module_name, file_path in file_paths_by_module.items()
+            if file_path in affected_file_paths
+        ]
+        while module_names:
+            module_name = module_names.pop()
+            for importer_name in importers.get(module_name, set()):
+                importer_path = file_paths_by_module[importer_name]
+                if importer_path not in affected_file_paths:
+                    affected_file_paths.add(importer_path)
+                    module_names.append(importer_name)
+        return affected_file_paths
+
+    @staticmethod
+    def _exclude_incomplete_modules(
+        modules: Dict[str, Asn1Module], known_module_names: Set[str]
+    ) -> List[Tuple[str, ASN1ConsistencyError]]:
+        """
+        Removes the modules importing modules that are not in the bundle,
+        directly or through other modules. Only the imports of modules
+        found in no input file are errors: the others were reported when
+        parsing their file.
+        """
+        errors: List[Tuple[str, ASN1ConsistencyError]] = []
+        is_excluding = True
+        while is_excluding:
+            is_excluding = False
+            for module_name, module in list(modules.items()):
+                missing = [
+                    import_item.get_module_name()
+                    for import_item in module.get_import_items()
+                    if import_item.get_module_name() not in modules
+                ]
+                if not missing:
+                    continue
+                del modules[module_name]
+                is_excluding = True
+                undeclared = set(missing) - known_module_names
+                if undeclared:
+                    errors.append(
+                        (
+                            module_name,
+                            ASN1ConsistencyError(
+                                f"Module '{module_name}' uses undeclared "
+                                f"dependencies {undeclared}",
+                                module_name=module_name,
+                            ),
+                        )
+                    )
+        return errors
+
+    @staticmethod
+    def _create_diagnostic(
+        file_path: str, error: ASN1ConsistencyError
+    ) -> Diagnostic:
+        input_text = ""
+        if file_path:
+            with open(file_path, "r", encoding="utf8") as input_file:
+                input_text = input_file.read()
+        return Diagnostic.create_from_exception(file_path, input_text, error)
+
+    @staticmethod
+    def to_json(diagnostics: List[Diagnostic]) -> str:
+        return json.dumps(
+            [diagnostic.to_dict() for diagnostic in diagnostics], indent=2
+        )
+
+    @staticmethod
+    def write_json(diagnostics: List[Diagnostic], output_path: str) -> None:
+        with open(output_path, "w", encoding="utf8") as output_file:
+            output_file.write(DiagnosticsCollector.to_json(diagnostics))
+            output_file.write("\n")
+
+
+def _parse_file_for_diagnostics(
+    file_path: str, use_fast_parser: bool = False
+) -> Tuple[Optional[Asn1Module], List[Diagnostic]]:
+    # The diagnostics are built in the worker, where the text of the file is
+    # at hand, and only hold plain values to send back. The module is only
+    # returned when it has no error.
+    with open(file_path, "r", encoding="utf8") as input_file:
+        input_text = input_file.read()
+    errors: List[ASN1ConsistencyError] = []
+    try:
+        module = Asn1Parser.parse_from_text(
+            input_text, True, use_fast_parser, errors
+        )
+    except Exception as exception:  # pylint: disable=broad-except
+        return (
+            None,
+            [
+                Diagnostic.create_from_exception(
+                    file_path, input_text, exception
+                )
+            ],
+        )
+    if errors:
+        return (
+            None,
+            [
+                Diagnostic.create_from_exception(file_path, input_text, error)
+                for error in errors
+            ],
+        )
+    return module, []
@@ -0,0 +1,22 @@
+from typing import Optional, Tuple
+
+
+class ASN1ConsistencyError(Exception):
+    """
+    The module and the definition the error was found in, when known, locate
+    it in the diagnostics of the validate command. The field path holds the
+    keys leading from the definition to the field at fault: the key of the
+    field, then the keys of its WITH COMPONENTS.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        module_name: Optional[str] = None,
+        definition_name: Optional[str] = None,
+        field_path: Tuple[str, ...] = (),
+    ) -> None:
+        super().__init__(message)
+        self.module_name = module_name
+        self.definition_name = definition_name
+        self.field_path = field_path
@@ -0,0 +1,270 @@
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.parser import Asn1Parser
+from asn1_parser.log.logger import Logger
+
+# message, module name, definition name, field path
+ErrorEntry = Tuple[str, Optional[str], Optional[str], List[str]]
+
+
+class ValidationCache:  # pylint: disable=too-many-instance-attributes
+    """
+    Validation results kept in a JSON file between runs.
+
+    The errors of the checks of a module are stored by the fingerprint of
+    the module, which covers its text and the fingerprints of the modules
+    it imports: a module is checked again only when it or a module it
+    depends on changed.
+
+    The names defined by each module are kept in an index updated from the
+    modules whose text changed, so that the definitions defined twice are
+    found without going through every module.
+    """
+
+    _logger = Logger(__name__)
+
+    FILE_NAME = "validation-cache.json"
+    _MAX_RESULTS = 10000
+    # the sources validation results depend on, besides the parser's
+    _SOURCE_MODULES = (
+        "asn1_parser.asn1.asn1_bundle_builder",
+        "asn1_parser.asn1.symbol_table",
+        "asn1_parser.asn1.validation.asn1_bundle_validator",
+        "asn1_parser.generators.cfs.module_sorter",
+    )
+
+    def __init__(self, cache_path: str) -> None:
+        self._cache_path = cache_path
+        self._hits = 0
+        self._misses = 0
+        # module fingerprint -> check name -> errors
+        self._results: Dict[str, Dict[str, List[ErrorEntry]]] = {}
+        # module name -> (text digest, type names in definition order)
+        self._names: Dict[str, Tuple[str, List[str]]] = {}
+        # type name -> names of the modules defining it, once per definition
+        self._definers: Dict[str, List[str]] = {}
+        self._duplicates: Set[str] = set()
+        self._code_fingerprint = self._get_code_fingerprint()
+        self._load()
+
+    @classmethod
+    def create_in_dir(cls, cache_dir: str) -> "ValidationCache":
+        return cls(os.path.join(cache_dir, cls.FILE_NAME))
+
+    def get_hits(self) -> int:
+        return self._hits
+
+    def get_misses(self) -> int:
+        return self._misses
+
+    def get_fingerprints(
+        self, modules: List[Asn1Module]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Returns the fingerprint of each module by module name. It is None for
+        the modules that were not parsed from a text, that import each
+        other or that import such modules: they are always checked.
+        """
+        modules_by_name: Dict[str, Asn1Module] = {
+            module.get_module_name(): module for module in modules
+        }
+        fingerprints: Dict[str, Optional[str]] = {}
+        for module in modules:
+            self._compute_fingerprint(
+                module.get_module_name(), modules_by_name, fingerprints
+            )
+        return fingerprints
+
+    def _compute_fingerprint(
+        self,
+        module_name: str,
+        modules_by_name: Dict[str, Asn1Module],
+        fingerprints: Dict[str, Optional[str]],
+    ) -> Optional[str]:
+        if module_name in fingerprints:
+            return fingerprints[module_name]
+        module = modules_by_name.get(module_name)
+        if module is None or module.get_text_digest() is None:
+            fingerprints[module_name] = None
+            return None
+        # None until computed: an import cycle leads back here
+        fingerprints[module_name] = None
+
+        digest = hashlib.sha256()
+        digest.update(self._code_fingerprint.encode("utf-8"))
+        digest.update(str(module.get_text_digest()).encode("utf-8"))
+        for imported_name in sorted(
+            {item.get_module_name() for item in module.get_import_items()}
+        ):
+            imported_fingerprint = self._compute_fingerprint(
+                imported_name, modules_by_name, fingerprints
+            )
+            if imported_fingerprint is None:
+                return None
+            digest.update(f"{imported_name}:{imported_fingerprint}".encode())
+        fingerprints[module_name] = digest.hexdigest()
+        return fingerprints[module_name]
+
+    def get_results(
+        self, fingerprint: Optional[str]
+    ) -> Optional[Dict[str, List[ErrorEntry]]]:
+        """
+        Returns the errors of the checks of the module with this
+        fingerprint, by check name, or None if the module must be checked.
+        """
+        if fingerprint is None or fingerprint not in self._results:
+            self._misses += 1
+            return None
+        self._hits += 1
+        # most recently used last, for the pruning
+        results = self._results.pop(fingerprint)
+        self._results[fingerprint] = results
+        return results
+
+    def set_results(
+        self, fingerprint: Optional[str], results: Dict[str, List[ErrorEntry]]
+    ) -> None:
+        if fingerprint is not None:
+            self._results.pop(fingerprint, None)
+            self._results[fingerprint] = results
+
+    def update_names(self, modules: List[Asn1Module]) -> None:
+        """
+        Brings the index of the defined names up to date with the modules,
+        reading only the definitions of the modules whose text changed.
+        """
+        module_names: Set[str] = set()
+        for module in modules:
+            module_name = module.get_module_name()
+            module_names.add(module_name)
+            text_digest = module.get_text_digest()
+            stored = self._names.get(module_name)
+            if (
+                stored is not None
+                and text_digest is not None
+                and stored[0] == text_digest
+            ):
+                continue
+            self._remove_names(module_name)
+            type_names = [
+                definition.get_type_name()
+                for definition in module.get_definitions()
+            ]
+            # without a text digest, the names are read again on every run
+            self._names[module_name] = (text_digest or "", type_names)
+            for type_name in type_names:
+                self._definers.setdefault(type_name, []).append(module_name)
+                self._update_duplicate(type_name)
+
+        for module_name in set(self._names) - module_names:
+            self._remove_names(module_name)
+
+    def _remove_names(self, module_name: str) -> None:
+        stored = self._names.pop(module_name, None)
+        if stored is None:
+            return
+        for type_name in stored[1]:
+            definers = self._definers[type_name]
+            definers.remove(module_name)
+            if not definers:
+                del self._definers[type_name]
+            self._update_duplicate(type_name)
+
+    def _update_duplicate(self, type_name: str) -> None:
+        if len(self._definers.get(type_name, [])) > 1:
+            self._duplicates.add(type_name)
+        else:
+            self._duplicates.discard(type_name)
+
+    def get_duplicates(self) -> Set[str]:
+        """
+        Returns the type names defined more than once in the modules of the
+        last update.
+        """
+        return self._duplicates
+
+    def get_definers(self, type_name: str) -> List[str]:
+        """
+        Returns the names of the modules defining the type, once per
+        definition.
+        """
+        return self._definers.get(type_name, [])
+
+    def get_type_names(self, module_name: str) -> List[str]:
+        """
+        Returns the type names defined by the module, in definition order.
+        """
+        return self._names[module_name][1]
+
+    def store(self) -> None:
+        # the least recently used results are dropped
+        results = list(self._results.items())
+        del results[: -self._MAX_RESULTS]
+        cache_dir = os.path.dirname(self._cache_path) or "."
+        os.makedirs(cache_dir, exist_ok=True)
+        # write then rename, so that concurrent runs never read half a file
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=cache_dir, suffix=".tmp"
+        )
+        with os.fdopen(file_descriptor, "w", encoding="utf8") as cache_file:
+            json.dump(
+                {
+                    "code": self._code_fingerprint,
+                    "results": dict(results),
+                    "names": self._names,
+                },
+                cache_file,
+            )
+        os.replace(temporary_path, self._cache_path)
+
+    def _load(self) -> None:
+        try:
+            with open(self._cache_path, "r", encoding="utf8") as cache_file:
+                content: Dict[str, Any] = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            self._logger.warning(f"discarding unreadable {self._cache_path}")
+            return
+        if content.get("code") != self._code_fingerprint:
+            return
+
+        self._results = {
+            fingerprint: {
+                check: [tuple(error) for error in errors]  # type: ignore
+                for check, errors in results.items()
+            }
+            for fingerprint, results in content["results"].items()
+        }
+        for module_name, (text_digest, type_names) in content["names"].items():
+            self._names[module_name] = (text_digest, type_names)
+            for type_name in type_names:
+                self._definers.setdefault(type_name, []).append(module_name)
+        self._duplicates = {
+            type_name
+            for type_name, definers in self._definers.items()
+            if len(definers) > 1
+        }
+
+    @classmethod
+    def _get_code_fingerprint(cls) -> str:
+        digest = hashlib.sha256()
+        digest.update(Asn1Parser.get_grammar_fingerprint().encode("utf-8"))
+        for module_name in cls._SOURCE_MODULES:
+            module_path = inspect.getsourcefile(
+                importlib.import_module(module_name)
+            )
+            if module_path is None:
+                raise FileNotFoundError(
+                    f"Cannot fingerprint {module_name}: no source file"
+                )
+            with open(module_path, "rb") as module_file:
+                digest.update(module_file.read())
+        return digest.hexdigest()
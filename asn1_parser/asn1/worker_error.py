@@ -0,0 +1,54 @@
+import pickle
+from typing import Any, Dict, Optional, Type
+
+from textx.exceptions import TextXError
+
+
+class WorkerError:
+    """
+    Picklable stand-in for an exception raised in a worker process.
+
+    textX errors cannot cross processes: their args hold the message as
+    bytes, which breaks their unpickling, and syntax errors keep the
+    metaclasses of the expected rules. They are sent as their plain fields
+    and rebuilt in the parent process.
+    """
+
+    _TEXTX_FIELDS = ("line", "col", "err_type", "filename")
+
+    def __init__(self, exception: Exception) -> None:
+        self._exception_type: Type[Exception] = type(exception)
+        self._message: str = str(exception)
+        self._textx_fields: Optional[Dict[str, Any]] = None
+        self._exception: Optional[Exception] = None
+
+        if isinstance(exception, TextXError):
+            self._message = exception.message
+            self._textx_fields = {
+                field: getattr(exception, field) for field in self._TEXTX_FIELDS
+            }
+        elif self._is_picklable(exception):
+            self._exception = exception
+
+    @staticmethod
+    def _is_picklable(exception: Exception) -> bool:
+        try:
+            pickle.loads(pickle.dumps(exception))
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
+
+    def get_exception(self) -> Exception:
+        """
+        Returns the exception as raised in the worker, or the closest
+        equivalent that could be sent to the parent process.
+        """
+        if self._exception is not None:
+            return self._exception
+        if self._textx_fields is not None:
+            try:
+                return self._exception_type(self._message, **self._textx_fields)
+            except TypeError:
+                # e.g. TextXRegistrationError only takes a message
+                return self._exception_type(self._message)
+        return RuntimeError(f"{self._exception_type.__name__}: {self._message}")
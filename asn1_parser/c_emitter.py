@@ -0,0 +1,118 @@
+from typing import List, Optional
+
+
+class CEmitter:
+    """
+    Builds C code as a list of lines joined once, so that emitting nested
+    initializers or large enums takes a time linear in the size of the code.
+    Structs and enums are always packed.
+    """
+
+    INDENT = "  "
+    PACKED = "__attribute__((packed))"
+
+    def __init__(self) -> None:
+        self._lines: List[str] = []
+
+    def __str__(self) -> str:
+        return "\n".join(self._lines)
+
+    def write_line(self, line: str, indent_level: int = 0) -> None:
+        if indent_level:
+            self._lines.append(self.INDENT * indent_level + line)
+        else:
+            self._lines.append(line)
+
+    def write_struct_typedef(self, type_name: str, members: List[str]) -> None:
+        """
+        Writes a packed struct typedef. The members are declarations or
+        comments, one per line.
+        """
+        self._lines.append("typedef struct")
+        self._lines.append("{")
+        for member in members:
+            self._lines.append(self.INDENT + member)
+        self._lines.append(f"}} {self.PACKED} {type_name};")
+
+    def write_enum_typedef(self, type_name: str, items: List[str]) -> None:
+        """
+        Writes a packed enum typedef. The items are enumerators, one per
+        line.
+        """
+        self._lines.append("typedef enum {")
+        for item in items:
+            self._lines.append(self.INDENT + item)
+        self._lines.append(f"}} {self.PACKED} {type_name};")
+
+    def write_union(
+        self, tag_name: str, variable_name: str, members: List[str]
+    ) -> None:
+        self._lines.append(f"union {tag_name} {{")
+        for member in members:
+            self._lines.append(self.INDENT + member)
+        self._lines.append(f"}} {variable_name};")
+
+    def open_initializer(self, field_name: str, indent_level: int) -> None:
+        """
+        Opens the designated initializer of a field, closed by
+        close_initializer.
+        """
+        self.write_line(f".{field_name} = {{", indent_level)
+
+    def close_initializer(self, indent_level: int) -> None:
+        self.write_line("},", indent_level)
+
+    @staticmethod
+    def declaration(
+        c_type: str, name: str, length: Optional[int] = None
+    ) -> str:
+        if length is None:
+            return f"{c_type} {name};"
+        return f"{c_type} {name}[{length}];"
+
+    @classmethod
+    def enumerator(
+        cls, name: str, value: int, comment: Optional[str] = None
+    ) -> str:
+        return cls._with_trailing_comment(f"{name} = {value},", comment)
+
+    @classmethod
+    def member(
+        cls, c_type: str, name: str, comment: Optional[str] = None
+    ) -> str:
+        """
+        Returns the declaration of a union member.
+        """
+        return cls._with_trailing_comment(f"{c_type} {name};", comment)
+
+    @staticmethod
+    def designator(field_name: str, value: str) -> str:
+        return f".{field_name} = {value},"
+
+    @staticmethod
+    def include(file_name: str, system: bool = True) -> str:
+        if system:
+            return f"#include <{file_name}>"
+        return f'#include "{file_name}"'
+
+    @staticmethod
+    def define(symbol: str, value: str) -> str:
+        return f"#define {symbol} {value}"
+
+    @staticmethod
+    def comment(text: str, skip_space: bool = False) -> str:
+        if skip_space:
+            return f"/*{text}*/"
+        return f"/* {text} */".rstrip()
+
+    @staticmethod
+    def line_comment(text: str) -> str:
+        assert "\n" not in text
+        # without trailing spaces, as for an empty comment or a unit alone
+        return f"// {text}".rstrip()
+
+    @classmethod
+    def _with_trailing_comment(cls, code: str, comment: Optional[str]) -> str:
+        if comment is None:
+            return code
+        return code + "     " + cls.line_comment(comment)
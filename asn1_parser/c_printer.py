@@ -1,10 +1,10 @@
-import os
+import io
 from enum import Enum
 from typing import Dict, List, Optional
 
-import cgen
-
 from asn1_parser.c_data import CData
+from asn1_parser.c_emitter import CEmitter
+from asn1_parser.output_sink import OutputSink
 
 
 class HeaderType(Enum):
@@ -45,7 +45,7 @@ class CPrinter:
         if file_documentation:
             comment += "\n\n" + file_documentation
 
-        return str(cgen.Comment("\n" + comment + "\n", skip_space=True)) + "\n"
+        return CEmitter.comment("\n" + comment + "\n", skip_space=True) + "\n"
 
     @classmethod
     def asn1_to_c_style_naming(cls, name: str) -> str:
@@ -55,10 +55,10 @@ class CPrinter:
         return name.replace("-", "_")
 
     @staticmethod
-    def print_to_file(
+    def print_to_sink(
         cdata: CData,
         filename: str,
-        output_folder: str,
+        sink: OutputSink,
         header_type: HeaderType,
     ) -> None:
         filename_h: str = filename + ".h"
@@ -73,11 +73,7 @@ class CPrinter:
 
         # HEADER file
 
-        with open(
-            file=os.path.join(output_folder, filename_h),
-            mode="w",
-            encoding="utf-8",
-        ) as file:
+        with io.StringIO() as file:
             file.write(
                 CPrinter.generate_cfs_circular_import_guard(
                     filename_h, opening=True
@@ -93,11 +89,11 @@ class CPrinter:
                 or header_type is HeaderType.STORED_DATA_BINARY
             ):
                 if cdata.is_stdbool_needed():
-                    file.write(str(cgen.Include("stdbool.h")))
+                    file.write(CEmitter.include("stdbool.h"))
                     file.write("\n")
                 if cdata.is_stdint_needed():
                     # include predefined types
-                    file.write(str(cgen.Include("stdint.h")))
+                    file.write(CEmitter.include("stdint.h"))
                     file.write("\n")
 
             if (
@@ -144,15 +140,12 @@ class CPrinter:
                     filename_h, opening=False
                 )
             )
+            sink.write_text(filename_h, file.getvalue())
 
         # C file
 
         if header_type is HeaderType.STORED_DATA:
-            with open(
-                file=os.path.join(output_folder, filename_c),
-                mode="w",
-                encoding="utf-8",
-            ) as file:
+            with io.StringIO() as file:
                 file.write(CPrinter.generate_cfs_header(header_comment))
                 file.write("\n")
 
@@ -165,6 +158,7 @@ class CPrinter:
                 if init_list:
                     for init in init_list:
                         file.write(init)
+                sink.write_text(filename_c, file.getvalue())
 
         # binary file
 
@@ -172,9 +166,4 @@ class CPrinter:
             binary_init: Dict[str, List[bytes]] = cdata.get_binary_init()
             if binary_init:
                 for filename_bin, init_byte_list in binary_init.items():
-                    with open(  # type: ignore
-                        file=os.path.join(output_folder, filename_bin + ".bin"),
-                        mode="wb",
-                    ) as file:
-                        for byte_representation in init_byte_list:
-                            file.write(byte_representation)  # type: ignore
+                    sink.write(filename_bin + ".bin", b"".join(init_byte_list))
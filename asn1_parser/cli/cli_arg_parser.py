@@ -1,17 +1,114 @@
 import argparse
+import os
 from typing import List, Optional
 
+from asn1_parser.output_sink import ArchiveSink
+
 
 def _parse_comma_separated_string_argument(fields: str) -> List[str]:
     fields_array = fields.split(",")
     return fields_array
 
 
+def _parse_jobs_argument(jobs: str) -> int:
+    jobs_count = int(jobs)
+    if jobs_count < 0:
+        raise argparse.ArgumentTypeError("must be 0 or a positive number")
+    return jobs_count if jobs_count > 0 else (os.cpu_count() or 1)
+
+
+def _parse_archive_argument(archive_path: str) -> str:
+    if ArchiveSink.get_extension(archive_path) is None:
+        raise argparse.ArgumentTypeError(
+            f"must end with one of {', '.join(ArchiveSink.EXTENSIONS)}"
+        )
+    return archive_path
+
+
 def cli_args_parser() -> argparse.ArgumentParser:
     # How to parse multiple nested sub-commands using python argparse?
     # https://stackoverflow.com/a/19476216/598057
     main_parser = argparse.ArgumentParser()
 
+    # Options shared by all the commands that parse ASN.1 files
+    parse_options_parser = argparse.ArgumentParser(add_help=False)
+    parse_options_parser.add_argument(
+        "--jobs",
+        type=_parse_jobs_argument,
+        help=(
+            "Number of processes used to parse the input files and, by the "
+            "cFS, C and binary generators, to generate the modules (0: one "
+            "per CPU core)."
+        ),
+        default=1,
+    )
+    parse_options_parser.add_argument(
+        "--fast-parser",
+        action="store_true",
+        help=(
+            "Parse the input files with the built-in parser instead of textX "
+            "(files it rejects are parsed again with textX)."
+        ),
+    )
+
+    # Options shared by the commands that keep parsed modules between runs
+    cache_options_parser = argparse.ArgumentParser(add_help=False)
+    cache_options_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        nargs="?",
+        const=".apg-cache",
+        help=(
+            "Folder where parsed modules, validation results and generated "
+            "code are cached, so that unchanged input files are not parsed "
+            "and validated again, nor unchanged definitions generated again "
+            "by the cFS, C and binary generators (default when given "
+            "without a value: .apg-cache)."
+        ),
+        default=None,
+    )
+    cache_options_parser.add_argument(
+        "--cache-size",
+        type=int,
+        help="Size limit of the parse cache, in MB.",
+        default=256,
+    )
+
+    # Options shared by the generate commands
+    output_options_parser = argparse.ArgumentParser(add_help=False)
+    output_options_parser.add_argument(
+        "--depfile",
+        type=str,
+        help=(
+            "Make/Ninja dependency file listing, for each generated file, the "
+            "input files of its module and of the modules it imports, "
+            "directly or not."
+        ),
+        default=None,
+    )
+    output_options_parser.add_argument(
+        "--output-manifest",
+        type=str,
+        help=(
+            "JSON file listing the generated files with the SHA-256 of their "
+            "content and the input files they depend on."
+        ),
+        default=None,
+    )
+
+    # Options shared by the commands running one generator
+    archive_options_parser = argparse.ArgumentParser(add_help=False)
+    archive_options_parser.add_argument(
+        "--output-archive",
+        type=_parse_archive_argument,
+        help=(
+            "Archive into which the generated files are streamed instead of "
+            "the output folder: .tar, .tar.gz, .tgz, .tar.bz2, .tar.xz or "
+            ".zip. The same files give the same archive."
+        ),
+        default=None,
+    )
+
     command_subparsers = main_parser.add_subparsers(
         title="command", dest="command"
     )
@@ -21,7 +118,12 @@ def cli_args_parser() -> argparse.ArgumentParser:
     command_parser_generate_cosmos = command_subparsers.add_parser(
         "generate-cosmos",
         help="Generate COSMOS artefacts.",
-        parents=[],
+        parents=[
+            parse_options_parser,
+            cache_options_parser,
+            output_options_parser,
+            archive_options_parser,
+        ],
         description=(
             "Generate command: "
             "input ASN.1 files are generated into COSMOS files."
@@ -62,7 +164,12 @@ def cli_args_parser() -> argparse.ArgumentParser:
     command_parser_generate_cfs = command_subparsers.add_parser(
         "generate-cfs",
         help="Generate cFS artefacts.",
-        parents=[],
+        parents=[
+            parse_options_parser,
+            cache_options_parser,
+            output_options_parser,
+            archive_options_parser,
+        ],
         description=(
             "Generate command: input ASN.1 files are generated into cFS files."
         ),
@@ -90,7 +197,12 @@ def cli_args_parser() -> argparse.ArgumentParser:
     command_parser_generate_c = command_subparsers.add_parser(
         "generate-c",
         help="Generate C artefacts.",
-        parents=[],
+        parents=[
+            parse_options_parser,
+            cache_options_parser,
+            output_options_parser,
+            archive_options_parser,
+        ],
         description=(
             "Generate command: input ASN.1 files are generated into C files."
         ),
@@ -118,7 +230,12 @@ def cli_args_parser() -> argparse.ArgumentParser:
     command_parser_generate_binary = command_subparsers.add_parser(
         "generate-binary",
         help="Generate C artefacts.",
-        parents=[],
+        parents=[
+            parse_options_parser,
+            cache_options_parser,
+            output_options_parser,
+            archive_options_parser,
+        ],
         description=(
             "Generate command: input ASN.1 files are generated into binary "
             "files."
@@ -149,10 +266,90 @@ def cli_args_parser() -> argparse.ArgumentParser:
         help="Endianness of the binary representation.",
     )
 
+    # Generate all command
+    command_parser_generate_all = command_subparsers.add_parser(
+        "generate-all",
+        help="Run the generation jobs of a manifest.",
+        parents=[
+            parse_options_parser,
+            cache_options_parser,
+            output_options_parser,
+        ],
+        description=(
+            "Generate command: input ASN.1 files are parsed and validated "
+            "once, then generated by every job of the manifest, the jobs "
+            "spread over --jobs processes."
+        ),
+    )
+    command_parser_generate_all.add_argument(
+        "manifest",
+        type=str,
+        help="JSON file listing the input paths and the generation jobs.",
+    )
+
+    # Validate command
+    command_parser_validate = command_subparsers.add_parser(
+        "validate",
+        help="Report every error of the ASN.1 files.",
+        parents=[parse_options_parser],
+        description=(
+            "Validate command: input ASN.1 files are parsed and validated, "
+            "and all the errors found are reported at once."
+        ),
+    )
+    command_parser_validate.add_argument(
+        "input_paths",
+        type=str,
+        nargs="+",
+        help="One or more folders with *.asn files",
+    )
+    command_parser_validate.add_argument(
+        "--json",
+        type=str,
+        help="File where the errors are written as JSON.",
+        default=None,
+    )
+
+    # Lint command
+    command_parser_lint = command_subparsers.add_parser(
+        "lint",
+        help="Check the ASN.1 files without generating anything.",
+        parents=[parse_options_parser, cache_options_parser],
+        description=(
+            "Lint command: input ASN.1 files are parsed and validated, and "
+            "the errors are printed one per line, or as JSON. The exit code "
+            "is 1 if an error is found."
+        ),
+    )
+    command_parser_lint.add_argument(
+        "input_paths",
+        type=str,
+        nargs="+",
+        help="One or more folders with *.asn files",
+    )
+    command_parser_lint.add_argument(
+        "--changed-files",
+        type=str,
+        nargs="*",
+        help=(
+            "Only report the errors of these files and of the files "
+            "importing their modules, directly or not. Files that are not "
+            "input files are ignored."
+        ),
+        default=None,
+    )
+    command_parser_lint.add_argument(
+        "--format",
+        choices=["text", "json"],
+        help="Format of the errors printed.",
+        default="text",
+    )
+
     return main_parser
 
 
 class GenerateCosmosCommandConfig:
+    # pylint: disable=too-many-instance-attributes
     def __init__(  # pylint: disable=too-many-arguments
         self,
         project_root_path: str,
@@ -161,6 +358,13 @@ class GenerateCosmosCommandConfig:
         asn1_messages: List[str],
         output_file_name: str,
         output_dir: str,
+        jobs: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_size: int = 256,
+        fast_parser: bool = False,
+        depfile_path: Optional[str] = None,
+        output_manifest_path: Optional[str] = None,
+        output_archive_path: Optional[str] = None,
     ) -> None:
         self.project_root_path = project_root_path
         self.input_paths = input_paths
@@ -168,50 +372,164 @@ class GenerateCosmosCommandConfig:
         self.asn1_messages = asn1_messages
         self.output_file_name = output_file_name
         self.output_dir = output_dir
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.fast_parser = fast_parser
+        self.depfile_path = depfile_path
+        self.output_manifest_path = output_manifest_path
+        self.output_archive_path = output_archive_path
 
 
 class GenerateCFSCommandConfig:
-    def __init__(
+    # pylint: disable=too-many-instance-attributes
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         project_root_path: str,
         input_paths: List[str],
         asn1_modules: List[str],
         output_dir: str,
+        jobs: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_size: int = 256,
+        fast_parser: bool = False,
+        depfile_path: Optional[str] = None,
+        output_manifest_path: Optional[str] = None,
+        output_archive_path: Optional[str] = None,
     ) -> None:
         self.project_root_path = project_root_path
         self.input_paths = input_paths
         self.asn1_modules = asn1_modules
         self.output_dir = output_dir
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.fast_parser = fast_parser
+        self.depfile_path = depfile_path
+        self.output_manifest_path = output_manifest_path
+        self.output_archive_path = output_archive_path
 
 
 class GenerateCCommandConfig:
-    def __init__(
+    # pylint: disable=too-many-instance-attributes
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         project_root_path: str,
         input_paths: List[str],
         asn1_modules: List[str],
         output_dir: str,
+        jobs: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_size: int = 256,
+        fast_parser: bool = False,
+        depfile_path: Optional[str] = None,
+        output_manifest_path: Optional[str] = None,
+        output_archive_path: Optional[str] = None,
     ) -> None:
         self.project_root_path = project_root_path
         self.input_paths = input_paths
         self.asn1_modules = asn1_modules
         self.output_dir = output_dir
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.fast_parser = fast_parser
+        self.depfile_path = depfile_path
+        self.output_manifest_path = output_manifest_path
+        self.output_archive_path = output_archive_path
 
 
 class GenerateBinaryCommandConfig:
-    def __init__(
+    # pylint: disable=too-many-instance-attributes
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         project_root_path: str,
         input_paths: List[str],
         asn1_modules: List[str],
         output_dir: str,
         endianness: str,
-    ) -> None:  # pylint: disable=too-many-arguments
+        jobs: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_size: int = 256,
+        fast_parser: bool = False,
+        depfile_path: Optional[str] = None,
+        output_manifest_path: Optional[str] = None,
+        output_archive_path: Optional[str] = None,
+    ) -> None:
         self.project_root_path = project_root_path
         self.input_paths = input_paths
         self.asn1_modules = asn1_modules
         self.output_dir = output_dir
         self.endianness = endianness
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.fast_parser = fast_parser
+        self.depfile_path = depfile_path
+        self.output_manifest_path = output_manifest_path
+        self.output_archive_path = output_archive_path
+
+
+class GenerateAllCommandConfig:
+    # pylint: disable=too-many-instance-attributes
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        project_root_path: str,
+        manifest_path: str,
+        jobs: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_size: int = 256,
+        fast_parser: bool = False,
+        depfile_path: Optional[str] = None,
+        output_manifest_path: Optional[str] = None,
+    ) -> None:
+        self.project_root_path = project_root_path
+        self.manifest_path = manifest_path
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.fast_parser = fast_parser
+        self.depfile_path = depfile_path
+        self.output_manifest_path = output_manifest_path
+
+
+class ValidateCommandConfig:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        project_root_path: str,
+        input_paths: List[str],
+        json_output_path: Optional[str] = None,
+        jobs: int = 1,
+        fast_parser: bool = False,
+    ) -> None:
+        self.project_root_path = project_root_path
+        self.input_paths = input_paths
+        self.json_output_path = json_output_path
+        self.jobs = jobs
+        self.fast_parser = fast_parser
+
+
+class LintCommandConfig:
+    # pylint: disable=too-many-instance-attributes
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        project_root_path: str,
+        input_paths: List[str],
+        changed_file_paths: Optional[List[str]] = None,
+        output_format: str = "text",
+        jobs: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_size: int = 256,
+        fast_parser: bool = False,
+    ) -> None:
+        self.project_root_path = project_root_path
+        self.input_paths = input_paths
+        self.changed_file_paths = changed_file_paths
+        self.output_format = output_format
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.fast_parser = fast_parser
 
 
 class ASN1ArgsParser:
@@ -231,6 +549,13 @@ class ASN1ArgsParser:
             self.args.asn1_messages,
             self.args.output_file_name,
             self.args.output_dir,
+            self.args.jobs,
+            self.args.cache_dir,
+            self.args.cache_size,
+            self.args.fast_parser,
+            self.args.depfile,
+            self.args.output_manifest,
+            self.args.output_archive,
         )
 
     def is_generate_cfs_command(self) -> bool:
@@ -244,6 +569,13 @@ class ASN1ArgsParser:
             self.args.input_paths,
             self.args.asn1_modules,
             self.args.output_dir,
+            self.args.jobs,
+            self.args.cache_dir,
+            self.args.cache_size,
+            self.args.fast_parser,
+            self.args.depfile,
+            self.args.output_manifest,
+            self.args.output_archive,
         )
 
     def is_generate_c_command(self) -> bool:
@@ -257,6 +589,13 @@ class ASN1ArgsParser:
             self.args.input_paths,
             self.args.asn1_modules,
             self.args.output_dir,
+            self.args.jobs,
+            self.args.cache_dir,
+            self.args.cache_size,
+            self.args.fast_parser,
+            self.args.depfile,
+            self.args.output_manifest,
+            self.args.output_archive,
         )
 
     def is_generate_binary_command(self) -> bool:
@@ -271,6 +610,59 @@ class ASN1ArgsParser:
             self.args.asn1_modules,
             self.args.output_dir,
             self.args.endianness,
+            self.args.jobs,
+            self.args.cache_dir,
+            self.args.cache_size,
+            self.args.fast_parser,
+            self.args.depfile,
+            self.args.output_manifest,
+            self.args.output_archive,
+        )
+
+    def is_generate_all_command(self) -> bool:
+        return bool(self.args.command == "generate-all")
+
+    def get_generate_all_config(
+        self, project_root_path: str
+    ) -> GenerateAllCommandConfig:
+        return GenerateAllCommandConfig(
+            project_root_path,
+            self.args.manifest,
+            self.args.jobs,
+            self.args.cache_dir,
+            self.args.cache_size,
+            self.args.fast_parser,
+            self.args.depfile,
+            self.args.output_manifest,
+        )
+
+    def is_validate_command(self) -> bool:
+        return bool(self.args.command == "validate")
+
+    def get_validate_config(
+        self, project_root_path: str
+    ) -> ValidateCommandConfig:
+        return ValidateCommandConfig(
+            project_root_path,
+            self.args.input_paths,
+            self.args.json,
+            self.args.jobs,
+            self.args.fast_parser,
+        )
+
+    def is_lint_command(self) -> bool:
+        return bool(self.args.command == "lint")
+
+    def get_lint_config(self, project_root_path: str) -> LintCommandConfig:
+        return LintCommandConfig(
+            project_root_path,
+            self.args.input_paths,
+            self.args.changed_files,
+            self.args.format,
+            self.args.jobs,
+            self.args.cache_dir,
+            self.args.cache_size,
+            self.args.fast_parser,
         )
 
 
@@ -0,0 +1,202 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Union
+
+from asn1_parser.cli.cli_arg_parser import (
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+    GenerateCFSCommandConfig,
+    GenerateCosmosCommandConfig,
+)
+from asn1_parser.output_sink import ArchiveSink
+
+GenerationJobConfig = Union[
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+    GenerateCFSCommandConfig,
+    GenerateCosmosCommandConfig,
+]
+
+
+class ManifestError(Exception):
+    pass
+
+
+class Manifest:
+    """
+    The generation jobs of the generate-all command, read from a JSON file:
+
+        {
+          "input_paths": ["asn1"],
+          "jobs": [
+            {"generator": "cfs", "asn1_modules": [...], "output_dir": ...},
+            {"generator": "c", "asn1_modules": [...], "output_dir": ...},
+            {"generator": "binary", "asn1_modules": [...],
+             "endianness": "little-endian", "output_dir": ...},
+            {"generator": "cosmos", "asn1_module": ..., "asn1_messages": [...],
+             "output_file_name": ..., "output_dir": ...}
+          ]
+        }
+
+    The options are the ones of the generate commands, output_dir defaulting
+    the same way; a job with an "output_archive" streams its files into that
+    archive instead. Relative paths are relative to the folder of the
+    manifest.
+    """
+
+    _GENERATORS = ("cfs", "c", "binary", "cosmos")
+    _ENDIANNESSES = ("little-endian", "big-endian")
+
+    def __init__(
+        self, input_paths: List[str], job_configs: List[GenerationJobConfig]
+    ) -> None:
+        self._input_paths = input_paths
+        self._job_configs = job_configs
+
+    def get_input_paths(self) -> List[str]:
+        return self._input_paths
+
+    def get_job_configs(self) -> List[GenerationJobConfig]:
+        return self._job_configs
+
+    @classmethod
+    def load(
+        cls, manifest_path: str, project_root_path: str, fast_parser: bool
+    ) -> "Manifest":
+        try:
+            with open(manifest_path, "r", encoding="utf8") as manifest_file:
+                content = json.load(manifest_file)
+        except (OSError, ValueError) as exception:
+            raise ManifestError(
+                f"cannot read the manifest {manifest_path}: {exception}"
+            ) from exception
+
+        base_dir = os.path.dirname(os.path.abspath(manifest_path))
+        if not isinstance(content, dict):
+            raise ManifestError(f"{manifest_path}: expected a JSON object")
+        input_paths = [
+            os.path.join(base_dir, input_path)
+            for input_path in cls._get_strings(
+                content, "input_paths", manifest_path
+            )
+        ]
+        jobs = content.get("jobs")
+        if not isinstance(jobs, list) or not jobs:
+            raise ManifestError(f"{manifest_path}: 'jobs' must be a list")
+
+        job_configs: List[GenerationJobConfig] = []
+        for index, job in enumerate(jobs):
+            location = f"{manifest_path}: jobs[{index}]"
+            if not isinstance(job, dict):
+                raise ManifestError(f"{location}: expected a JSON object")
+            job_configs.append(
+                cls._create_job_config(
+                    job,
+                    location,
+                    project_root_path,
+                    input_paths,
+                    base_dir,
+                    fast_parser,
+                )
+            )
+        return cls(input_paths, job_configs)
+
+    @classmethod
+    def _create_job_config(  # pylint: disable=too-many-arguments
+        cls,
+        job: Dict[str, Any],
+        location: str,
+        project_root_path: str,
+        input_paths: List[str],
+        base_dir: str,
+        fast_parser: bool,
+    ) -> GenerationJobConfig:
+        generator = job.get("generator")
+        if generator not in cls._GENERATORS:
+            raise ManifestError(
+                f"{location}: 'generator' must be one of "
+                f"{', '.join(cls._GENERATORS)}"
+            )
+        output_dir = os.path.join(
+            base_dir, job.get("output_dir", f"output/{generator}")
+        )
+        output_archive_path: Optional[str] = None
+        if "output_archive" in job:
+            output_archive = job["output_archive"]
+            if (
+                not isinstance(output_archive, str)
+                or ArchiveSink.get_extension(output_archive) is None
+            ):
+                raise ManifestError(
+                    f"{location}: 'output_archive' must end with one of "
+                    f"{', '.join(ArchiveSink.EXTENSIONS)}"
+                )
+            output_archive_path = os.path.join(base_dir, output_archive)
+
+        if generator == "cosmos":
+            return GenerateCosmosCommandConfig(
+                project_root_path,
+                input_paths,
+                cls._get_string(job, "asn1_module", location),
+                cls._get_strings(job, "asn1_messages", location),
+                cls._get_string(job, "output_file_name", location),
+                output_dir,
+                fast_parser=fast_parser,
+                output_archive_path=output_archive_path,
+            )
+        asn1_modules = cls._get_strings(job, "asn1_modules", location)
+        if generator == "binary":
+            endianness = cls._get_string(job, "endianness", location)
+            if endianness not in cls._ENDIANNESSES:
+                raise ManifestError(
+                    f"{location}: 'endianness' must be one of "
+                    f"{', '.join(cls._ENDIANNESSES)}"
+                )
+            return GenerateBinaryCommandConfig(
+                project_root_path,
+                input_paths,
+                asn1_modules,
+                output_dir,
+                endianness,
+                fast_parser=fast_parser,
+                output_archive_path=output_archive_path,
+            )
+        if generator == "c":
+            return GenerateCCommandConfig(
+                project_root_path,
+                input_paths,
+                asn1_modules,
+                output_dir,
+                fast_parser=fast_parser,
+                output_archive_path=output_archive_path,
+            )
+        return GenerateCFSCommandConfig(
+            project_root_path,
+            input_paths,
+            asn1_modules,
+            output_dir,
+            fast_parser=fast_parser,
+            output_archive_path=output_archive_path,
+        )
+
+    @staticmethod
+    def _get_string(content: Dict[str, Any], key: str, location: str) -> str:
+        value = content.get(key)
+        if not isinstance(value, str):
+            raise ManifestError(f"{location}: '{key}' must be a string")
+        return value
+
+    @staticmethod
+    def _get_strings(
+        content: Dict[str, Any], key: str, location: str
+    ) -> List[str]:
+        values = content.get(key)
+        if (
+            not isinstance(values, list)
+            or not values
+            or not all(isinstance(value, str) for value in values)
+        ):
+            raise ManifestError(
+                f"{location}: '{key}' must be a list of strings"
+            )
+        return values
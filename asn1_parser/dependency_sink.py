@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+from typing import List, Optional, Set
+
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.output_sink import OutputSink
+from asn1_parser.output_writer import OutputWriter
+
+
+class GeneratedOutput:
+    """
+    A file written by a generator, with the input files it depends on.
+    """
+
+    def __init__(self, path: str, sha256: str, input_paths: List[str]) -> None:
+        self._path = path
+        self._sha256 = sha256
+        self._input_paths = input_paths
+
+    def get_path(self) -> str:
+        return self._path
+
+    def get_sha256(self) -> str:
+        return self._sha256
+
+    def get_input_paths(self) -> List[str]:
+        return self._input_paths
+
+
+class DependencySink(OutputSink):
+    """
+    Records the files written into another sink, with the input files of
+    the module they are generated from and of the modules it imports,
+    directly or not, so that a build system can run the generator and the
+    builds using its files only when an input file changed. When the files
+    are written into an archive, the archive is the only output, depending
+    on the input files of all of them.
+    """
+
+    def __init__(
+        self,
+        sink: OutputSink,
+        output_dir: str,
+        archive_path: Optional[str] = None,
+    ) -> None:
+        self._sink = sink
+        self._output_dir = output_dir
+        self._archive_path = archive_path
+        self._input_paths: List[str] = []
+        self._outputs: List[GeneratedOutput] = []
+
+    def get_outputs(self) -> List[GeneratedOutput]:
+        """
+        Returns the files written, or the archive once it is closed.
+        """
+        if self._archive_path is None:
+            return self._outputs
+        digest = hashlib.sha256()
+        with open(self._archive_path, "rb") as archive_file:
+            for block in iter(lambda: archive_file.read(1 << 20), b""):
+                digest.update(block)
+        return [
+            GeneratedOutput(
+                self._archive_path,
+                digest.hexdigest(),
+                sorted(
+                    {
+                        input_path
+                        for output in self._outputs
+                        for input_path in output.get_input_paths()
+                    }
+                ),
+            )
+        ]
+
+    def begin_module(self, module: Asn1Module) -> None:
+        self._input_paths = self._get_input_paths(module)
+        self._sink.begin_module(module)
+
+    def write(self, relative_path: str, content: bytes) -> None:
+        self._outputs.append(
+            GeneratedOutput(
+                os.path.join(self._output_dir, relative_path),
+                hashlib.sha256(content).hexdigest(),
+                self._input_paths,
+            )
+        )
+        self._sink.write(relative_path, content)
+
+    def close(self) -> None:
+        self._sink.close()
+
+    def discard(self) -> None:
+        self._sink.discard()
+
+    def get_written(self) -> int:
+        return self._sink.get_written()
+
+    def get_unchanged(self) -> int:
+        return self._sink.get_unchanged()
+
+    @staticmethod
+    def _get_input_paths(module: Asn1Module) -> List[str]:
+        """
+        Returns the input files of the module and of the modules it imports,
+        directly or not, as found by the import graph of the bundle.
+        """
+        input_paths: Set[str] = set()
+        visited: Set[str] = set()
+        modules = [module]
+        while modules:
+            current = modules.pop()
+            if current.get_module_name() in visited:
+                continue
+            visited.add(current.get_module_name())
+            file_path: Optional[str] = current.get_file_path()
+            if file_path is not None:
+                input_paths.add(file_path)
+            modules.extend(current.get_imported_modules())
+        return sorted(input_paths)
+
+    @classmethod
+    def write_depfile(
+        cls, outputs: List[GeneratedOutput], depfile_path: str
+    ) -> None:
+        """
+        Writes a Make/Ninja dependency file with one rule per output file.
+        """
+        rules = [
+            cls._escape(output.get_path())
+            + ":"
+            + "".join(
+                " " + cls._escape(input_path)
+                for input_path in output.get_input_paths()
+            )
+            + "\n"
+            for output in sorted(outputs, key=GeneratedOutput.get_path)
+        ]
+        OutputWriter.write_text(depfile_path, "".join(rules))
+
+    @staticmethod
+    def write_manifest(
+        outputs: List[GeneratedOutput], manifest_path: str
+    ) -> None:
+        """
+        Writes the output files as JSON, with the SHA-256 of their content
+        and the input files they depend on.
+        """
+        manifest = {
+            "outputs": [
+                {
+                    "path": output.get_path(),
+                    "sha256": output.get_sha256(),
+                    "inputs": output.get_input_paths(),
+                }
+                for output in sorted(outputs, key=GeneratedOutput.get_path)
+            ]
+        }
+        OutputWriter.write_text(
+            manifest_path, json.dumps(manifest, indent=2) + "\n"
+        )
+
+    @staticmethod
+    def _escape(path: str) -> str:
+        # as read by Make; Ninja reads the same escapes
+        return path.replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
@@ -0,0 +1,302 @@
+import multiprocessing
+import os
+import time
+from typing import List, Optional, Tuple
+
+from asn1_parser.asn1.asn1_bundle import ASN1Bundle
+from asn1_parser.asn1.worker_error import WorkerError
+from asn1_parser.cli.cli_arg_parser import (
+    GenerateAllCommandConfig,
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+    GenerateCFSCommandConfig,
+    GenerateCosmosCommandConfig,
+)
+from asn1_parser.cli.manifest import GenerationJobConfig, Manifest
+from asn1_parser.dependency_sink import DependencySink, GeneratedOutput
+from asn1_parser.generators.binary.generator import BinaryGenerator
+from asn1_parser.generators.c.generator import CGenerator
+from asn1_parser.generators.cfs.generator import CFSGenerator
+from asn1_parser.generators.cosmos.generator import COSMOSGenerator
+from asn1_parser.log.logger import Logger
+from asn1_parser.output_sink import (
+    ArchiveSink,
+    BackgroundSink,
+    DirectorySink,
+    OutputSink,
+)
+
+# elapsed time, rendering time, writing time, files written, files
+# unchanged, files generated, error
+JobOutcome = Tuple[
+    float,
+    float,
+    float,
+    int,
+    int,
+    List[GeneratedOutput],
+    Optional[WorkerError],
+]
+
+
+class GenerationJobResult:  # pylint: disable=too-many-instance-attributes
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        job_config: GenerationJobConfig,
+        elapsed: float,
+        rendering: float,
+        writing: float,
+        written: int,
+        unchanged: int,
+        outputs: List[GeneratedOutput],
+        error: Optional[Exception],
+    ) -> None:
+        self._job_config = job_config
+        self._elapsed = elapsed
+        self._rendering = rendering
+        self._writing = writing
+        self._written = written
+        self._unchanged = unchanged
+        self._outputs = outputs
+        self._error = error
+
+    def __str__(self) -> str:
+        description = BatchGenerator.describe_job(self._job_config)
+        if self._error is not None:
+            return f"{description}: error: {self._error}"
+        times = (
+            f"{self._elapsed:.3f} s (rendering {self._rendering:.3f} s, "
+            f"writing {self._writing:.3f} s)"
+        )
+        if self._written or self._unchanged:
+            return (
+                f"{description}: {times}, {self._written} written, "
+                f"{self._unchanged} unchanged"
+            )
+        return f"{description}: {times}"
+
+    def get_job_config(self) -> GenerationJobConfig:
+        return self._job_config
+
+    def get_elapsed(self) -> float:
+        return self._elapsed
+
+    def get_rendering(self) -> float:
+        """
+        Returns the time spent rendering the files, in seconds.
+        """
+        return self._rendering
+
+    def get_writing(self) -> float:
+        """
+        Returns the time spent writing the files, in seconds, while the next
+        ones were rendered.
+        """
+        return self._writing
+
+    def get_written(self) -> int:
+        return self._written
+
+    def get_unchanged(self) -> int:
+        return self._unchanged
+
+    def get_outputs(self) -> List[GeneratedOutput]:
+        return self._outputs
+
+    def get_error(self) -> Optional[Exception]:
+        return self._error
+
+
+class BatchGenerator:
+    """
+    Runs the generation jobs of a manifest on one bundle. With config.jobs
+    > 1, the jobs are spread over that many worker processes, which get the
+    bundle when they start; a single job uses the processes to generate its
+    modules instead.
+    """
+
+    _logger = Logger(__name__)
+
+    @classmethod
+    def generate_all(
+        cls,
+        config: GenerateAllCommandConfig,
+        manifest: Manifest,
+        bundle: ASN1Bundle,
+    ) -> List[GenerationJobResult]:
+        """
+        Returns the result of each job, in the order of the manifest. A
+        failing job does not stop the others.
+        """
+        job_configs = manifest.get_job_configs()
+        for job_config in job_configs:
+            # the generators cache their fragments next to the parsed modules
+            job_config.cache_dir = config.cache_dir
+
+        processes = min(config.jobs, len(job_configs))
+        if processes <= 1:
+            for job_config in job_configs:
+                job_config.jobs = config.jobs
+            results = [
+                _BatchWorker.run(job_config, bundle)
+                for job_config in job_configs
+            ]
+        else:
+            cls._logger.debug(
+                f"running {len(job_configs)} jobs with {processes} processes"
+            )
+            with multiprocessing.Pool(
+                processes=processes,
+                initializer=_BatchWorker.set_up,
+                initargs=(job_configs, bundle),
+            ) as pool:
+                results = pool.map(
+                    _BatchWorker.run_job, range(len(job_configs))
+                )
+
+        return [
+            GenerationJobResult(
+                job_config,
+                elapsed,
+                rendering,
+                writing,
+                written,
+                unchanged,
+                outputs,
+                None if error is None else error.get_exception(),
+            )
+            for job_config, (
+                elapsed,
+                rendering,
+                writing,
+                written,
+                unchanged,
+                outputs,
+                error,
+            ) in zip(job_configs, results)
+        ]
+
+    @classmethod
+    def describe_job(cls, job_config: GenerationJobConfig) -> str:
+        description = cls._describe_generator(job_config)
+        if job_config.output_archive_path is not None:
+            return f"{description} -> {job_config.output_archive_path}"
+        if isinstance(job_config, GenerateCosmosCommandConfig):
+            return f"{description} -> " + os.path.join(
+                job_config.output_dir, job_config.output_file_name
+            )
+        return f"{description} -> {job_config.output_dir}"
+
+    @staticmethod
+    def _describe_generator(job_config: GenerationJobConfig) -> str:
+        if isinstance(job_config, GenerateCosmosCommandConfig):
+            return f"generate-cosmos {job_config.asn1_modules[0]}"
+        if isinstance(job_config, GenerateBinaryCommandConfig):
+            return f"generate-binary ({job_config.endianness})"
+        if isinstance(job_config, GenerateCCommandConfig):
+            return "generate-c"
+        return "generate-cfs"
+
+    @staticmethod
+    def create_output_sink(job_config: GenerationJobConfig) -> OutputSink:
+        """
+        Returns the sink writing the files of the job into its archive, if
+        any, or else into its output folder.
+        """
+        if job_config.output_archive_path is not None:
+            return ArchiveSink(job_config.output_archive_path)
+        return DirectorySink(job_config.output_dir)
+
+    @staticmethod
+    def run_job(
+        job_config: GenerationJobConfig,
+        bundle: ASN1Bundle,
+        sink: Optional[OutputSink] = None,
+    ) -> None:
+        """
+        Runs the generator of the job, which writes into its output folder
+        unless a sink is given.
+        """
+        if isinstance(job_config, GenerateCosmosCommandConfig):
+            COSMOSGenerator(job_config, bundle).generate(sink)
+        elif isinstance(job_config, GenerateBinaryCommandConfig):
+            BinaryGenerator(job_config, bundle).generate(sink)
+        elif isinstance(job_config, GenerateCCommandConfig):
+            CGenerator(job_config, bundle).generate(sink)
+        elif isinstance(job_config, GenerateCFSCommandConfig):
+            CFSGenerator(job_config, bundle).generate(sink)
+        else:
+            raise NotImplementedError
+
+
+class _BatchWorker:
+    """
+    State of a worker process running jobs, set once when it starts: with
+    the fork start method the bundle is shared copy-on-write, otherwise it
+    is sent once per worker rather than once per job.
+    """
+
+    job_configs: List[GenerationJobConfig] = []
+    bundle: Optional[ASN1Bundle] = None
+
+    @classmethod
+    def set_up(
+        cls, job_configs: List[GenerationJobConfig], bundle: ASN1Bundle
+    ) -> None:
+        cls.job_configs = job_configs
+        cls.bundle = bundle
+
+    @classmethod
+    def run_job(cls, job_index: int) -> JobOutcome:
+        assert cls.bundle is not None
+        return cls.run(cls.job_configs[job_index], cls.bundle)
+
+    @staticmethod
+    def run(job_config: GenerationJobConfig, bundle: ASN1Bundle) -> JobOutcome:
+        # Errors are returned rather than raised so that the other jobs run
+        # and every failure is reported.
+        start = time.perf_counter()
+        error: Optional[WorkerError] = None
+        # the generated files are recorded for the dependency file and the
+        # output manifest of the run
+        outputs: List[GeneratedOutput] = []
+        # the files are written by a background thread
+        background_sink: Optional[BackgroundSink] = None
+        try:
+            background_sink = BackgroundSink(
+                BatchGenerator.create_output_sink(job_config)
+            )
+            sink = DependencySink(
+                background_sink,
+                job_config.output_dir,
+                job_config.output_archive_path,
+            )
+            try:
+                BatchGenerator.run_job(job_config, bundle, sink)
+            except BaseException:
+                sink.discard()
+                raise
+            sink.close()
+            outputs = sink.get_outputs()
+        except Exception as exception:  # pylint: disable=broad-except
+            error = WorkerError(exception)
+        elapsed = time.perf_counter() - start
+        rendering = elapsed
+        writing = 0.0
+        # files may also be written into the folder of a failed job
+        written = 0
+        unchanged = 0
+        if background_sink is not None:
+            rendering -= background_sink.get_wait_time()
+            writing = background_sink.get_write_time()
+            written = background_sink.get_written()
+            unchanged = background_sink.get_unchanged()
+        return (
+            elapsed,
+            rendering,
+            writing,
+            written,
+            unchanged,
+            outputs,
+            error,
+        )
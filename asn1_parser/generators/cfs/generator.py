@@ -1,9 +1,5 @@
-import os
-import pathlib
 from typing import List, Optional, Union
 
-import cgen
-from asn1_parser.asn1.asn1_bundle import ASN1Bundle
 from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
 from asn1_parser.asn1.grammar_elements.choice import Choice
 from asn1_parser.asn1.grammar_elements.enumerated import Enumerated
@@ -13,15 +9,12 @@ from asn1_parser.asn1.grammar_elements.sequence import Sequence
 from asn1_parser.asn1.grammar_elements.simple_definition import SimpleDefinition
 from asn1_parser.asn1.grammar_elements.with_components import WithComponents
 from asn1_parser.c_data import CData
+from asn1_parser.c_emitter import CEmitter
 from asn1_parser.c_printer import CPrinter, HeaderType
-from asn1_parser.cli.cli_arg_parser import GenerateCFSCommandConfig
-from asn1_parser.generators.cfs.module_sorter import ModuleSorter
 from asn1_parser.generators.generator import Generator
+from asn1_parser.output_sink import DirectorySink, OutputSink
 from asn1_parser.log.logger import Logger
 
-# Monkey patching cgen. TODO: reimplement cgen in house or submit PR upstream.
-cgen.Struct.struct_attributes = lambda self: "__attribute__((packed))"
-
 ASN1_KEY_CCSDS_PRIMARY = "primary"
 ASN1_KEY_CCSDS_VERSION = "packet-version-number"
 ASN1_KEY_CCSDS_IDENT = "packet-identification"
@@ -46,125 +39,113 @@ class CFSGenerator(Generator):
             + "_msgids"
         )
 
-    @classmethod
-    def generate_cfs(
-        cls, config: GenerateCFSCommandConfig, bundle: ASN1Bundle
-    ) -> None:
-        output_folder = config.output_dir
-        if not os.path.isdir(output_folder):
-            pathlib.Path(output_folder).mkdir(parents=True, exist_ok=True)
+    # override
+    def generate(self, sink: Optional[OutputSink] = None) -> None:
+        if sink is None:
+            sink = DirectorySink(self._config.output_dir)
 
-        module_list_ordered: List[Asn1Module] = bundle.get_modules_ordered()
+        for module, module_cdata in self._convert_modules_to_c():
+            sink.begin_module(module)
+            c_printer: CPrinter = CPrinter()
 
-        for module in module_list_ordered:
-            module_cdata = CData.create_empty()
+            # generate one xx_msg.h file per module
+            filename_msg = self.get_msg_filename(module)
+            c_printer.print_to_sink(
+                cdata=module_cdata,
+                filename=filename_msg,
+                sink=sink,
+                header_type=HeaderType.MSG,
+            )
 
-            # Include
+            # generate xx_msgids.h if needed
+            filename_msgids = self.get_msgids_filename(module)
+            c_printer.print_to_sink(
+                cdata=module_cdata,
+                filename=filename_msgids,
+                sink=sink,
+                header_type=HeaderType.MSGIDS,
+            )
 
-            comment = module.get_comment_import()
-            if comment is not None:
-                module_cdata.add_include(
-                    str(cgen.LineComment(comment.get_comment()))
-                )
+    def _convert_module_to_c(self, module: Asn1Module) -> CData:
+        module_cdata = CData.create_empty()
 
-            simple_definition_list_imported: List[SimpleDefinition] = []
-            for imported_module in module.get_imported_modules():
-                simple_definition_list_imported.extend(
-                    [
-                        d
-                        for d in imported_module.get_definitions()
-                        if isinstance(d, SimpleDefinition)
-                    ]
-                )
+        # Include
 
-            for module_imported_item in module.get_import_items():
-                module_cdata.add_include(
-                    str(
-                        cgen.Include(
-                            cls.get_msg_filename(module_imported_item) + ".h",
-                            system=False,
-                        )
-                    )
-                )
+        comment = module.get_comment_import()
+        if comment is not None:
+            module_cdata.add_include(
+                CEmitter.line_comment(comment.get_comment())
+            )
 
-            # Definitions
+        simple_definition_list_imported: List[SimpleDefinition] = []
+        for imported_module in module.get_imported_modules():
+            simple_definition_list_imported.extend(
+                [
+                    d
+                    for d in imported_module.get_definitions()
+                    if isinstance(d, SimpleDefinition)
+                ]
+            )
 
-            simple_definition_list: List[SimpleDefinition] = [
-                d
-                for d in module.get_definitions()
-                if isinstance(d, SimpleDefinition)
-            ]
-            simple_definition_list.extend(simple_definition_list_imported)
+        for module_imported_item in module.get_import_items():
+            module_cdata.add_include(
+                CEmitter.include(
+                    self.get_msg_filename(module_imported_item) + ".h",
+                    system=False,
+                )
+            )
 
-            used_simple_defs = bundle.get_simple_def_uses()
-            for definition in ModuleSorter.get_definitions_sorted_by_dependency(
-                module
-            ):
-                if isinstance(definition, SimpleDefinition):
-                    # is used directly where needed
-                    def_type_name = definition.get_type_name()
-                    if def_type_name in used_simple_defs:
-                        sizes_of_builtins: List[int] = [8, 16, 32, 64]
-                        bitfield_or_builtin: str = (
-                            "builtin"
-                            if definition.get_size_bits() in sizes_of_builtins
-                            else "bitfield"
-                        )
-                        formatted_list_of_modules: str = ", ".join(
-                            f"'{module}'"
-                            for module in (
-                                sorted((used_simple_defs[def_type_name]))
-                            )
-                        )
-                        module_cdata.add_include(
-                            f"// NOTE: The simple type '{def_type_name}' has "
-                            f"been generated to a C {bitfield_or_builtin} type "
-                            f"and is used directly in "
-                            f"{formatted_list_of_modules}"
+        # Definitions
+
+        simple_definition_list: List[SimpleDefinition] = [
+            d
+            for d in module.get_definitions()
+            if isinstance(d, SimpleDefinition)
+        ]
+        simple_definition_list.extend(simple_definition_list_imported)
+
+        used_simple_defs = self._bundle.get_simple_def_uses()
+        for definition in self._bundle.get_definitions_ordered(module):
+            if isinstance(definition, SimpleDefinition):
+                # is used directly where needed
+                def_type_name = definition.get_type_name()
+                if def_type_name in used_simple_defs:
+                    sizes_of_builtins: List[int] = [8, 16, 32, 64]
+                    bitfield_or_builtin: str = (
+                        "builtin"
+                        if definition.get_size_bits() in sizes_of_builtins
+                        else "bitfield"
+                    )
+                    formatted_list_of_modules: str = ", ".join(
+                        f"'{module}'"
+                        for module in (
+                            sorted((used_simple_defs[def_type_name]))
                         )
-                elif isinstance(definition, Sequence):
-                    sequence_cdata = CFSGenerator._convert_sequence_to_c(
-                        simple_definition_list, definition, module
                     )
-                    module_cdata.extend_with_cdata(sequence_cdata)
-                elif isinstance(definition, Enumerated):
-                    enum_cdata = CFSGenerator._convert_enumerated_to_c(
-                        definition
+                    module_cdata.add_include(
+                        f"// NOTE: The simple type '{def_type_name}' has "
+                        f"been generated to a C {bitfield_or_builtin} type "
+                        f"and is used directly in "
+                        f"{formatted_list_of_modules}"
                     )
-                    module_cdata.extend_with_cdata(enum_cdata)
-                elif isinstance(definition, Choice):
-                    choice_cdata = CFSGenerator._convert_choice_to_c(definition)
-                    module_cdata.extend_with_cdata(choice_cdata)
-                else:
-                    raise NotImplementedError(
-                        f"cFS code generation for '{definition}' not yet "
-                        + "implemented."
+            elif isinstance(definition, (Sequence, Enumerated, Choice)):
+                module_cdata.extend_with_cdata(
+                    self._convert_definition_to_c(
+                        definition, simple_definition_list, module
                     )
+                )
+            else:
+                raise NotImplementedError(
+                    f"cFS code generation for '{definition}' not yet "
+                    + "implemented."
+                )
 
-            c_printer: CPrinter = CPrinter()
-
-            comment = module.get_comment()
-            file_documentation = comment and comment.get_comment()
-            if file_documentation:
-                module_cdata.set_header_comment(file_documentation)
-
-            # generate one xx_msg.h file per module
-            filename_msg = cls.get_msg_filename(module)
-            c_printer.print_to_file(
-                cdata=module_cdata,
-                filename=filename_msg,
-                output_folder=output_folder,
-                header_type=HeaderType.MSG,
-            )
+        comment = module.get_comment()
+        file_documentation = comment and comment.get_comment()
+        if file_documentation:
+            module_cdata.set_header_comment(file_documentation)
 
-            # generate xx_msgids.h if needed
-            filename_msgids = cls.get_msgids_filename(module)
-            c_printer.print_to_file(
-                cdata=module_cdata,
-                filename=filename_msgids,
-                output_folder=output_folder,
-                header_type=HeaderType.MSGIDS,
-            )
+        return module_cdata
 
     @classmethod
     def _ccsds_primary_header_to_msg_id(cls, components: WithComponents) -> int:
@@ -229,7 +210,7 @@ class CFSGenerator(Generator):
                     symbol = seq_name.upper() + "_MID"
                     value = cls._ccsds_primary_header_to_msg_id(value)
                     define_list.append(
-                        str(cgen.Define(symbol, f"(0x{value:04X})"))
+                        CEmitter.define(symbol, f"(0x{value:04X})")
                     )
                 else:
                     define_list.extend(
@@ -241,26 +222,23 @@ class CFSGenerator(Generator):
                 if isinstance(value, bool):
                     value = "true" if value else "false"
                 define_list.append(
-                    str(
-                        cgen.Define(
-                            (
-                                seq_name
-                                + "_"
-                                + CPrinter.asn1_to_c_style_naming(
-                                    component.get_key()
-                                )
-                            ).upper(),
-                            "(" + str(value) + ")",
-                        )
+                    CEmitter.define(
+                        (
+                            seq_name
+                            + "_"
+                            + CPrinter.asn1_to_c_style_naming(
+                                component.get_key()
+                            )
+                        ).upper(),
+                        "(" + str(value) + ")",
                     )
                     + "\n"
                 )
         return define_list
 
     # override
-    @classmethod
     def _with_components_handling(
-        cls,
+        self,
         definition_type_name_c: str,
         seq_item: KeyTypePair,
         module: Optional[Asn1Module],
@@ -268,7 +246,7 @@ class CFSGenerator(Generator):
         cdata: CData = CData.create_empty()
 
         cdata.extend_with_define_list(
-            cls._process_with_components(
+            self._process_with_components(
                 definition_type_name_c,
                 seq_item.get_with_components(),
             )
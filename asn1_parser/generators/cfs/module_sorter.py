@@ -1,112 +1,194 @@
-from typing import List, Dict
+from collections import deque
+from typing import Deque, Dict, List, Set, TypeVar
 
-from asn1_parser.asn1.grammar_elements.array import Array
 from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
-from asn1_parser.asn1.grammar_elements.asn1_string import Asn1String
 from asn1_parser.asn1.grammar_elements.choice import Choice
 from asn1_parser.asn1.grammar_elements.definitions import Definitions
 from asn1_parser.asn1.grammar_elements.enumerated import Enumerated
 from asn1_parser.asn1.grammar_elements.sequence import Sequence
 from asn1_parser.asn1.grammar_elements.simple_definition import SimpleDefinition
+from asn1_parser.asn1.validation.errors import ASN1ConsistencyError
 from asn1_parser.utils.array import flatten
 
+_T = TypeVar("_T")
+
 
 class ModuleSorter:
     @staticmethod
     def get_definitions_sorted_by_dependency(
         asn1_module: Asn1Module,
     ) -> List[Definitions]:
-        defined_list: List[str] = Asn1Module.PREDEFINED_LIST.copy()
-
-        defined_imports = []
-        for item_list in asn1_module.get_import_items():
-            defined_imports.append(item_list.get_definitions())
-
-        defined_imports_names: List[List[str]] = []
-        for definition_str in defined_imports:
-            defined_imports_names.append(definition_str)
-
-        defined_imports_names_flatten: List[str] = flatten(
-            defined_imports_names
+        """
+        Orders the definitions of the module so that each one comes after
+        the definitions of the module its fields use, in O(definitions +
+        fields). The order is the one of passes over the definitions in
+        module order, each pass taking the definitions whose field types are
+        all defined by then.
+
+        Raises ASN1ConsistencyError on recursive definitions and on field
+        types that are neither defined nor imported.
+        """
+        definitions = asn1_module.get_definitions()
+        dependencies = ModuleSorter._get_definition_dependencies(asn1_module)
+
+        dependents: List[List[int]] = [[] for _ in definitions]
+        unsorted_count: Dict[int, int] = {}
+        for index, definition_dependencies in enumerate(dependencies):
+            unsorted_count[index] = len(definition_dependencies)
+            for dependency in definition_dependencies:
+                dependents[dependency].append(index)
+
+        # the pass taking each definition
+        passes: List[int] = [0] * len(definitions)
+        ready: Deque[int] = deque(
+            index for index, count in unsorted_count.items() if count == 0
         )
+        while ready:
+            index = ready.popleft()
+            for dependent in dependents[index]:
+                # a definition is taken in the pass of the definitions it
+                # uses when they come before it, in the next pass otherwise
+                passes[dependent] = max(
+                    passes[dependent], passes[index] + int(index > dependent)
+                )
+                unsorted_count[dependent] -= 1
+                if unsorted_count[dependent] == 0:
+                    ready.append(dependent)
+
+        if any(unsorted_count.values()):
+            cycle = ModuleSorter._find_cycle(
+                dict(enumerate(dependencies)), unsorted_count
+            )
+            raise ASN1ConsistencyError(
+                f"Recursive definitions in '{asn1_module.get_module_name()}': "
+                + " -> ".join(
+                    definitions[index].get_type_name() for index in cycle
+                ),
+                module_name=asn1_module.get_module_name(),
+                definition_name=definitions[cycle[0]].get_type_name(),
+            )
+
+        definitions_by_pass: List[List[Definitions]] = [[] for _ in definitions]
+        for index, definition in enumerate(definitions):
+            definitions_by_pass[passes[index]].append(definition)
+        return flatten(definitions_by_pass)
 
-        defined_list.extend(defined_imports_names_flatten)
-
-        defined_list = list(set(defined_list))
-
-        already_defined: List[Definitions] = []
-
-        not_yet_defined: List[
-            Definitions
-        ] = asn1_module.get_definitions().copy()
-        while len(not_yet_defined) > 0:
-            # copy(): do not modify something we iterate on
-            for definition in not_yet_defined.copy():
-                if isinstance(definition, (Sequence, Choice)):
-                    is_all_defined = True
-                    for seq_item in definition.get_children():
-                        type_name = seq_item.get_asn_type().get_type_name()
-                        if isinstance(type_name, Array):
-                            type_name = type_name.get_asn_type().get_type_name()
-                        if isinstance(type_name, Asn1String):
-                            type_name = type_name.get_type_name()
-                        if type_name not in defined_list:
-                            is_all_defined = False
-                            break
-                    if is_all_defined:
-                        already_defined.append(definition)
-                        defined_list.append(definition.get_type_name())
-                        not_yet_defined.remove(definition)
-                elif isinstance(definition, Enumerated):
-                    # Enumerated did not use other types, put it directly to
-                    # defined list.
-                    already_defined.append(definition)
-                    defined_list.append(definition.get_type_name())
-                    not_yet_defined.remove(definition)
-                elif isinstance(definition, SimpleDefinition):
-                    # Simple definitions did not use other types, put it
-                    # directly to defined list,
-                    already_defined.append(definition)
-                    defined_list.append(definition.get_type_name())
-                    not_yet_defined.remove(definition)
-                else:
-                    raise NotImplementedError(
-                        f"{definition} (of type {type(definition)})"
-                    )
-
-        return already_defined
+    @staticmethod
+    def _get_definition_dependencies(
+        asn1_module: Asn1Module,
+    ) -> List[List[int]]:
+        """
+        Returns, for each definition of the module, the indexes of the
+        definitions of the module its fields use, arrays included.
+        """
+        defined_names: Set[str] = set(Asn1Module.PREDEFINED_LIST)
+        for import_item in asn1_module.get_import_items():
+            defined_names.update(import_item.get_definitions())
+
+        definitions = asn1_module.get_definitions()
+        indexes: Dict[str, int] = {}
+        for index, definition in enumerate(definitions):
+            indexes.setdefault(definition.get_type_name(), index)
+
+        dependencies: List[List[int]] = []
+        for definition in definitions:
+            definition_dependencies: Dict[int, None] = {}
+            if isinstance(definition, (Sequence, Choice)):
+                for seq_item in definition.get_children():
+                    # the element type for arrays
+                    type_name = seq_item.get_asn_type().get_type_name()
+                    if type_name in defined_names:
+                        continue
+                    if type_name not in indexes:
+                        raise ASN1ConsistencyError(
+                            f"Type '{type_name}' used in "
+                            f"'{asn1_module.get_module_name()}' is not "
+                            "defined",
+                            module_name=asn1_module.get_module_name(),
+                            definition_name=definition.get_type_name(),
+                        )
+                    definition_dependencies[indexes[type_name]] = None
+            elif not isinstance(definition, (Enumerated, SimpleDefinition)):
+                raise NotImplementedError(
+                    f"{definition} (of type {type(definition)})"
+                )
+            dependencies.append(list(definition_dependencies))
+        return dependencies
 
     @staticmethod
     def create_ordered_import_list(
         real_module_list: List[Asn1Module],
     ) -> List[Asn1Module]:
-        module_list: List[Asn1Module] = real_module_list.copy()
+        """
+        Orders the modules so that each module comes before the modules it
+        imports, in O(modules + imports). Modules that are free to go next
+        keep the order of the list. Raises ASN1ConsistencyError on an import
+        cycle.
+        """
+        modules_by_name: Dict[str, Asn1Module] = {}
+        for module in real_module_list:
+            modules_by_name.setdefault(module.get_module_name(), module)
+
+        imported_names: Dict[str, List[str]] = {}
+        importer_names: Dict[str, List[str]] = {
+            name: [] for name in modules_by_name
+        }
+        for module_name, module in modules_by_name.items():
+            imported_names[module_name] = [
+                name
+                for name in dict.fromkeys(
+                    item.get_module_name() for item in module.get_import_items()
+                )
+                if name in modules_by_name
+            ]
+            for name in imported_names[module_name]:
+                importer_names[name].append(module_name)
+
+        importers_count: Dict[str, int] = {
+            name: len(names) for name, names in importer_names.items()
+        }
         module_order: List[Asn1Module] = []
-        module_names: List[str] = [
-            item.get_module_name() for item in module_list
-        ]
-        import_names: List[str] = ModuleSorter._get_import_names(module_list)
-        while len(module_list):
-            for module_index, module_name in enumerate(module_names):
-                if module_name not in import_names:
-                    module_to_reorder = module_list[module_index]
-                    module_order.append(module_to_reorder)
-                    module_list.remove(module_to_reorder)
-                    module_names.remove(module_to_reorder.get_module_name())
-
-                    # Regenerate import_list, to omit
-                    # the file that we just reordered
-                    import_names = ModuleSorter._get_import_names(module_list)
+        ready: Deque[str] = deque(
+            name for name, count in importers_count.items() if count == 0
+        )
+        while ready:
+            module_name = ready.popleft()
+            module_order.append(modules_by_name[module_name])
+            for name in imported_names[module_name]:
+                importers_count[name] -= 1
+                if importers_count[name] == 0:
+                    ready.append(name)
+
+        if len(module_order) < len(modules_by_name):
+            # reversed: each module imports the next one
+            cycle = list(
+                reversed(
+                    ModuleSorter._find_cycle(importer_names, importers_count)
+                )
+            )
+            raise ASN1ConsistencyError(
+                f"Modules import each other: {' -> '.join(cycle)}",
+                module_name=cycle[0],
+            )
         return module_order
 
     @staticmethod
-    def _get_import_names(module_list: List[Asn1Module]) -> List[str]:
-        import_list: Dict[Asn1Module, List[str]] = {}
-
-        for module in module_list:
-            import_list[module] = [
-                imports_module.get_module_name()
-                for imports_module in module.get_import_items()
-            ]
-
-        return flatten(list(import_list.values()))
+    def _find_cycle(
+        edges: Dict[_T, List[_T]], unsorted_count: Dict[_T, int]
+    ) -> List[_T]:
+        # Each node left unsorted still has an edge to an unsorted node, so
+        # following these edges runs into a cycle.
+        first_node = next(
+            node for node, count in unsorted_count.items() if count > 0
+        )
+        path: List[_T] = [first_node]
+        positions: Dict[_T, int] = {first_node: 0}
+        while True:
+            next_node = next(
+                node for node in edges[path[-1]] if unsorted_count[node] > 0
+            )
+            if next_node in positions:
+                start = positions[next_node]
+                return path[start:] + [next_node]
+            positions[next_node] = len(path)
+            path.append(next_node)
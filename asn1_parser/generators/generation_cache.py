@@ -0,0 +1,358 @@
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+import tempfile
+from enum import Enum
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.grammar_elements.asn1_type import Asn1Type
+from asn1_parser.asn1.grammar_elements.definitions import Definitions
+from asn1_parser.asn1.symbol_table import SymbolTable
+from asn1_parser.c_data import CData
+from asn1_parser.cli.cli_arg_parser import (
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+    GenerateCFSCommandConfig,
+)
+from asn1_parser.log.logger import Logger
+
+# digest of the AST of a definition, names of the types it uses
+Description = Tuple[str, List[str]]
+# hits, misses, and the fragments and descriptions of the definitions of each
+# module text computed since the last call to take_updates
+CacheUpdates = Tuple[
+    int, int, Dict[str, CData], Dict[str, Dict[str, Description]]
+]
+
+
+class GenerationCache:  # pylint: disable=too-many-instance-attributes
+    """
+    C data rendered for each definition, kept in a file between runs.
+
+    A fragment is stored by the fingerprint of its definition, which covers
+    the definition as processed in the bundle, the fingerprints of the
+    definitions it uses, the sources of the generator and its options: after
+    an edit, only the edited definitions and the ones using them, directly
+    or not, are rendered again.
+
+    The description of the definitions of a module is kept by the digest of
+    the module text, so that only the definitions of the modules whose text
+    changed are read again.
+    """
+
+    _logger = Logger(__name__)
+
+    DIR_NAME = "generation"
+    _MAX_FRAGMENTS = 100000
+    _MAX_MODULE_TEXTS = 10000
+    # the sources all generated fragments depend on, besides the generator's
+    _SOURCE_MODULES = (
+        "asn1_parser.asn1.layout_engine",
+        "asn1_parser.c_data",
+        "asn1_parser.c_emitter",
+        "asn1_parser.c_printer",
+        "asn1_parser.generators.generation_cache",
+        "asn1_parser.generators.generator",
+        "asn1_parser.utils.size",
+        "asn1_parser.utils.string",
+    )
+    # attributes that do not change what is generated
+    _IGNORED_ATTRIBUTES = ("_parent", "_size_bits")
+    # names of the slots of each class, with the ones of its bases
+    _slot_names: Dict[type, List[str]] = {}
+
+    def __init__(
+        self, cache_path: str, generator_module: str, options: str
+    ) -> None:
+        self._cache_path = cache_path
+        self._hits = 0
+        self._misses = 0
+        # fingerprint -> fragment, least recently used first
+        self._fragments: Dict[str, CData] = {}
+        self._new_fragments: Dict[str, CData] = {}
+        # module text digest -> type name -> description
+        self._descriptions: Dict[str, Dict[str, Description]] = {}
+        self._new_descriptions: Dict[str, Dict[str, Description]] = {}
+        self._used_text_digests: Set[str] = set()
+        # (module name, type name) -> fingerprint, None while computed
+        self._fingerprints: Dict[Tuple[str, str], Optional[str]] = {}
+        self._code_fingerprint = self._get_code_fingerprint(
+            generator_module, options
+        )
+        self._load()
+
+    @classmethod
+    def create_from_config(
+        cls,
+        config: Union[
+            GenerateBinaryCommandConfig,
+            GenerateCCommandConfig,
+            GenerateCFSCommandConfig,
+        ],
+        generator_module: str,
+        generator_name: str,
+        options: str = "",
+    ) -> Optional["GenerationCache"]:
+        """
+        Returns the cache of the generator in the cache folder selected on
+        the command line, or None if the cache is disabled. Each set of
+        options has its own file.
+        """
+        if config.cache_dir is None:
+            return None
+        file_name = generator_name + (f"-{options}" if options else "")
+        return cls(
+            os.path.join(config.cache_dir, cls.DIR_NAME, file_name + ".pickle"),
+            generator_module,
+            options,
+        )
+
+    def get_hits(self) -> int:
+        return self._hits
+
+    def get_misses(self) -> int:
+        return self._misses
+
+    def get_summary(self) -> str:
+        return f"generation cache: {self._hits} hit(s), {self._misses} miss(es)"
+
+    def get_fingerprint(
+        self,
+        definition: Definitions,
+        module: Asn1Module,
+        symbol_table: SymbolTable,
+    ) -> Optional[str]:
+        """
+        Returns the fingerprint of the definition of the module, or None if
+        it uses itself, directly or not: it is then always rendered.
+        """
+        key = (module.get_module_name(), definition.get_type_name())
+        if key in self._fingerprints:
+            return self._fingerprints[key]
+        # None until computed: a definition using itself leads back here
+        self._fingerprints[key] = None
+
+        description_digest, used_type_names = self._get_description(
+            definition, module
+        )
+
+        digest = hashlib.sha256()
+        digest.update(self._code_fingerprint.encode("utf-8"))
+        digest.update(key[0].encode("utf-8"))
+        digest.update(description_digest.encode("utf-8"))
+        for type_name in used_type_names:
+            used_definition = symbol_table.get_definition(type_name)
+            used_module = symbol_table.get_defining_module(type_name)
+            if used_definition is None or used_module is None:
+                # a built-in type, described by its name
+                continue
+            used_fingerprint = self.get_fingerprint(
+                used_definition, used_module, symbol_table
+            )
+            if used_fingerprint is None:
+                return None
+            digest.update(f"{type_name}:{used_fingerprint}".encode("utf-8"))
+        self._fingerprints[key] = digest.hexdigest()
+        return self._fingerprints[key]
+
+    def _get_description(
+        self, definition: Definitions, module: Asn1Module
+    ) -> Description:
+        """
+        Returns the description of the definition, read from its AST unless
+        the text of the module did not change.
+        """
+        type_name = definition.get_type_name()
+        text_digest = module.get_text_digest()
+        if text_digest is not None:
+            self._used_text_digests.add(text_digest)
+            description = self._descriptions.get(text_digest, {}).get(type_name)
+            if description is not None:
+                return description
+
+        tokens: List[str] = []
+        used_type_names: Set[str] = set()
+        self._describe(definition, definition, tokens, used_type_names)
+        description = (
+            hashlib.sha256("\0".join(tokens).encode("utf-8")).hexdigest(),
+            sorted(used_type_names),
+        )
+        if text_digest is not None:
+            for descriptions in (self._descriptions, self._new_descriptions):
+                descriptions.setdefault(text_digest, {})[
+                    type_name
+                ] = description
+        return description
+
+    @classmethod
+    def _describe(
+        cls,
+        value: Any,
+        definition: Definitions,
+        tokens: List[str],
+        used_type_names: Set[str],
+    ) -> None:
+        """
+        Appends the tokens describing the value, and collects the names of
+        the types it uses. The definitions it refers to are described by
+        their name: they are covered by their own fingerprint.
+        """
+        if isinstance(value, (str, int, float, Enum)) or value is None:
+            tokens.append(repr(value))
+        elif isinstance(value, (list, tuple)):
+            tokens.append(f"[{len(value)}")
+            for item in value:
+                cls._describe(item, definition, tokens, used_type_names)
+        elif isinstance(value, Definitions) and value is not definition:
+            tokens.append(f"<{value.get_type_name()}")
+        else:
+            if isinstance(value, Asn1Type):
+                used_type_names.add(value.get_type_name())
+            tokens.append(type(value).__name__)
+            for name in cls._get_attribute_names(value):
+                tokens.append(name)
+                cls._describe(
+                    getattr(value, name), definition, tokens, used_type_names
+                )
+
+    @classmethod
+    def _get_attribute_names(cls, value: Any) -> List[str]:
+        # the grammar elements use either __slots__ or __dict__
+        value_type = type(value)
+        slot_names = cls._slot_names.get(value_type)
+        if slot_names is None:
+            slot_names = [
+                name
+                for base in value_type.__mro__
+                for name in getattr(base, "__slots__", ())
+                if name not in cls._IGNORED_ATTRIBUTES
+            ]
+            cls._slot_names[value_type] = slot_names
+        if not hasattr(value, "__dict__"):
+            return slot_names
+        return slot_names + [
+            name
+            for name in sorted(vars(value))
+            if name not in cls._IGNORED_ATTRIBUTES
+            and not name.startswith("_tx_")
+        ]
+
+    def get_fragment(self, fingerprint: Optional[str]) -> Optional[CData]:
+        """
+        Returns the fragment rendered for this fingerprint, or None if the
+        definition must be rendered.
+        """
+        if fingerprint is None or fingerprint not in self._fragments:
+            self._misses += 1
+            return None
+        self._hits += 1
+        # most recently used last, for the pruning
+        fragment = self._fragments.pop(fingerprint)
+        self._fragments[fingerprint] = fragment
+        return fragment
+
+    def set_fragment(self, fingerprint: Optional[str], fragment: CData) -> None:
+        if fingerprint is not None:
+            self._fragments.pop(fingerprint, None)
+            self._fragments[fingerprint] = fragment
+            self._new_fragments[fingerprint] = fragment
+
+    def take_updates(self) -> CacheUpdates:
+        """
+        Returns the counters and the fragments rendered since the last call,
+        for a worker process to send them to the main one.
+        """
+        updates = (
+            self._hits,
+            self._misses,
+            self._new_fragments,
+            self._new_descriptions,
+        )
+        self._hits = 0
+        self._misses = 0
+        self._new_fragments = {}
+        self._new_descriptions = {}
+        return updates
+
+    def merge_updates(self, updates: CacheUpdates) -> None:
+        hits, misses, fragments, module_descriptions = updates
+        self._hits += hits
+        self._misses += misses
+        for fingerprint, fragment in fragments.items():
+            self.set_fragment(fingerprint, fragment)
+        for text_digest, descriptions in module_descriptions.items():
+            self._used_text_digests.add(text_digest)
+            for descriptions_by_digest in (
+                self._descriptions,
+                self._new_descriptions,
+            ):
+                descriptions_by_digest.setdefault(text_digest, {}).update(
+                    descriptions
+                )
+
+    def store(self) -> None:
+        if not self._new_fragments and not self._new_descriptions:
+            return
+        # the least recently used fragments are dropped, and the descriptions
+        # of the module texts of this run are kept first
+        fragments = list(self._fragments.items())
+        del fragments[: -self._MAX_FRAGMENTS]
+        module_descriptions = sorted(
+            self._descriptions.items(),
+            key=lambda item: item[0] in self._used_text_digests,
+        )
+        del module_descriptions[: -self._MAX_MODULE_TEXTS]
+        cache_dir = os.path.dirname(self._cache_path) or "."
+        os.makedirs(cache_dir, exist_ok=True)
+        # write then rename, so that concurrent runs never read half a file
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=cache_dir, suffix=".tmp"
+        )
+        with os.fdopen(file_descriptor, "wb") as cache_file:
+            pickle.dump(
+                (
+                    self._code_fingerprint,
+                    dict(fragments),
+                    dict(module_descriptions),
+                ),
+                cache_file,
+                pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temporary_path, self._cache_path)
+        self._new_fragments = {}
+        self._new_descriptions = {}
+
+    def _load(self) -> None:
+        try:
+            with open(self._cache_path, "rb") as cache_file:
+                code_fingerprint, fragments, descriptions = pickle.load(
+                    cache_file
+                )
+        except FileNotFoundError:
+            return
+        except Exception:  # pylint: disable=broad-except
+            # truncated or written by an incompatible version: render again
+            self._logger.warning(f"discarding unreadable {self._cache_path}")
+            return
+        if code_fingerprint == self._code_fingerprint:
+            self._fragments = fragments
+            self._descriptions = descriptions
+
+    @classmethod
+    def _get_code_fingerprint(cls, generator_module: str, options: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(options.encode("utf-8"))
+        for module_name in cls._SOURCE_MODULES + (generator_module,):
+            module_path = inspect.getsourcefile(
+                importlib.import_module(module_name)
+            )
+            if module_path is None:
+                raise FileNotFoundError(
+                    f"Cannot fingerprint {module_name}: no source file"
+                )
+            with open(module_path, "rb") as module_file:
+                digest.update(module_file.read())
+        return digest.hexdigest()
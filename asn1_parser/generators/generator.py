@@ -1,24 +1,56 @@
 import math
-from typing import Any, List, Optional, Tuple, Union
+import multiprocessing
+from typing import Dict, List, Optional, Tuple, Union
 
-import cgen
+from asn1_parser.asn1.asn1_bundle import ASN1Bundle
 from asn1_parser.asn1.grammar_elements.array import Array
 from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
 from asn1_parser.asn1.grammar_elements.asn1_string import Asn1String
 from asn1_parser.asn1.grammar_elements.choice import Choice
+from asn1_parser.asn1.grammar_elements.definitions import Definitions
 from asn1_parser.asn1.grammar_elements.enumerated import Enumerated
+from asn1_parser.asn1.grammar_elements.enumerated_item import EnumeratedItem
 from asn1_parser.asn1.grammar_elements.key_type_pair import KeyTypePair
 
 from asn1_parser.asn1.grammar_elements.sequence import Sequence
 
 from asn1_parser.asn1.grammar_elements.simple_definition import SimpleDefinition
 from asn1_parser.c_data import CData
+from asn1_parser.c_emitter import CEmitter
+from asn1_parser.asn1.worker_error import WorkerError
 from asn1_parser.c_printer import CPrinter
+from asn1_parser.cli.cli_arg_parser import (
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+    GenerateCFSCommandConfig,
+)
+from asn1_parser.generators.generation_cache import (
+    CacheUpdates,
+    GenerationCache,
+)
+from asn1_parser.log.logger import Logger
+from asn1_parser.output_sink import OutputSink
 from asn1_parser.utils.size import ASN1_POSIX_RANGE, TypeEnum, get_bit_size
 from asn1_parser.utils.string import lowerize
 
 
+GenerateCommandConfig = Union[
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+    GenerateCFSCommandConfig,
+]
+
+
 class Generator:
+    """
+    Converts the modules of a bundle to C. An instance holds its config and
+    the state of its generation, so that generators with different options
+    can run at the same time in the threads of one process; an instance runs
+    one generation at a time.
+    """
+
+    _logger = Logger(__name__)
+
     _C_SPACES = "  "
 
     _POSIX_DEFINED_TYPES = [
@@ -27,6 +59,123 @@ class Generator:
         if posix not in ["Float", "Double"]
     ]
 
+    def __init__(
+        self, config: GenerateCommandConfig, bundle: ASN1Bundle
+    ) -> None:
+        self._config = config
+        self._bundle = bundle
+        self._generation_cache: Optional[GenerationCache] = None
+
+    def generate(self, sink: Optional[OutputSink] = None) -> None:
+        """
+        Writes the files of the modules into the sink, or into the output
+        folder of the config.
+        """
+        raise NotImplementedError
+
+    def _get_cache_options(self) -> str:
+        """
+        Returns the options of the config the generated code depends on.
+        """
+        # pylint: disable=no-self-use
+        return ""
+
+    def get_generation_cache(self) -> Optional[GenerationCache]:
+        """
+        Returns the cache of the last generation, or None if it was disabled.
+        """
+        return self._generation_cache
+
+    def _convert_module_to_c(self, module: Asn1Module) -> CData:
+        raise NotImplementedError
+
+    def _convert_modules_to_c(self) -> List[Tuple[Asn1Module, CData]]:
+        """
+        Returns the data of each module, in the order of the modules. With
+        config.jobs > 1, the modules are converted in that many worker
+        processes, which get the generator when they start; the first error
+        in module order is raised, as in the serial path.
+        """
+        self._generation_cache = GenerationCache.create_from_config(
+            self._config,
+            type(self).__module__,
+            type(self).__name__,
+            self._get_cache_options(),
+        )
+        modules = self._bundle.get_modules_ordered()
+
+        processes = min(self._config.jobs, len(modules))
+        if processes <= 1:
+            modules_cdata = [
+                (module, self._convert_module_to_c(module))
+                for module in modules
+            ]
+            if self._generation_cache is not None:
+                self._generation_cache.store()
+            return modules_cdata
+
+        self._logger.debug(
+            f"generating {len(modules)} modules with {processes} processes"
+        )
+        with multiprocessing.Pool(
+            processes=processes,
+            initializer=_GenerationWorker.set_up,
+            initargs=(self,),
+        ) as pool:
+            results = pool.map(
+                _GenerationWorker.convert_module, range(len(modules))
+            )
+
+        modules_cdata = []
+        for module, (module_cdata, updates, error) in zip(modules, results):
+            if self._generation_cache is not None and updates is not None:
+                self._generation_cache.merge_updates(updates)
+            if error is not None:
+                raise error.get_exception()
+            assert module_cdata is not None
+            modules_cdata.append((module, module_cdata))
+        if self._generation_cache is not None:
+            self._generation_cache.store()
+        return modules_cdata
+
+    def _convert_definition_to_c(
+        self,
+        definition: Definitions,
+        simple_definition_list: List[SimpleDefinition],
+        module: Asn1Module,
+    ) -> CData:
+        """
+        Returns the data of a SEQUENCE, ENUMERATED or CHOICE, taken from the
+        generation cache when the definition and the ones it uses did not
+        change.
+        """
+        cache = self._generation_cache
+        fingerprint = None
+        if cache is not None:
+            fingerprint = cache.get_fingerprint(
+                definition, module, self._bundle.get_symbol_table()
+            )
+            cdata = cache.get_fragment(fingerprint)
+            if cdata is not None:
+                return cdata
+
+        if isinstance(definition, Sequence):
+            cdata = self._convert_sequence_to_c(
+                simple_definition_list, definition, module
+            )
+        elif isinstance(definition, Enumerated):
+            cdata = self._convert_enumerated_to_c(definition)
+        elif isinstance(definition, Choice):
+            cdata = self._convert_choice_to_c(definition)
+        else:
+            raise NotImplementedError(
+                f"'{definition}' is not a SEQUENCE, ENUMERATED or CHOICE."
+            )
+
+        if cache is not None:
+            cache.set_fragment(fingerprint, cdata)
+        return cdata
+
     @classmethod
     def _map_simple_types_to_c(
         cls, definition: Union[SimpleDefinition, KeyTypePair]
@@ -90,68 +239,60 @@ class Generator:
 
         return bit_length, valid_c_type, is_stdbool_needed, is_stdint_needed
 
-    @classmethod
     def _convert_sequence_to_c(
-        cls,
+        self,
         simple_definition_list: List[SimpleDefinition],
         definition: Sequence,
         module: Asn1Module,
     ) -> CData:
         cdata = CData.create_empty()
-        comment_str: str = ""
+        emitter = CEmitter()
 
         if definition.get_comment() and definition.get_comment().get_comment():
-            comment_str += str(
-                cgen.Comment(definition.get_comment().get_comment())
+            emitter.write_line(
+                CEmitter.comment(definition.get_comment().get_comment())
+            )
+
+        # simple definitions by C name, the first one of a name wins
+        simple_definitions: Dict[str, SimpleDefinition] = {}
+        for simple_definition in simple_definition_list:
+            simple_definitions.setdefault(
+                CPrinter.asn1_to_c_style_naming(
+                    simple_definition.get_type_name()
+                ),
+                simple_definition,
             )
-            comment_str += "\n"
 
         # map Sequence to c struct
-        sequence_list: List[Any] = []
+        members: List[str] = []
         for seq_item in definition.get_children():
-            if seq_item.get_comment():
-                seq_comment: str = ""
-                if seq_item.get_comment().get_unit():
-                    seq_comment = (
-                        seq_comment
-                        + "["
-                        + seq_item.get_comment().get_unit()
-                        + "] "
-                    )
-                if seq_item.get_comment().get_comment():
-                    seq_comment = (
-                        seq_comment + seq_item.get_comment().get_comment()
-                    )
-                sequence_list.append(cgen.LineComment(seq_comment))
+            seq_comment = self._get_item_comment(seq_item)
+            if seq_comment is not None:
+                members.append(CEmitter.line_comment(seq_comment))
 
             (
                 bit_length,
                 struct_c_type,
                 is_stdbool,
                 is_stdint,
-            ) = cls._map_simple_types_to_c(seq_item)
+            ) = self._map_simple_types_to_c(seq_item)
             # prevent overriding with false
             cdata.set_stdbool_if_needed(is_stdbool)
             cdata.set_stdint_if_needed(is_stdint)
 
             # Note: booleans are encoded as 1 bit bitfields
-            if lowerize(struct_c_type) in cls._POSIX_DEFINED_TYPES:
+            if lowerize(struct_c_type) in self._POSIX_DEFINED_TYPES:
                 struct_c_type = lowerize(struct_c_type)
                 cdata.set_stdint_if_needed(True)
 
-            simple_definition: List[SimpleDefinition] = [
-                sd
-                for sd in simple_definition_list
-                if CPrinter.asn1_to_c_style_naming(sd.get_type_name())
-                == struct_c_type
-            ]
-            if len(simple_definition) > 0:
+            used_simple_definition = simple_definitions.get(struct_c_type)
+            if used_simple_definition is not None:
                 (
                     bit_length,
                     struct_c_type,
                     is_stdbool,
                     is_stdint,
-                ) = cls._map_simple_types_to_c(simple_definition[0])
+                ) = self._map_simple_types_to_c(used_simple_definition)
                 # prevent overriding with false
                 cdata.set_stdbool_if_needed(is_stdbool)
                 cdata.set_stdint_if_needed(is_stdint)
@@ -165,160 +306,114 @@ class Generator:
             if isinstance(seq_item_type, (Array, Asn1String)):
                 # array or string (char array)
 
-                sequence_list.append(
-                    cgen.ArrayOf(
-                        cgen.Value(
-                            struct_c_type,
-                            seq_key,
-                        ),
-                        seq_item_type.get_length(),
+                members.append(
+                    CEmitter.declaration(
+                        struct_c_type, seq_key, seq_item_type.get_length()
                     )
                 )
             else:
-                sequence_list.append(
-                    cgen.Value(
-                        struct_c_type,
-                        seq_key,
-                    )
-                )
+                members.append(CEmitter.declaration(struct_c_type, seq_key))
             definition_type_name_c: str = CPrinter.asn1_to_c_style_naming(
                 definition.get_type_name()
             )
             # WITH COMPONENTS
             if seq_item.get_with_components():
                 cdata.extend_with_cdata(
-                    cls._with_components_handling(
+                    self._with_components_handling(
                         definition_type_name_c=definition_type_name_c,
                         seq_item=seq_item,
                         module=module,
                     )
                 )
-        cdata.add_data(
-            comment_str
-            + str(
-                cgen.Typedef(
-                    cgen.Struct(
-                        "",
-                        sequence_list,
-                        definition_type_name_c,
-                    )
-                )
-            )
+        emitter.write_struct_typedef(
+            CPrinter.asn1_to_c_style_naming(definition.get_type_name()),
+            members,
         )
+        cdata.add_data(str(emitter))
 
         return cdata
 
     @classmethod
     def _convert_enumerated_to_c(cls, definition: Enumerated) -> CData:
         cdata = CData.create_empty()
-        data_str: str = ""
+        emitter = CEmitter()
 
         if definition.get_comment() and definition.get_comment().get_comment():
-            data_str += str(
-                cgen.Comment(definition.get_comment().get_comment())
+            emitter.write_line(
+                CEmitter.comment(definition.get_comment().get_comment())
             )
-            data_str += "\n"
         # map Enumerated to c enum
-        data_str += "typedef enum {\n"
-        for enum_item in definition.get_enum():
-            enum_item_comment: str = ""
-            if enum_item.get_comment():
-                if enum_item.get_comment().get_unit():
-                    enum_item_comment = (
-                        enum_item_comment
-                        + "["
-                        + enum_item.get_comment().get_unit()
-                        + "] "
-                    )
-                if enum_item.get_comment().get_comment():
-                    enum_item_comment = (
-                        enum_item_comment
-                        + enum_item.get_comment().get_comment()
-                    )
-                enum_item_comment = "     " + str(
-                    cgen.LineComment(enum_item_comment)
+        emitter.write_enum_typedef(
+            CPrinter.asn1_to_c_style_naming(definition.get_type_name()),
+            [
+                CEmitter.enumerator(
+                    CPrinter.asn1_to_c_style_naming(enum_item.get_key()),
+                    enum_item.get_pos(),
+                    cls._get_item_comment(enum_item),
                 )
-            data_str += (
-                cls._C_SPACES
-                + CPrinter.asn1_to_c_style_naming(enum_item.get_key())
-                + " = "
-                + str(enum_item.get_pos())
-                + ","
-                + enum_item_comment
-                + "\n"
-            )
-        data_str += (
-            "} __attribute__((packed)) "
-            + CPrinter.asn1_to_c_style_naming(definition.get_type_name())
-            + ";"
+                for enum_item in definition.get_enum()
+            ],
         )
 
-        cdata.add_data(data_str)
+        cdata.add_data(str(emitter))
 
         return cdata
 
     @classmethod
     def _convert_choice_to_c(cls, definition: Choice) -> CData:
         cdata = CData.create_empty()
-        data_str: str = ""
+        emitter = CEmitter()
 
         if definition.get_comment() and definition.get_comment().get_comment():
-            data_str += str(
-                cgen.Comment(definition.get_comment().get_comment())
+            emitter.write_line(
+                CEmitter.comment(definition.get_comment().get_comment())
             )
-            data_str += "\n"
         # map Choice to c union
-        data_str += (
-            "union "
-            + CPrinter.asn1_to_c_style_naming(definition.get_type_name())
-            + " {\n"
-        )
+        members: List[str] = []
         for choice_item in definition.get_children():
-            choice_comment: str = ""
-            if choice_item.get_comment():
-                if choice_item.get_comment().get_unit():
-                    choice_comment = (
-                        choice_comment
-                        + "["
-                        + choice_item.get_comment().get_unit()
-                        + "] "
-                    )
-                if choice_item.get_comment().get_comment():
-                    choice_comment = (
-                        choice_comment + choice_item.get_comment().get_comment()
-                    )
-                choice_comment = "     " + str(cgen.LineComment(choice_comment))
-
             if (
                 choice_item.get_asn_type().get_type_name()
                 in cls._POSIX_DEFINED_TYPES
             ):
                 cdata.set_stdint_if_needed(True)
-            data_str += (
-                cls._C_SPACES
-                + CPrinter.asn1_to_c_style_naming(
-                    choice_item.get_asn_type().get_type_name()
+            members.append(
+                CEmitter.member(
+                    CPrinter.asn1_to_c_style_naming(
+                        choice_item.get_asn_type().get_type_name()
+                    ),
+                    CPrinter.asn1_to_c_style_naming(choice_item.get_key()),
+                    cls._get_item_comment(choice_item),
                 )
-                + " "
-                + CPrinter.asn1_to_c_style_naming(choice_item.get_key())
-                + ";"
-                + choice_comment
-            )
-        data_str += (
-            "} "
-            + lowerize(
-                CPrinter.asn1_to_c_style_naming(definition.get_type_name())
             )
-            + ";"
+        type_name_c = CPrinter.asn1_to_c_style_naming(
+            definition.get_type_name()
         )
+        emitter.write_union(type_name_c, lowerize(type_name_c), members)
 
-        cdata.add_data(data_str)
+        cdata.add_data(str(emitter))
 
         return cdata
 
-    @classmethod
+    @staticmethod
+    def _get_item_comment(
+        item: Union[EnumeratedItem, KeyTypePair]
+    ) -> Optional[str]:
+        """
+        Returns the text of the comment of the item, prefixed with its unit,
+        or None if it has no comment.
+        """
+        comment = item.get_comment()
+        if not comment:
+            return None
+        text = ""
+        if comment.get_unit():
+            text += "[" + comment.get_unit() + "] "
+        if comment.get_comment():
+            text += comment.get_comment()
+        return text
+
     def _with_components_handling(
-        cls,
+        self,
         definition_type_name_c: str,
         seq_item: KeyTypePair,
         module: Optional[Asn1Module],
@@ -326,3 +421,43 @@ class Generator:
         raise NotImplementedError(
             "This method must be implemented by subclasses."
         )
+
+
+class _GenerationWorker:
+    """
+    State of a worker process converting modules, set once when it starts:
+    with the fork start method the generator and its bundle are shared
+    copy-on-write, otherwise they are sent once per worker rather than once
+    per module.
+    """
+
+    generator: Optional[Generator] = None
+
+    @classmethod
+    def set_up(cls, generator: Generator) -> None:
+        cls.generator = generator
+
+    @classmethod
+    def convert_module(
+        cls, module_index: int
+    ) -> Tuple[Optional[CData], Optional[CacheUpdates], Optional[WorkerError]]:
+        # Errors are returned rather than raised so that the parent process
+        # can report the first failing module in module order. The fragments
+        # rendered are sent back to be stored by the parent process.
+        assert cls.generator is not None
+        # pylint: disable=protected-access
+        module = cls.generator._bundle.get_modules_ordered()[module_index]
+        cache = cls.generator.get_generation_cache()
+        try:
+            module_cdata = cls.generator._convert_module_to_c(module)
+        except Exception as exception:  # pylint: disable=broad-except
+            return (
+                None,
+                None if cache is None else cache.take_updates(),
+                WorkerError(exception),
+            )
+        return (
+            module_cdata,
+            None if cache is None else cache.take_updates(),
+            None,
+        )
@@ -0,0 +1,35 @@
+from typing import Dict, List
+
+from asn1_parser.asn1.asn1_bundle import ASN1Bundle
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.cli.manifest import GenerationJobConfig
+from asn1_parser.generators.batch_generator import BatchGenerator
+from asn1_parser.output_sink import MemorySink
+
+
+class InMemoryGenerator:
+    """
+    Generates files without writing them, for use as a library: the files
+    are returned by path relative to the output folder of the config, which
+    is not used.
+    """
+
+    @staticmethod
+    def generate(
+        config: GenerationJobConfig, bundle: ASN1Bundle
+    ) -> Dict[str, bytes]:
+        sink = MemorySink()
+        BatchGenerator.run_job(config, bundle, sink)
+        return sink.get_files()
+
+    @classmethod
+    def generate_from_texts(
+        cls, config: GenerationJobConfig, texts: List[str]
+    ) -> Dict[str, bytes]:
+        """
+        Same as generate, for the bundle of the modules of the texts, which
+        are validated as the input files of the generator would be.
+        """
+        return cls.generate(
+            config, ASN1BundleBuilder.build_from_texts(texts, config)
+        )
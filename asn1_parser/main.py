@@ -2,7 +2,8 @@
 
 import os
 import sys
-from typing import Union
+import time
+from typing import List, Optional, Union
 
 try:
     ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -17,20 +18,30 @@ except FileNotFoundError:
 
 from asn1_parser.asn1.asn1_bundle import ASN1Bundle
 from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
-from asn1_parser.asn1.validation.asn1_bundle_validator import (
-    ASN1ConsistencyError,
-)
+from asn1_parser.asn1.parse_cache import ParseCache
+from asn1_parser.asn1.validation.errors import ASN1ConsistencyError
+from asn1_parser.asn1.validation.diagnostics import DiagnosticsCollector
 from asn1_parser.cli.cli_arg_parser import (
+    GenerateAllCommandConfig,
     GenerateBinaryCommandConfig,
     GenerateCCommandConfig,
     create_args_parser,
     GenerateCosmosCommandConfig,
     GenerateCFSCommandConfig,
+    LintCommandConfig,
+    ValidateCommandConfig,
 )
+from asn1_parser.cli.manifest import Manifest, ManifestError
+from asn1_parser.dependency_sink import DependencySink, GeneratedOutput
+from asn1_parser.generators.batch_generator import BatchGenerator
 from asn1_parser.generators.binary.generator import BinaryGenerator
 from asn1_parser.generators.cfs.generator import CFSGenerator
 from asn1_parser.generators.c.generator import CGenerator
 from asn1_parser.generators.cosmos.generator import COSMOSGenerator
+from asn1_parser.generators.generation_cache import GenerationCache
+from asn1_parser.generators.generator import Generator
+from asn1_parser.output_sink import BackgroundSink, OutputSink
+from asn1_parser.output_writer import OutputWriter
 
 
 def main() -> None:
@@ -40,48 +51,231 @@ def main() -> None:
         GenerateCFSCommandConfig,
         GenerateCCommandConfig,
         GenerateBinaryCommandConfig,
+        GenerateAllCommandConfig,
+        ValidateCommandConfig,
+        LintCommandConfig,
     ]
+    parse_cache: Optional[ParseCache]
+    generation_cache: Optional[GenerationCache] = None
+    is_successful = True
 
     if parser.is_generate_cosmos_command():
         config = parser.get_generate_cosmos_config(ROOT_PATH)
-        bundle: ASN1Bundle = ASN1BundleBuilder.build_from_cosmos_config(config)
-        COSMOSGenerator.generate_cosmos(config, bundle)
+        parse_cache = ParseCache.create_from_config(config)
+        bundle: ASN1Bundle = ASN1BundleBuilder.build_from_cosmos_config(
+            config, parse_cache
+        )
+        run_generator(COSMOSGenerator(config, bundle), config)
     elif parser.is_generate_cfs_command():
         config = parser.get_generate_cfs_config(ROOT_PATH)
+        parse_cache = ParseCache.create_from_config(config)
         try:
-            bundle = ASN1BundleBuilder.build_from_cfs_config(config)
+            bundle = ASN1BundleBuilder.build_from_cfs_config(
+                config, parse_cache
+            )
         except ASN1ConsistencyError as exception:
             print(
                 f"error: an issue occurred when validating the ASN.1 bundle: "
                 f"{exception.args[0]}."
             )
             sys.exit(1)
-        CFSGenerator.generate_cfs(config, bundle)
+        cfs_generator = CFSGenerator(config, bundle)
+        run_generator(cfs_generator, config)
+        generation_cache = cfs_generator.get_generation_cache()
     elif parser.is_generate_c_command():
         config = parser.get_generate_c_config(ROOT_PATH)
+        parse_cache = ParseCache.create_from_config(config)
         try:
-            bundle = ASN1BundleBuilder.build_from_c_config(config)
+            bundle = ASN1BundleBuilder.build_from_c_config(config, parse_cache)
         except ASN1ConsistencyError as exception:
             print(
                 f"error: an issue occurred when validating the ASN.1 bundle: "
                 f"{exception.args[0]}."
             )
             sys.exit(1)
-        CGenerator.generate_c(config, bundle)
+        c_generator = CGenerator(config, bundle)
+        run_generator(c_generator, config)
+        generation_cache = c_generator.get_generation_cache()
     elif parser.is_generate_binary_command():
         config = parser.get_generate_binary_config(ROOT_PATH)
+        parse_cache = ParseCache.create_from_config(config)
         try:
-            bundle = ASN1BundleBuilder.build_from_binary_config(config)
+            bundle = ASN1BundleBuilder.build_from_binary_config(
+                config, parse_cache
+            )
         except ASN1ConsistencyError as exception:
             print(
                 f"error: an issue occurred when validating the ASN.1 bundle: "
                 f"{exception.args[0]}."
             )
             sys.exit(1)
-        BinaryGenerator.generate_binary(config, bundle)
+        binary_generator = BinaryGenerator(config, bundle)
+        run_generator(binary_generator, config)
+        generation_cache = binary_generator.get_generation_cache()
+    elif parser.is_generate_all_command():
+        config = parser.get_generate_all_config(ROOT_PATH)
+        parse_cache = ParseCache.create_from_config(config)
+        is_successful = generate_all(config, parse_cache)
+    elif parser.is_validate_command():
+        config = parser.get_validate_config(ROOT_PATH)
+        validate(config)
+        parse_cache = None
+    elif parser.is_lint_command():
+        config = parser.get_lint_config(ROOT_PATH)
+        lint(config)
+        parse_cache = None
     else:
         raise NotImplementedError
 
+    if parse_cache is not None:
+        print(parse_cache.get_summary())
+    if generation_cache is not None:
+        print(generation_cache.get_summary())
+    if not is_successful:
+        sys.exit(1)
+
+
+def generate_all(
+    config: GenerateAllCommandConfig, parse_cache: Optional[ParseCache]
+) -> bool:
+    """
+    Returns whether every job of the manifest succeeded.
+    """
+    start = time.perf_counter()
+    try:
+        manifest = Manifest.load(
+            config.manifest_path, config.project_root_path, config.fast_parser
+        )
+        bundle = ASN1BundleBuilder.build_from_manifest(
+            config, manifest, parse_cache
+        )
+    except ManifestError as exception:
+        print(f"error: {exception}")
+        sys.exit(1)
+    except ASN1ConsistencyError as exception:
+        print(
+            f"error: an issue occurred when validating the ASN.1 bundle: "
+            f"{exception.args[0]}."
+        )
+        sys.exit(1)
+    build_time = time.perf_counter() - start
+
+    results = BatchGenerator.generate_all(config, manifest, bundle)
+    for result in results:
+        print(result)
+    print(
+        OutputWriter.get_summary(
+            sum(result.get_written() for result in results),
+            sum(result.get_unchanged() for result in results),
+        )
+    )
+    generation_time = time.perf_counter() - start - build_time
+
+    failed_count = sum(result.get_error() is not None for result in results)
+    print(
+        f"{len(results) - failed_count} of {len(results)} job(s) done: "
+        f"parse and validation {build_time:.3f} s, generation "
+        f"{generation_time:.3f} s, total {build_time + generation_time:.3f} s"
+    )
+    if failed_count == 0:
+        write_dependency_files(
+            config,
+            [output for result in results for output in result.get_outputs()],
+        )
+    return failed_count == 0
+
+
+def run_generator(
+    generator: Union[COSMOSGenerator, Generator],
+    config: Union[
+        GenerateCosmosCommandConfig,
+        GenerateCFSCommandConfig,
+        GenerateCCommandConfig,
+        GenerateBinaryCommandConfig,
+    ],
+) -> None:
+    """
+    Runs the generator, whose files are written into the output folder or
+    the archive by a background thread while the next ones are rendered, and
+    prints the summary of the output files.
+    """
+    start = time.perf_counter()
+    sink = BackgroundSink(BatchGenerator.create_output_sink(config))
+    dependency_sink: Optional[DependencySink] = None
+    if (
+        config.depfile_path is not None
+        or config.output_manifest_path is not None
+    ):
+        dependency_sink = DependencySink(
+            sink, config.output_dir, config.output_archive_path
+        )
+    output_sink: OutputSink = (
+        sink if dependency_sink is None else dependency_sink
+    )
+    try:
+        generator.generate(output_sink)
+    except BaseException:
+        output_sink.discard()
+        raise
+    output_sink.close()
+    print(
+        OutputWriter.get_summary(
+            output_sink.get_written(), output_sink.get_unchanged()
+        )
+    )
+    print(f"output time: {sink.get_time_summary(time.perf_counter() - start)}")
+    if dependency_sink is not None:
+        write_dependency_files(config, dependency_sink.get_outputs())
+
+
+def write_dependency_files(
+    config: Union[
+        GenerateCosmosCommandConfig,
+        GenerateCFSCommandConfig,
+        GenerateCCommandConfig,
+        GenerateBinaryCommandConfig,
+        GenerateAllCommandConfig,
+    ],
+    outputs: List[GeneratedOutput],
+) -> None:
+    if config.depfile_path is not None:
+        DependencySink.write_depfile(outputs, config.depfile_path)
+    if config.output_manifest_path is not None:
+        DependencySink.write_manifest(outputs, config.output_manifest_path)
+
+
+def validate(config: ValidateCommandConfig) -> None:
+    diagnostics = DiagnosticsCollector.collect(
+        config.input_paths, config.jobs, config.fast_parser
+    )
+    for diagnostic in diagnostics:
+        print(f"error: {diagnostic}")
+    if config.json_output_path is not None:
+        DiagnosticsCollector.write_json(diagnostics, config.json_output_path)
+
+    files_count = len({d.get_file_path() for d in diagnostics})
+    print(f"{len(diagnostics)} error(s) found in {files_count} file(s).")
+    if diagnostics:
+        sys.exit(1)
+
+
+def lint(config: LintCommandConfig) -> None:
+    # only the errors are printed, so that the output can be parsed
+    diagnostics = DiagnosticsCollector.collect(
+        config.input_paths,
+        config.jobs,
+        config.fast_parser,
+        ParseCache.create_from_config(config),
+        config.changed_file_paths,
+    )
+    if config.output_format == "json":
+        print(DiagnosticsCollector.to_json(diagnostics))
+    else:
+        for diagnostic in diagnostics:
+            print(diagnostic)
+    if diagnostics:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,366 @@
+import functools
+import gzip
+import io
+import os
+import queue
+import stat
+import tarfile
+import threading
+import time
+import zipfile
+from typing import IO, Callable, Dict, Optional, Set, cast
+
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.output_writer import OutputWriter
+
+
+class OutputSink:
+    """
+    Receives the files of a generator, by path relative to the output
+    folder.
+    """
+
+    def begin_module(self, module: Asn1Module) -> None:
+        """
+        Called before the files generated from the module are written.
+        """
+
+    def write(self, relative_path: str, content: bytes) -> None:
+        raise NotImplementedError
+
+    def write_text(self, relative_path: str, content: str) -> None:
+        self.write(relative_path, content.encode("utf-8"))
+
+    def close(self) -> None:
+        """
+        Called once all the files are written.
+        """
+
+    def discard(self) -> None:
+        """
+        Called instead of close when the generation failed.
+        """
+
+    def get_written(self) -> int:
+        """
+        Returns the number of output files written, once the sink is closed.
+        """
+        # pylint: disable=no-self-use
+        return 0
+
+    def get_unchanged(self) -> int:
+        """
+        Returns the number of output files left as they were because their
+        content did not change, once the sink is closed.
+        """
+        # pylint: disable=no-self-use
+        return 0
+
+
+class DirectorySink(OutputSink):
+    """
+    Writes the files into a folder, created if needed. Files whose content
+    did not change are not written again.
+    """
+
+    def __init__(self, output_dir: str) -> None:
+        self._output_dir = output_dir
+        self._written = 0
+        self._unchanged = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def get_output_dir(self) -> str:
+        return self._output_dir
+
+    def write(self, relative_path: str, content: bytes) -> None:
+        file_path = os.path.join(self._output_dir, relative_path)
+        if os.path.dirname(relative_path):
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        if OutputWriter.write(file_path, content):
+            self._written += 1
+        else:
+            self._unchanged += 1
+
+    def get_written(self) -> int:
+        return self._written
+
+    def get_unchanged(self) -> int:
+        return self._unchanged
+
+
+class MemorySink(OutputSink):
+    """
+    Keeps the files in memory.
+    """
+
+    def __init__(self) -> None:
+        self._files: Dict[str, bytes] = {}
+
+    def write(self, relative_path: str, content: bytes) -> None:
+        self._files[relative_path] = content
+
+    def get_files(self) -> Dict[str, bytes]:
+        return self._files
+
+
+class ArchiveSink(OutputSink):  # pylint: disable=too-many-instance-attributes
+    """
+    Streams the files into a tar or zip archive, never written into a
+    folder. The format is given by the extension of the archive: .tar,
+    .tar.gz or .tgz, .tar.bz2 and .tar.xz, or .zip, whose files are
+    deflated. The files are stored in the order they are generated, which
+    does not depend on the run, with a fixed timestamp, owner and
+    permissions: the same files give the same archive, which is then not
+    written again. The archive is written to a temporary file renamed over
+    it by close; discard removes it.
+    """
+
+    EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".zip")
+    # the earliest date of a zip file, 1980-01-01 00:00:00 UTC, also given to
+    # the files of a tar archive
+    DATE_TIME = (1980, 1, 1, 0, 0, 0)
+    TIMESTAMP = 315532800
+    FILE_MODE = 0o644
+
+    def __init__(self, archive_path: str) -> None:
+        extension = self.get_extension(archive_path)
+        if extension is None:
+            raise ValueError(
+                f"'{archive_path}' must end with one of "
+                f"{', '.join(self.EXTENSIONS)}"
+            )
+        self._archive_path = archive_path
+        self._relative_paths: Set[str] = set()
+        self._tar_file: Optional[tarfile.TarFile] = None
+        self._zip_file: Optional[zipfile.ZipFile] = None
+        self._gzip_file: Optional[gzip.GzipFile] = None
+        self._is_closed = False
+        # the archive is the only output file
+        self._is_written: Optional[bool] = None
+
+        os.makedirs(os.path.dirname(archive_path) or ".", exist_ok=True)
+        file_descriptor, temporary_path = OutputWriter.create_temporary_file(
+            archive_path
+        )
+        self._temporary_path = temporary_path
+        # the files stay open until close or discard
+        # pylint: disable=consider-using-with
+        self._file = os.fdopen(file_descriptor, "wb")
+        try:
+            if extension == ".zip":
+                self._zip_file = zipfile.ZipFile(
+                    self._file, "w", zipfile.ZIP_DEFLATED
+                )
+            elif extension in (".tar.gz", ".tgz"):
+                # tarfile would store the time and the name of the temporary
+                # file in the gzip header
+                self._gzip_file = gzip.GzipFile(
+                    filename="", mode="wb", fileobj=self._file, mtime=0
+                )
+                self._tar_file = tarfile.open(
+                    fileobj=cast(IO[bytes], self._gzip_file),
+                    mode="w",
+                    format=tarfile.PAX_FORMAT,
+                )
+            else:
+                # bz2 and xz streams store neither a time nor a name
+                self._tar_file = tarfile.open(
+                    fileobj=self._file,
+                    mode="w:" + extension.rsplit(".", 1)[-1],
+                    format=tarfile.PAX_FORMAT,
+                )
+        except BaseException:
+            self.discard()
+            raise
+
+    @classmethod
+    def get_extension(cls, archive_path: str) -> Optional[str]:
+        """
+        Returns the extension giving the format of the archive, or None if
+        it has none of the supported ones.
+        """
+        for extension in cls.EXTENSIONS:
+            if archive_path.endswith(extension):
+                return extension
+        return None
+
+    def write(self, relative_path: str, content: bytes) -> None:
+        if self._is_closed:
+            raise ValueError("The sink is closed.")
+        name = relative_path.replace(os.sep, "/")
+        # an archive may hold several files with the same name, which are
+        # then extracted over each other
+        if name in self._relative_paths:
+            raise ValueError(
+                f"'{name}' is written twice into {self._archive_path}"
+            )
+        self._relative_paths.add(name)
+        if self._zip_file is not None:
+            zip_info = zipfile.ZipInfo(name, self.DATE_TIME)
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            # Unix, whose permissions are stored in the external attributes
+            zip_info.create_system = 3
+            zip_info.external_attr = (stat.S_IFREG | self.FILE_MODE) << 16
+            self._zip_file.writestr(zip_info, content)
+        else:
+            assert self._tar_file is not None
+            tar_info = tarfile.TarInfo(name)
+            tar_info.size = len(content)
+            tar_info.mtime = self.TIMESTAMP
+            tar_info.mode = self.FILE_MODE
+            self._tar_file.addfile(tar_info, io.BytesIO(content))
+
+    def close(self) -> None:
+        if self._is_closed:
+            return
+        try:
+            self._close_files()
+        except BaseException:
+            os.remove(self._temporary_path)
+            raise
+        self._is_written = OutputWriter.write_from_temporary_file(
+            self._temporary_path, self._archive_path
+        )
+
+    def discard(self) -> None:
+        if self._is_closed:
+            return
+        try:
+            self._close_files()
+        finally:
+            os.remove(self._temporary_path)
+
+    def get_written(self) -> int:
+        return int(self._is_written is True)
+
+    def get_unchanged(self) -> int:
+        return int(self._is_written is False)
+
+    def _close_files(self) -> None:
+        self._is_closed = True
+        try:
+            # the archive, then the compressed stream, then the file
+            for archive_file in (
+                self._zip_file,
+                self._tar_file,
+                self._gzip_file,
+            ):
+                if archive_file is not None:
+                    archive_file.close()
+        finally:
+            self._file.close()
+
+
+class BackgroundSink(
+    OutputSink
+):  # pylint: disable=too-many-instance-attributes
+    """
+    Writes the files into another sink from a background thread, so that the
+    generator renders the next files meanwhile. At most max_pending files
+    wait to be written: a generator rendering faster than the files are
+    written waits for the writer. After a failed write, the files are no
+    longer written and the next write raises its error. close, or discard
+    after a failed generation, must be called once the files are written.
+    """
+
+    def __init__(self, sink: OutputSink, max_pending: int = 64) -> None:
+        self._sink = sink
+        # calls to the sink, None to stop the writer
+        self._queue: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue(
+            max_pending
+        )
+        self._error: Optional[Exception] = None
+        self._is_error_raised = False
+        self._is_closed = False
+        self._wait_time = 0.0
+        self._write_time = 0.0
+        self._thread = threading.Thread(
+            target=self._write_files, name="output-writer", daemon=True
+        )
+        self._thread.start()
+
+    def get_wait_time(self) -> float:
+        """
+        Returns the time the generator waited for the writer, in seconds.
+        """
+        return self._wait_time
+
+    def get_write_time(self) -> float:
+        """
+        Returns the time spent writing the files, in seconds.
+        """
+        return self._write_time
+
+    def get_time_summary(self, elapsed: float) -> str:
+        """
+        Returns the time spent rendering the files, out of the elapsed time
+        of the generation, and the time spent writing them.
+        """
+        return (
+            f"rendering {elapsed - self._wait_time:.3f} s, "
+            f"writing {self._write_time:.3f} s"
+        )
+
+    def begin_module(self, module: Asn1Module) -> None:
+        self._put(functools.partial(self._sink.begin_module, module))
+
+    def write(self, relative_path: str, content: bytes) -> None:
+        self._put(functools.partial(self._sink.write, relative_path, content))
+
+    def close(self) -> None:
+        """
+        Waits for the pending files to be written and closes the other sink,
+        or discards it after a failed write, then raises the error of the
+        failed write, unless write already raised it.
+        """
+        self._stop()
+        if self._error is None:
+            self._sink.close()
+            return
+        self._sink.discard()
+        if not self._is_error_raised:
+            self._is_error_raised = True
+            raise self._error
+
+    def discard(self) -> None:
+        self._stop()
+        self._sink.discard()
+
+    def get_written(self) -> int:
+        return self._sink.get_written()
+
+    def get_unchanged(self) -> int:
+        return self._sink.get_unchanged()
+
+    def _stop(self) -> None:
+        if not self._is_closed:
+            self._is_closed = True
+            start = time.perf_counter()
+            self._queue.put(None)
+            self._thread.join()
+            self._wait_time += time.perf_counter() - start
+
+    def _put(self, call: Callable[[], None]) -> None:
+        if self._error is not None:
+            self._is_error_raised = True
+            raise self._error
+        if self._is_closed:
+            raise ValueError("The sink is closed.")
+        start = time.perf_counter()
+        self._queue.put(call)
+        self._wait_time += time.perf_counter() - start
+
+    def _write_files(self) -> None:
+        while True:
+            call = self._queue.get()
+            if call is None:
+                return
+            # after a failed write, the pending files are dropped so that
+            # the generator never waits for a writer that stopped
+            if self._error is None:
+                start = time.perf_counter()
+                try:
+                    call()
+                except Exception as exception:  # pylint: disable=broad-except
+                    self._error = exception
+                self._write_time += time.perf_counter() - start
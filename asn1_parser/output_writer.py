@@ -0,0 +1,115 @@
+import os
+import tempfile
+import threading
+from typing import Tuple
+
+from asn1_parser.log.logger import Logger
+
+
+class OutputWriter:
+    """
+    Writes generated files only when their content changed, so that the
+    modification times of unchanged files are kept and builds depending on
+    them are not run again. A file is written to a temporary file renamed
+    over the target, so that it is never seen half written. The callers
+    count the files written from the returned values; the sinks keep their
+    own counts.
+    """
+
+    _logger = Logger(__name__)
+
+    _lock = threading.Lock()
+    # not read yet while negative
+    _umask = -1
+
+    @classmethod
+    def write(cls, file_path: str, content: bytes) -> bool:
+        """
+        Returns whether the file was written.
+        """
+        if cls._has_content(file_path, content):
+            cls._logger.debug(f"'{file_path}' is unchanged")
+            return False
+
+        file_descriptor, temporary_path = cls.create_temporary_file(file_path)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(content)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        cls._replace(temporary_path, file_path)
+        return True
+
+    @staticmethod
+    def create_temporary_file(file_path: str) -> Tuple[int, str]:
+        """
+        Returns the descriptor and the path of a new temporary file next to
+        the file, to be passed to write_from_temporary_file.
+        """
+        output_folder = os.path.dirname(file_path) or "."
+        return tempfile.mkstemp(dir=output_folder, suffix=".tmp")
+
+    @classmethod
+    def write_from_temporary_file(
+        cls, temporary_path: str, file_path: str
+    ) -> bool:
+        """
+        Renames the temporary file over the file, or removes it if the file
+        has the same content. Returns whether the file was written.
+        """
+        if cls._has_same_content(temporary_path, file_path):
+            os.remove(temporary_path)
+            cls._logger.debug(f"'{file_path}' is unchanged")
+            return False
+        cls._replace(temporary_path, file_path)
+        return True
+
+    @classmethod
+    def write_text(cls, file_path: str, content: str) -> bool:
+        return cls.write(file_path, content.encode("utf-8"))
+
+    @staticmethod
+    def get_summary(written: int, unchanged: int) -> str:
+        return f"output files: {written} written, {unchanged} unchanged"
+
+    @staticmethod
+    def _has_content(file_path: str, content: bytes) -> bool:
+        try:
+            if os.path.getsize(file_path) != len(content):
+                return False
+            with open(file_path, "rb") as file:
+                return file.read() == content
+        except OSError:
+            return False
+
+    @classmethod
+    def _has_same_content(cls, temporary_path: str, file_path: str) -> bool:
+        try:
+            if os.path.getsize(file_path) != os.path.getsize(temporary_path):
+                return False
+            with open(temporary_path, "rb") as file:
+                return cls._has_content(file_path, file.read())
+        except OSError:
+            return False
+
+    @classmethod
+    def _replace(cls, temporary_path: str, file_path: str) -> None:
+        try:
+            # mkstemp creates the file readable by its owner only
+            os.chmod(temporary_path, 0o666 & ~cls._get_umask())
+            os.replace(temporary_path, file_path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    @classmethod
+    def _get_umask(cls) -> int:
+        # os.umask can only be read by setting it, which would change the
+        # permissions of the files created meanwhile by other threads: it is
+        # read once
+        with cls._lock:
+            if cls._umask < 0:
+                cls._umask = os.umask(0)
+                os.umask(cls._umask)
+            return cls._umask
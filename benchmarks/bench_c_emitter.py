@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Measures the emission of C code for large enums and for deeply nested WITH
+COMPONENTS initializers. The time per character emitted should not grow with
+the size of the code.
+"""
+import os
+import sys
+import time
+from typing import Any, Callable
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_PATH)
+
+# pylint: disable=wrong-import-position,protected-access
+
+from asn1_parser.asn1.asn1_bundle_builder import (  # noqa: E402
+    ASN1BundleBuilder,
+)
+from asn1_parser.asn1.grammar_elements.asn1_comment import (  # noqa: E402
+    Asn1Comment,
+)
+from asn1_parser.asn1.grammar_elements.components_item import (  # noqa: E402
+    ComponentsItem,
+)
+from asn1_parser.asn1.grammar_elements.enumerated import (  # noqa: E402
+    Enumerated,
+)
+from asn1_parser.asn1.grammar_elements.with_components import (  # noqa: E402
+    WithComponents,
+)
+from asn1_parser.asn1.parser import Asn1Parser  # noqa: E402
+from asn1_parser.c_emitter import CEmitter  # noqa: E402
+from asn1_parser.generators.c.generator import CGenerator  # noqa: E402
+
+ENUM_SIZES = (2500, 5000, 10000)
+NESTING_DEPTHS = (200, 400, 800)
+REPEATS = 5
+
+
+def enum_module(size: int) -> str:
+    items = "".join(
+        f"    state-{index} ({index}), -- [s] state number {index}\n"
+        for index in range(size)
+    )
+    return (
+        "Module-bench-enum DEFINITIONS AUTOMATIC TAGS ::= BEGIN\n\n"
+        f"  State-t ::= ENUMERATED {{\n{items}    last ({size})\n  }}\n\n"
+        "END\n"
+    )
+
+
+def nested_with_components(depth: int) -> WithComponents:
+    """
+    Returns WITH COMPONENTS setting a value at each level of a chain of
+    nested sequences. They are built directly: parsing them is not measured.
+    """
+    comment = Asn1Comment(None, "", "", False)
+    with_components = WithComponents(
+        [ComponentsItem("value", 1, comment, None)], comment, None
+    )
+    for _ in range(depth):
+        with_components = WithComponents(
+            [
+                ComponentsItem("value", 1, comment, None),
+                ComponentsItem("next", with_components, comment, None),
+            ],
+            comment,
+            None,
+        )
+    return with_components
+
+
+def emit_enum(enumerated: Enumerated) -> str:
+    return CGenerator._convert_enumerated_to_c(enumerated).get_data()[0]
+
+
+def emit_initializer(with_components: WithComponents) -> str:
+    emitter = CEmitter()
+    CGenerator._process_with_components(emitter, with_components, 1)
+    return str(emitter)
+
+
+def measure(function: Callable[[Any], str], argument: Any) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        function(argument)
+    return (time.perf_counter() - start) / REPEATS
+
+
+def print_row(size: int, code: str, elapsed: float) -> None:
+    print(
+        f"{size:>11} {len(code):>10} {elapsed * 1000:>10.2f} "
+        f"{elapsed * 1e9 / len(code):>8.1f}"
+    )
+
+
+def main() -> None:
+    print(f"{'enum items':>11} {'chars':>10} {'time [ms]':>10} {'ns/char':>8}")
+    for size in ENUM_SIZES:
+        bundle = ASN1BundleBuilder.build(
+            Asn1Parser.parse_from_text_multimodule(
+                [enum_module(size)], use_fast_parser=True
+            )
+        )
+        enumerated = bundle.get_modules_ordered()[0].get_definitions()[0]
+        assert isinstance(enumerated, Enumerated)
+        print_row(size, emit_enum(enumerated), measure(emit_enum, enumerated))
+
+    print(f"{'depth':>11} {'chars':>10} {'time [ms]':>10} {'ns/char':>8}")
+    for depth in NESTING_DEPTHS:
+        with_components = nested_with_components(depth)
+        print_row(
+            depth,
+            emit_initializer(with_components),
+            measure(emit_initializer, with_components),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Measures the generation of cFS headers for a bundle of synthetic modules,
+serially and with one process per CPU core.
+"""
+import os
+import sys
+import tempfile
+import time
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_PATH)
+
+# pylint: disable=wrong-import-position
+
+from asn1_parser.asn1.asn1_bundle_builder import (  # noqa: E402
+    ASN1BundleBuilder,
+)
+from asn1_parser.cli.cli_arg_parser import (  # noqa: E402
+    GenerateCFSCommandConfig,
+)
+from asn1_parser.generators.cfs.generator import CFSGenerator  # noqa: E402
+from benchmarks.synthetic import module_name, synthetic_modules  # noqa: E402
+
+MODULE_COUNT = 300
+FIELDS = 64
+
+
+def main() -> None:
+    bundle = ASN1BundleBuilder.build_from_texts(
+        synthetic_modules(MODULE_COUNT, FIELDS)
+    )
+    module_names = [module_name(index) for index in range(MODULE_COUNT)]
+
+    print(f"{'jobs':>6} {'time [s]':>9}")
+    for jobs in sorted({1, 2, 4, os.cpu_count() or 1}):
+        with tempfile.TemporaryDirectory() as output_dir:
+            config = GenerateCFSCommandConfig(
+                ROOT_PATH, [], module_names, output_dir, jobs=jobs
+            )
+            start = time.perf_counter()
+            CFSGenerator(config, bundle).generate()
+            elapsed = time.perf_counter() - start
+        print(f"{jobs:>6} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
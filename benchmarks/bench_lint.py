@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Measures the lint command on a folder of synthetic modules: cold, warm, and
+warm with one changed file, as a pre-commit hook runs it.
+"""
+import os
+import sys
+import tempfile
+import time
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_PATH)
+
+# pylint: disable=wrong-import-position
+
+from asn1_parser.asn1.parse_cache import ParseCache  # noqa: E402
+from asn1_parser.asn1.parser import Asn1Parser  # noqa: E402
+from asn1_parser.asn1.validation.diagnostics import (  # noqa: E402
+    DiagnosticsCollector,
+)
+from benchmarks.synthetic import synthetic_modules  # noqa: E402
+
+FILE_COUNT = 600
+
+
+def main() -> None:
+    Asn1Parser.get_meta_model()
+    with tempfile.TemporaryDirectory() as input_dir:
+        file_paths = []
+        for index, text in enumerate(synthetic_modules(FILE_COUNT)):
+            file_path = os.path.join(input_dir, f"module_{index:04}.asn")
+            with open(file_path, "w", encoding="utf8") as input_file:
+                input_file.write(text)
+            file_paths.append(file_path)
+        cache_dir = os.path.join(input_dir, "cache")
+
+        print(f"{'run':>24} {'errors':>7} {'time [s]':>9}")
+        for label, changed_file_paths in (
+            ("cold cache", None),
+            ("warm cache", None),
+            ("warm cache, 1 changed", [file_paths[-1]]),
+        ):
+            start = time.perf_counter()
+            diagnostics = DiagnosticsCollector.collect(
+                [input_dir],
+                jobs=os.cpu_count() or 1,
+                parse_cache=ParseCache(cache_dir, 256 * 1024 * 1024),
+                changed_file_paths=changed_file_paths,
+            )
+            elapsed = time.perf_counter() - start
+            print(f"{label:>24} {len(diagnostics):>7} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
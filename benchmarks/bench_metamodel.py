@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Compares parsing with a textX metamodel built for every module (the behaviour
+before the metamodel was cached) against parsing with the metamodel that
+Asn1Parser now builds once per process.
+"""
+import os
+import sys
+import time
+from typing import List
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_PATH)
+
+# pylint: disable=wrong-import-position
+
+from asn1_parser.asn1.parser import Asn1Parser  # noqa: E402
+from benchmarks.synthetic import synthetic_modules  # noqa: E402
+
+
+def parse_all(texts: List[str], rebuild_meta_model: bool) -> float:
+    # pylint: disable=protected-access
+    # Start cold in both modes: the cached run pays for one metamodel build.
+    Asn1Parser._meta_model = None
+    start = time.perf_counter()
+    for text in texts:
+        if rebuild_meta_model:
+            Asn1Parser._meta_model = None
+        Asn1Parser.parse_from_text(text, is_multimodule=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'modules':>8} {'rebuilt [s]':>12} {'cached [s]':>12} speedup")
+    for count in (1, 10, 500):
+        texts = synthetic_modules(count)
+        rebuilt = parse_all(texts, rebuild_meta_model=True)
+        cached = parse_all(texts, rebuild_meta_model=False)
+        print(
+            f"{count:>8} {rebuilt:>12.3f} {cached:>12.3f} "
+            f"{rebuilt / cached:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Compares parsing every input file against parsing only the modules reachable
+from one target module, as generate-cosmos does, on a folder of synthetic
+modules.
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_PATH)
+
+# pylint: disable=wrong-import-position
+
+from asn1_parser.asn1.grammar_elements.asn1_module import (  # noqa: E402
+    Asn1Module,
+)
+from asn1_parser.asn1.module_index import ModuleIndex  # noqa: E402
+from asn1_parser.asn1.parser import Asn1Parser  # noqa: E402
+from benchmarks.synthetic import module_name, synthetic_modules  # noqa: E402
+
+FILE_COUNT = 600
+# every synthetic module imports the previous one: 5 modules are reachable
+TARGET_INDEX = 4
+
+
+def parse_files(file_paths: List[str]) -> List[Asn1Module]:
+    return Asn1Parser.parse_from_files(*file_paths)
+
+
+def main() -> None:
+    Asn1Parser.get_meta_model()
+    with tempfile.TemporaryDirectory() as input_dir:
+        for index, text in enumerate(synthetic_modules(FILE_COUNT)):
+            file_path = os.path.join(input_dir, f"module_{index:04}.asn")
+            with open(file_path, "w", encoding="utf8") as input_file:
+                input_file.write(text)
+        index_path = os.path.join(input_dir, "cache", "module-index.json")
+
+        start = time.perf_counter()
+        parse_files(ModuleIndex([input_dir]).get_file_paths())
+        eager = time.perf_counter() - start
+
+        print(f"{'mode':>24} {'modules':>8} {'time [s]':>9}")
+        print(f"{'parse every file':>24} {FILE_COUNT:>8} {eager:>9.3f}")
+        for label in ("lazy, cold index", "lazy, warm index"):
+            start = time.perf_counter()
+            modules = ModuleIndex(
+                [input_dir], index_path
+            ).load_reachable_modules([module_name(TARGET_INDEX)], parse_files)
+            lazy = time.perf_counter() - start
+            print(f"{label:>24} {len(modules):>8} {lazy:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Compares the throughput of textX and of FastParser on synthetic modules,
+processors included.
+"""
+import os
+import sys
+import time
+from typing import List
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_PATH)
+
+# pylint: disable=wrong-import-position
+
+from asn1_parser.asn1.parser import Asn1Parser  # noqa: E402
+from benchmarks.synthetic import synthetic_modules  # noqa: E402
+
+
+def parse_all(texts: List[str], use_fast_parser: bool) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        Asn1Parser.parse_from_text(
+            text, is_multimodule=True, use_fast_parser=use_fast_parser
+        )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    # keep the metamodel build out of the measurements
+    Asn1Parser.get_meta_model()
+    print(
+        f"{'modules':>8} {'fields':>7} {'size [kB]':>10} "
+        f"{'textX [MB/s]':>13} {'fast [MB/s]':>12} speedup"
+    )
+    for count, fields in ((10, 8), (200, 8), (20, 200)):
+        texts = synthetic_modules(count, fields)
+        size = sum(len(text.encode("utf-8")) for text in texts)
+        textx_time = parse_all(texts, use_fast_parser=False)
+        fast_time = parse_all(texts, use_fast_parser=True)
+        print(
+            f"{count:>8} {fields:>7} {size / 1024:>10.1f} "
+            f"{size / textx_time / 1e6:>13.2f} {size / fast_time / 1e6:>12.2f} "
+            f"{textx_time / fast_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
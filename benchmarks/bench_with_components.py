@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Measures the validation of a bundle of packets whose WITH COMPONENTS all
+constrain the same nested primary header, as CCSDS packets do.
+"""
+import os
+import sys
+import time
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_PATH)
+
+# pylint: disable=wrong-import-position
+
+from asn1_parser.asn1.asn1_bundle_builder import (  # noqa: E402
+    ASN1BundleBuilder,
+)
+from asn1_parser.asn1.parser import Asn1Parser  # noqa: E402
+from asn1_parser.asn1.validation.asn1_bundle_validator import (  # noqa: E402
+    ASN1BundleValidator,
+)
+
+PACKET_COUNTS = (500, 2000, 8000)
+
+HEADER_MODULE = """Module-bench-header DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Primary-header-t ::= SEQUENCE {
+    version INTEGER(0..7),
+    identification Identification-t,
+    length INTEGER(0..65535)
+  }
+
+  Identification-t ::= SEQUENCE {
+    is-cmd BOOLEAN,
+    has-secondary BOOLEAN,
+    apid INTEGER(0..2047)
+  }
+
+END
+"""
+
+
+def packets_module(count: int) -> str:
+    packets = "".join(
+        f"""
+  Packet-{index}-t ::= SEQUENCE {{
+    header Primary-header-t (WITH COMPONENTS {{
+      version (0),
+      identification (WITH COMPONENTS {{
+        is-cmd (FALSE),
+        has-secondary (TRUE),
+        apid ({index % 2048})
+      }})
+    }}),
+    value INTEGER(0..255)
+  }}
+"""
+        for index in range(count)
+    )
+    return (
+        "Module-bench-packets DEFINITIONS AUTOMATIC TAGS ::= BEGIN\n\n"
+        "  IMPORTS Primary-header-t FROM Module-bench-header;\n"
+        f"{packets}\nEND\n"
+    )
+
+
+def main() -> None:
+    print(f"{'packets':>8} {'validation [s]':>15}")
+    for count in PACKET_COUNTS:
+        modules = Asn1Parser.parse_from_text_multimodule(
+            [packets_module(count), HEADER_MODULE], use_fast_parser=True
+        )
+        bundle = ASN1BundleBuilder.build(modules)
+        start = time.perf_counter()
+        ASN1BundleValidator.validate_bundle(bundle)
+        elapsed = time.perf_counter() - start
+        print(f"{count:>8} {elapsed:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
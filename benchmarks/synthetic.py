@@ -0,0 +1,52 @@
+"""
+Generators of synthetic ASN.1 modules used by the benchmarks.
+"""
+from typing import List
+
+
+def module_name(index: int) -> str:
+    return f"bench-module-{index}"
+
+
+def synthetic_module(index: int, fields: int = 8) -> str:
+    """
+    Returns the text of one module. Every module but the first imports the
+    payload of the previous one, so that a list of modules forms a chain.
+    """
+    imports = ""
+    previous_payload = ""
+    if index > 0:
+        imports = (
+            f"  IMPORTS Payload-{index - 1}-t FROM "
+            f"Module-{module_name(index - 1)};\n\n"
+        )
+        previous_payload = f",\n    previous Payload-{index - 1}-t"
+
+    field_lines = "".join(
+        f"    field{field} Uint16-{index}-t, -- [m] field number {field}\n"
+        for field in range(fields)
+    )
+
+    return f"""Module-{module_name(index)} DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+{imports}  Uint16-{index}-t ::= INTEGER(0..65535)
+  Ratio-{index}-t ::= REAL(0.0 .. 1.0)
+
+  Mode-{index}-t ::= ENUMERATED {{
+    idle,
+    active,
+    safe
+  }}
+
+  Payload-{index}-t ::= SEQUENCE {{
+{field_lines}    mode Mode-{index}-t,
+    ratio Ratio-{index}-t,
+    enabled BOOLEAN{previous_payload}
+  }}
+
+END
+"""
+
+
+def synthetic_modules(count: int, fields: int = 8) -> List[str]:
+    return [synthetic_module(index, fields) for index in range(count)]
@@ -145,6 +145,24 @@ def test_integration(context, focus=None, debug=False):
     run_invoke_cmd(context, command)
 
 
+@task
+def benchmark(context, focus=None):
+    """
+    Run the benchmarks in benchmarks/, optionally only those whose file name
+    contains `focus`.
+    """
+    cwd = os.getcwd()
+    for benchmark_file in sorted(os.listdir(os.path.join(cwd, "benchmarks"))):
+        if not benchmark_file.startswith("bench_"):
+            continue
+        if focus and focus not in benchmark_file:
+            continue
+        run_invoke_cmd(
+            context,
+            f'python3 "{os.path.join(cwd, "benchmarks", benchmark_file)}"',
+        )
+
+
 @task
 def lint_black_diff(context):
     command = oneline_command(
@@ -165,7 +183,8 @@ def lint_black_diff(context):
 def lint_pylint(context):
     command = oneline_command(
         """
-        pylint --rcfile=.pylint.ini asn1_parser/ tests/unit/ tasks.py
+        pylint --rcfile=.pylint.ini
+            asn1_parser/ benchmarks/ tests/unit/ tasks.py
         """
     )
     try:
@@ -194,7 +213,7 @@ def lint_flake8(context):
 def lint_mypy(context):
     command = oneline_command(
         """
-        mypy asn1_parser/
+        mypy asn1_parser/ benchmarks/
             --show-error-codes
             --disable-error-code=import
             --enable-error-code=misc
@@ -0,0 +1,10 @@
+#ifndef ASN1_PARSER_SANDBOX_HK_PC_MSGIDS_H_INCLUDED
+#define ASN1_PARSER_SANDBOX_HK_PC_MSGIDS_H_INCLUDED
+
+/*
+This file was autogenerated from ASN.1 model.
+*/
+
+#define SANDBOX_HK_PC_MID (0x0899)
+
+#endif // ASN1_PARSER_SANDBOX_HK_PC_MSGIDS_H_INCLUDED
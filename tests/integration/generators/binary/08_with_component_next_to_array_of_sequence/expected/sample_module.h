@@ -0,0 +1,28 @@
+#ifndef ASN1_PARSER_SAMPLE_MODULE_H_INCLUDED
+#define ASN1_PARSER_SAMPLE_MODULE_H_INCLUDED
+
+/*
+This file was autogenerated from ASN.1 model.
+*/
+
+#include <stdint.h>
+
+typedef struct
+{
+  uint8_t inner_a;
+  uint16_t inner_b;
+} __attribute__((packed)) Inner;
+
+typedef struct
+{
+  // 32 bit
+  uint32_t number_1;
+  Inner items[2];
+} __attribute__((packed)) With_component_packet;
+
+typedef struct
+{
+  With_component_packet sample_packet_with_component;
+} __attribute__((packed)) Sample_packet;
+
+#endif // ASN1_PARSER_SAMPLE_MODULE_H_INCLUDED
@@ -0,0 +1,9 @@
+#include "sample_module.h"
+
+_Static_assert(sizeof(Inner) == 3, "Inner is packed");
+_Static_assert(sizeof(With_component_packet) == 4 + 2 * 3,
+               "the elements of items follow each other");
+
+int main() {
+  return 0;
+}
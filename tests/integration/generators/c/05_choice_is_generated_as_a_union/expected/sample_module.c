@@ -0,0 +1,4 @@
+/*
+This file was autogenerated from ASN.1 model.
+*/
+
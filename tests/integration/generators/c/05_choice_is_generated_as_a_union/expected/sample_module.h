@@ -0,0 +1,28 @@
+#ifndef ASN1_PARSER_SAMPLE_MODULE_H_INCLUDED
+#define ASN1_PARSER_SAMPLE_MODULE_H_INCLUDED
+
+/*
+This file was autogenerated from ASN.1 model.
+*/
+
+#include <stdint.h>
+
+// NOTE: Uint8-t is embedded directly where it is used. Rationale: Bitfields cannot be typedef'd.
+
+typedef struct
+{
+  // [m] horizontal position
+  uint16_t x : 10;
+  // [m] vertical position
+  uint16_t y : 10;
+} __attribute__((packed)) Position_t;
+
+/* command sent to the rover */
+union Command_t {
+  BOOLEAN stop;     // 1: stop now, 0: stop at the next waypoint
+  Uint8_t speed;     // [cm/s] target speed
+  Position_t target;
+  REAL heading;     // [deg] heading
+} command_t;
+
+#endif // ASN1_PARSER_SAMPLE_MODULE_H_INCLUDED
@@ -0,0 +1,159 @@
+import ast
+import enum
+import glob
+import os
+
+import pytest
+
+from asn1_parser.asn1 import fast_parser
+from asn1_parser.asn1.fast_parser import FastParser, FastParserError
+from asn1_parser.asn1.parser import Asn1Parser
+
+
+ROOT_PATH = os.path.abspath(os.path.join(__file__, "../../../../.."))
+
+INPUT_ASN = """
+Module-test-fast-parser DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Food-t ::= ENUMERATED {
+    carrot,
+    apple
+  }
+
+END
+""".lstrip()
+
+
+def _collect_inputs():
+    """
+    Returns every module of the test suites: the .asn files of the
+    integration tests and the modules embedded in the unit tests.
+    """
+    inputs = []
+    asn_pattern = os.path.join(ROOT_PATH, "tests", "integration", "**", "*.asn")
+    for path in sorted(glob.glob(asn_pattern, recursive=True)):
+        with open(path, "r", encoding="utf8") as asn_file:
+            inputs.append(
+                pytest.param(
+                    asn_file.read(), id=os.path.relpath(path, ROOT_PATH)
+                )
+            )
+
+    test_pattern = os.path.join(ROOT_PATH, "tests", "unit", "**", "*.py")
+    for path in sorted(glob.glob(test_pattern, recursive=True)):
+        with open(path, "r", encoding="utf8") as test_file:
+            tree = ast.parse(test_file.read())
+        strings = [
+            node.s
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Str)
+            and "DEFINITIONS AUTOMATIC TAGS" in node.s
+        ]
+        for index, string in enumerate(strings):
+            inputs.append(
+                pytest.param(
+                    string.lstrip(),
+                    id=f"{os.path.relpath(path, ROOT_PATH)}[{index}]",
+                )
+            )
+    return inputs
+
+
+def _dump(value):
+    # the state of the grammar elements, without textX's bookkeeping
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    if isinstance(value, enum.Enum):
+        return repr(value)
+    if not value.__class__.__module__.startswith("asn1_parser."):
+        return (type(value).__name__, value)
+    names = list(getattr(value, "__dict__", {}))
+    for cls in type(value).__mro__:
+        names.extend(getattr(cls, "__slots__", ()))
+    return (
+        type(value).__name__,
+        {
+            name: (
+                type(getattr(value, name)).__name__
+                if name == "_parent"
+                else _dump(getattr(value, name))
+            )
+            for name in sorted(names)
+            if name.startswith("_") and not name.startswith("_tx_")
+        },
+    )
+
+
+def _parse(input_text, use_fast_parser):
+    try:
+        return _dump(
+            Asn1Parser.parse_from_text(
+                input_text, is_multimodule=True, use_fast_parser=use_fast_parser
+            )
+        )
+    except Exception as exception:  # pylint: disable=broad-except
+        return (type(exception).__name__, str(exception))
+
+
+@pytest.mark.parametrize("input_text", _collect_inputs())
+def test_fast_parser_matches_textx(input_text):
+    assert _parse(input_text, True) == _parse(input_text, False)
+
+
+def test_fast_parser_handles_valid_modules():
+    module = FastParser(INPUT_ASN).parse()
+
+    assert module.get_module_name() == "test-fast-parser"
+    enum_items = module.get_definitions()[0].get_enum()
+    assert [item.get_key() for item in enum_items] == ["carrot", "apple"]
+
+
+@pytest.mark.parametrize(
+    "input_text",
+    [
+        INPUT_ASN + "trailing",
+        INPUT_ASN.replace("Food-t ::= ENUMERATED", "Food-t ::=  ENUMERATED"),
+        INPUT_ASN.replace("carrot,", "carrot"),
+    ],
+)
+def test_fast_parser_rejects_invalid_modules(input_text):
+    with pytest.raises(FastParserError):
+        FastParser(input_text).parse()
+
+
+def test_rejected_modules_fall_back_to_textx():
+    # textX reports the error itself
+    textx_error = _parse(INPUT_ASN + "trailing", False)
+
+    assert textx_error[0] == "TextXSyntaxError"
+    assert _parse(INPUT_ASN + "trailing", True) == textx_error
+
+
+def test_processors_run_on_fast_parser_modules():
+    # without positions, check_enumerated numbers the items
+    module = Asn1Parser.parse_from_text(INPUT_ASN, use_fast_parser=True)
+
+    enum_items = module.get_definitions()[0].get_enum()
+    assert [item.get_pos() for item in enum_items] == [0, 1]
+
+
+def test_fast_parser_modules_do_not_build_the_metamodel(monkeypatch):
+    monkeypatch.setattr(Asn1Parser, "_meta_model", None)
+
+    Asn1Parser.parse_from_text(INPUT_ASN, use_fast_parser=True)
+
+    # pylint: disable=protected-access
+    assert Asn1Parser._meta_model is None
+
+
+def test_backtracking_does_not_keep_frames_alive():
+    FastParser(INPUT_ASN).parse()
+
+    # pylint: disable=protected-access
+    traceback = fast_parser._NO_MATCH.__traceback__
+    depth = 0
+    while traceback is not None:
+        traceback = traceback.tb_next
+        depth += 1
+    # the frames of the last failed alternative only, not of all of them
+    assert depth < 10
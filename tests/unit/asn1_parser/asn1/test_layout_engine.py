@@ -0,0 +1,134 @@
+import pytest
+
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.utils.size import TypeEnum
+
+
+INPUT_ASN = """
+Module-test-layout DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Uint16-t ::= INTEGER(0..65535)
+
+  Mode-t ::= ENUMERATED {
+    off,
+    on,
+    safe
+  }
+
+  Header-t ::= SEQUENCE {
+    id INTEGER(0..255),
+    length Uint16-t -- ENDIANNESS(LITTLE) [B] payload length
+  }
+
+  Payload-t ::= SEQUENCE {
+    header Header-t,
+    mode Mode-t,
+    enabled BOOLEAN,
+    samples SEQUENCE (SIZE (3)) OF INTEGER(-128..127),
+    temperature REAL(-50.00 .. 150.00)
+  }
+
+  Any-t ::= CHOICE {
+    payload Payload-t,
+    header Header-t
+  }
+
+  Packet-t ::= SEQUENCE {
+    any Any-t
+  }
+
+  Log-t ::= SEQUENCE {
+    count INTEGER(0..255),
+    headers SEQUENCE (SIZE (2)) OF Header-t,
+    mode Mode-t
+  }
+
+END
+""".lstrip()
+
+
+@pytest.fixture(name="bundle")
+def fixture_bundle():
+    return ASN1BundleBuilder.build_from_texts([INPUT_ASN])
+
+
+def test_nested_sequences_are_flattened(bundle):
+    layout = bundle.get_layout("Payload-t")
+
+    assert [
+        (
+            field.get_path(),
+            field.get_bit_offset(),
+            field.get_bit_width(),
+            field.get_c_type(),
+        )
+        for field in layout.get_fields()
+    ] == [
+        (("header", "id"), 0, 8, TypeEnum.A_UINT),
+        (("header", "length"), 8, 16, TypeEnum.A_UINT),
+        (("mode",), 24, 2, TypeEnum.A_UINT),
+        (("enabled",), 26, 1, TypeEnum.A_BOOL),
+        (("samples",), 27, 8, TypeEnum.A_INT),
+        (("temperature",), 51, 32, TypeEnum.A_FLOAT),
+    ]
+    assert layout.get_size_bits() == 83
+    assert layout.get_size_bytes() == 11
+    assert layout.get_padding_bits() == 5
+
+
+def test_fields_are_found_by_path(bundle):
+    layout = bundle.get_layout("Payload-t")
+
+    length = layout.get_field(("header", "length"))
+    assert length.get_byte_offset() == 1
+    assert length.get_field().get_key() == "length"
+    assert length.is_little_endian() is True
+    assert layout.get_field(("header", "id")).is_little_endian() is None
+    assert layout.get_field(("header",)) is None
+
+    samples = layout.get_field(("samples",))
+    assert samples.is_array()
+    assert samples.get_array_length() == 3
+    assert samples.get_size_bits() == 24
+
+    mode = layout.get_field(("mode",))
+    assert mode.get_states() == ["off", "on", "safe"]
+    assert (mode.get_begin(), mode.get_end()) == (0, 2)
+
+
+def test_arrays_of_sequence_repeat_the_layout_of_their_element(bundle):
+    layout = bundle.get_layout("Log-t")
+
+    assert [
+        (field.get_path(), field.get_bit_offset(), field.get_repetitions())
+        for field in layout.get_fields()
+    ] == [
+        (("count",), 0, 1),
+        (("headers", "id"), 8, 2),
+        (("headers", "length"), 16, 2),
+        (("mode",), 56, 1),
+    ]
+    assert not layout.get_field(("headers", "id")).is_array()
+    assert layout.get_size_bits() == 58
+
+
+def test_layouts_are_computed_once(bundle):
+    layout = bundle.get_layout("Payload-t")
+
+    assert bundle.get_layout("Payload-t") is layout
+    # the nested layout was computed on the way
+    header = bundle.get_layout("Header-t")
+    assert header.get_fields()[1].get_bit_offset() == 8
+    assert bundle.get_layout("Header-t") is header
+
+
+def test_layout_of_unsupported_types_is_reported(bundle):
+    with pytest.raises(ValueError) as value_error:
+        bundle.get_layout("Any-t")
+    assert str(value_error.value) == "'Any-t' is not a SEQUENCE"
+
+    with pytest.raises(NotImplementedError) as not_implemented:
+        bundle.get_layout("Packet-t")
+    assert str(not_implemented.value) == (
+        "'any' in 'Packet-t': CHOICE has no layout yet"
+    )
@@ -0,0 +1,126 @@
+import gc
+import tracemalloc
+
+from asn1_parser.asn1.fast_parser import FastParser
+from asn1_parser.asn1.module_compactor import ModuleCompactor
+from asn1_parser.asn1.parser import Asn1Parser
+
+
+INPUT_ASN = """
+Module-test-compactor DEFINITIONS AUTOMATIC TAGS ::= BEGIN -- header
+
+  IMPORTS Uint8-t FROM Module-posix;
+
+  Payload-t ::= SEQUENCE {
+    first Uint8-t, -- [m] first field
+    second Uint8-t,
+    third INTEGER(0..255),
+    fourth INTEGER(0..255),
+    fifth SEQUENCE (SIZE (2)) OF Uint8-t
+  }
+
+  Any-t ::= CHOICE {
+    byte Uint8-t,
+    other Uint8-t
+  }
+
+END
+""".lstrip()
+
+
+def _schema(fields_count, fields_per_sequence=500):
+    sequences = []
+    for sequence_index in range(fields_count // fields_per_sequence):
+        fields = "\n".join(
+            f"    field{index} Uint8-t, -- [m] field {index}"
+            for index in range(fields_per_sequence - 1)
+        )
+        fields += f"\n    field{fields_per_sequence - 1} Uint8-t"
+        sequences.append(
+            f"  Payload{sequence_index}-t ::= SEQUENCE {{\n{fields}\n  }}\n"
+        )
+    return (
+        "Module-test-compactor DEFINITIONS AUTOMATIC TAGS ::= BEGIN\n"
+        "  IMPORTS Uint8-t FROM Module-posix;\n"
+        + "\n".join(sequences)
+        + "END\n"
+    )
+
+
+def _traced_size():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _measure_compaction(parse, input_text):
+    tracemalloc.start()
+    try:
+        baseline = _traced_size()
+        module = parse(input_text)
+        parsed_size = _traced_size() - baseline
+        ModuleCompactor.compact(module)
+        compacted_size = _traced_size() - baseline
+    finally:
+        tracemalloc.stop()
+    return module, parsed_size, compacted_size
+
+
+def test_compaction_reduces_memory_of_large_schema():
+    # the fast parser leaves no textX bookkeeping: what is saved here is the
+    # shared types and the interned names
+    module, parsed_size, compacted_size = _measure_compaction(
+        lambda input_text: FastParser(input_text).parse(), _schema(50000)
+    )
+
+    assert len(module.get_definitions()) == 100
+    assert compacted_size < parsed_size * 0.6
+
+
+def test_compaction_reduces_memory_of_textx_modules():
+    module, parsed_size, compacted_size = _measure_compaction(
+        Asn1Parser.get_meta_model().model_from_str, _schema(2000)
+    )
+
+    assert len(module.get_definitions()) == 4
+    assert compacted_size < parsed_size / 5
+
+
+def test_textx_bookkeeping_is_dropped():
+    module = Asn1Parser.get_meta_model().model_from_str(INPUT_ASN)
+    assert any(name.startswith("_tx_") for name in vars(module))
+
+    ModuleCompactor.compact(module)
+
+    sequence = module.get_definitions()[0]
+    for model_object in (module, sequence):
+        assert all(
+            name.startswith("_") and not name.startswith("_tx_")
+            for name in vars(model_object)
+        )
+    assert sequence.get_children()[0].get_comment().get_parent() is None
+
+
+def test_identical_types_are_shared():
+    module = Asn1Parser.parse_from_text(INPUT_ASN, is_multimodule=True)
+
+    sequence, choice = module.get_definitions()
+    first, second, third, fourth, fifth = [
+        member.get_asn_type() for member in sequence.get_children()
+    ]
+    byte, other = [member.get_asn_type() for member in choice.get_children()]
+    assert first is second
+    assert third is fourth
+    assert first is not third
+    assert fifth.get_type() is not None and fifth is not first
+    assert byte is other
+    assert byte is first
+
+
+def test_names_are_interned():
+    first = Asn1Parser.parse_from_text(INPUT_ASN, is_multimodule=True)
+    second = Asn1Parser.parse_from_text(INPUT_ASN, is_multimodule=True)
+
+    first_member = first.get_definitions()[0].get_children()[0]
+    second_member = second.get_definitions()[0].get_children()[0]
+    assert first_member.get_key() is second_member.get_key()
+    assert first.get_module_name() is second.get_module_name()
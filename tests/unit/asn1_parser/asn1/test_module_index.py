@@ -0,0 +1,116 @@
+import os
+
+import pytest
+from textx.exceptions import TextXSyntaxError
+
+from asn1_parser.asn1.module_index import ModuleIndex
+from asn1_parser.asn1.parser import Asn1Parser
+
+
+def _module_text(name, imported_name=None):
+    imports = ""
+    if imported_name is not None:
+        imports = (
+            f"  IMPORTS Type-{imported_name} FROM Module-{imported_name};\n"
+        )
+    return f"""Module-{name} DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+{imports}
+  Type-{name} ::= INTEGER(0..255)
+
+END
+"""
+
+
+def _write_module(directory, file_name, text):
+    path = directory / file_name
+    path.write_text(text)
+    return str(path)
+
+
+def _recording_parser(parsed_paths):
+    def parse_files(file_paths):
+        parsed_paths.extend(file_paths)
+        return Asn1Parser.parse_from_files(*file_paths)
+
+    return parse_files
+
+
+def test_folders_are_expanded_to_their_asn_files(tmp_path):
+    _write_module(tmp_path, "b.asn", _module_text("b"))
+    _write_module(tmp_path, "a.asn", _module_text("a"))
+    _write_module(tmp_path, "notes.txt", "not a module")
+
+    module_index = ModuleIndex([str(tmp_path)])
+
+    assert module_index.get_file_paths() == [
+        str(tmp_path / "a.asn"),
+        str(tmp_path / "b.asn"),
+    ]
+    assert module_index.get_module_name(str(tmp_path / "b.asn")) == "b"
+
+
+def test_only_reachable_modules_are_parsed(tmp_path):
+    paths = [
+        _write_module(tmp_path, "a.asn", _module_text("a")),
+        _write_module(tmp_path, "b.asn", _module_text("b", "a")),
+        _write_module(tmp_path, "c.asn", _module_text("c", "b")),
+        _write_module(tmp_path, "unrelated.asn", _module_text("unrelated")),
+    ]
+    parsed_paths = []
+
+    modules = ModuleIndex(paths).load_reachable_modules(
+        ["b"], _recording_parser(parsed_paths)
+    )
+
+    assert [module.get_module_name() for module in modules] == ["a", "b"]
+    assert parsed_paths == [paths[1], paths[0]]
+
+
+def test_files_without_header_are_always_parsed(tmp_path):
+    paths = [
+        _write_module(tmp_path, "a.asn", _module_text("a")),
+        _write_module(tmp_path, "broken.asn", "Module-broken DEFINITIONS"),
+        _write_module(tmp_path, "garbage.asn", "garbage"),
+    ]
+    parsed_paths = []
+
+    with pytest.raises(TextXSyntaxError):
+        ModuleIndex(paths).load_reachable_modules(
+            ["a"], _recording_parser(parsed_paths)
+        )
+
+    assert parsed_paths == [paths[2], paths[0]]
+
+
+def test_unknown_root_module_parses_every_file(tmp_path):
+    paths = [
+        _write_module(tmp_path, "a.asn", _module_text("a")),
+        _write_module(tmp_path, "b.asn", _module_text("b")),
+    ]
+    parsed_paths = []
+
+    ModuleIndex(paths).load_reachable_modules(
+        ["missing"], _recording_parser(parsed_paths)
+    )
+
+    assert parsed_paths == paths
+
+
+def test_index_file_is_reused_until_files_change(tmp_path):
+    paths = [
+        _write_module(tmp_path, "a.asn", _module_text("a")),
+        _write_module(tmp_path, "b.asn", _module_text("b")),
+    ]
+    index_path = str(tmp_path / "cache" / "module-index.json")
+
+    cold = ModuleIndex(paths, index_path)
+    warm = ModuleIndex(paths, index_path)
+    _write_module(tmp_path, "b.asn", _module_text("renamed"))
+    stat = os.stat(paths[1])
+    os.utime(paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    edited = ModuleIndex(paths, index_path)
+
+    assert cold.get_scanned_count() == 2
+    assert warm.get_scanned_count() == 0
+    assert edited.get_scanned_count() == 1
+    assert edited.get_module_name(paths[1]) == "renamed"
@@ -0,0 +1,89 @@
+import os
+
+from asn1_parser.asn1.parse_cache import ParseCache
+
+
+INPUT_ASN = """
+Module-test-cache DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Food-t ::= ENUMERATED {
+    carrot,
+    apple
+  }
+
+END
+""".lstrip()
+
+
+def _write_modules(directory, count):
+    paths = []
+    for index in range(count):
+        path = directory / f"module_{index}.asn"
+        path.write_text(INPUT_ASN.replace("test-cache", f"test-cache-{index}"))
+        paths.append(str(path))
+    return paths
+
+
+def _cache_entries(cache_dir):
+    return sorted(
+        entry for entry in os.listdir(cache_dir) if entry.endswith(".pickle")
+    )
+
+
+def test_unchanged_files_are_loaded_from_cache(tmp_path):
+    paths = _write_modules(tmp_path, 3)
+    cache_dir = str(tmp_path / "cache")
+
+    cold_cache = ParseCache(cache_dir, 1024 * 1024)
+    cold = cold_cache.parse_from_files(*paths)
+    warm_cache = ParseCache(cache_dir, 1024 * 1024)
+    warm = warm_cache.parse_from_files(*paths)
+
+    assert (cold_cache.get_hits(), cold_cache.get_misses()) == (0, 3)
+    assert (warm_cache.get_hits(), warm_cache.get_misses()) == (3, 0)
+    assert [module.get_module_name() for module in warm] == [
+        module.get_module_name() for module in cold
+    ]
+    assert warm[1].get_definitions()[0].get_states() == ["carrot", "apple"]
+
+
+def test_only_edited_files_are_parsed_again(tmp_path):
+    paths = _write_modules(tmp_path, 3)
+    cache_dir = str(tmp_path / "cache")
+    ParseCache(cache_dir, 1024 * 1024).parse_from_files(*paths)
+
+    with open(paths[1], "a", encoding="utf8") as edited_file:
+        edited_file.write("\n")
+    parse_cache = ParseCache(cache_dir, 1024 * 1024)
+    parse_cache.parse_from_files(*paths, jobs=2)
+
+    assert (parse_cache.get_hits(), parse_cache.get_misses()) == (2, 1)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    paths = _write_modules(tmp_path, 3)
+    cache_dir = str(tmp_path / "cache")
+    ParseCache(cache_dir, 1024 * 1024).parse_from_files(*paths)
+    entries = _cache_entries(cache_dir)
+    entry_size = os.path.getsize(os.path.join(cache_dir, entries[0]))
+    for age, entry in enumerate(entries):
+        os.utime(os.path.join(cache_dir, entry), (age, age))
+
+    ParseCache(cache_dir, 2 * entry_size + entry_size // 2).evict()
+
+    assert _cache_entries(cache_dir) == entries[1:]
+
+
+def test_unreadable_entry_is_parsed_again(tmp_path):
+    paths = _write_modules(tmp_path, 1)
+    cache_dir = str(tmp_path / "cache")
+    ParseCache(cache_dir, 1024 * 1024).parse_from_files(*paths)
+    entry = os.path.join(cache_dir, _cache_entries(cache_dir)[0])
+    with open(entry, "wb") as entry_file:
+        entry_file.write(b"truncated")
+
+    parse_cache = ParseCache(cache_dir, 1024 * 1024)
+    modules = parse_cache.parse_from_files(*paths)
+
+    assert parse_cache.get_misses() == 1
+    assert modules[0].get_module_name() == "test-cache-0"
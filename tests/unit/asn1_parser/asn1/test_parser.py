@@ -0,0 +1,153 @@
+import inspect
+
+import pytest
+from textx.exceptions import TextXSyntaxError
+
+from asn1_parser.asn1.parser import Asn1Parser
+from asn1_parser.asn1.validation.errors import ASN1ConsistencyError
+
+
+INPUT_ASN = """
+Module-test-parser DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Food-t ::= ENUMERATED {
+    carrot,
+    apple
+  }
+
+END
+""".lstrip()
+
+
+def test_meta_model_is_built_once():
+    meta_model = Asn1Parser.get_meta_model()
+
+    Asn1Parser.parse_from_text(INPUT_ASN)
+    Asn1Parser.parse_from_text_multimodule([INPUT_ASN, INPUT_ASN])
+
+    assert Asn1Parser.get_meta_model() is meta_model
+
+
+def test_cached_meta_model_parses_independent_modules():
+    modules = Asn1Parser.parse_from_text_multimodule(
+        [INPUT_ASN, INPUT_ASN.replace("test-parser", "test-parser-two")]
+    )
+    first, second = modules[0], modules[1]
+
+    assert first.get_module_name() == "test-parser"
+    assert second.get_module_name() == "test-parser-two"
+    assert first.get_definitions()[0] is not second.get_definitions()[0]
+
+
+def test_grammar_fingerprint_is_stable():
+    fingerprint = Asn1Parser.get_grammar_fingerprint()
+
+    assert len(fingerprint) == 64
+    assert Asn1Parser.get_grammar_fingerprint() == fingerprint
+
+
+UNDEFINED_TYPES_ASN = """
+Module-test-undefined DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Packet-t ::= SEQUENCE {
+    first Unknown-t,
+    second Missing-t
+  }
+
+END
+""".lstrip()
+
+
+@pytest.mark.parametrize("use_fast_parser", [False, True])
+def test_module_checks_raise_their_first_error(use_fast_parser):
+    with pytest.raises(ASN1ConsistencyError, match="Unknown-t") as error:
+        Asn1Parser.parse_from_text(
+            UNDEFINED_TYPES_ASN, use_fast_parser=use_fast_parser
+        )
+
+    assert error.value.field_path == ("first",)
+
+
+@pytest.mark.parametrize("use_fast_parser", [False, True])
+def test_module_checks_collect_every_error(use_fast_parser):
+    errors = []
+    module = Asn1Parser.parse_from_text(
+        UNDEFINED_TYPES_ASN, use_fast_parser=use_fast_parser, errors=errors
+    )
+
+    assert module.get_module_name() == "test-undefined"
+    assert [(error.definition_name, error.field_path) for error in errors] == [
+        ("Packet-t", ("first",)),
+        ("Packet-t", ("second",)),
+    ]
+
+
+def _write_modules(directory, texts):
+    paths = []
+    for index, text in enumerate(texts):
+        path = directory / f"module_{index}.asn"
+        path.write_text(text)
+        paths.append(str(path))
+    return paths
+
+
+def test_parallel_parse_keeps_input_order(tmp_path):
+    texts = [
+        INPUT_ASN.replace("test-parser", f"test-parser-{index}")
+        for index in range(6)
+    ]
+    paths = _write_modules(tmp_path, texts)
+
+    serial = Asn1Parser.parse_from_files(*paths)
+    parallel = Asn1Parser.parse_from_files(*paths, jobs=3)
+
+    assert [module.get_module_name() for module in parallel] == [
+        module.get_module_name() for module in serial
+    ]
+    assert parallel[0].get_definitions()[0].get_states() == [
+        "carrot",
+        "apple",
+    ]
+
+
+def test_parallel_parse_reports_first_error_in_input_order(tmp_path):
+    texts = [
+        INPUT_ASN,
+        INPUT_ASN.replace("carrot", "carrot(3)"),
+        INPUT_ASN.replace("Food-t", "food-t"),
+    ]
+    paths = _write_modules(tmp_path, texts)
+
+    with pytest.raises(IndexError) as serial_error:
+        Asn1Parser.parse_from_files(*paths)
+    with pytest.raises(IndexError) as parallel_error:
+        Asn1Parser.parse_from_files(*paths, jobs=3)
+
+    assert parallel_error.value.args == serial_error.value.args
+
+
+def test_parallel_parse_rebuilds_syntax_errors(tmp_path):
+    texts = [
+        INPUT_ASN.replace("Food-t", "food-t"),
+        INPUT_ASN.replace("carrot", "carrot(3)"),
+        INPUT_ASN,
+    ]
+    paths = _write_modules(tmp_path, texts)
+
+    with pytest.raises(TextXSyntaxError) as serial_error:
+        Asn1Parser.parse_from_files(*paths)
+    with pytest.raises(TextXSyntaxError) as parallel_error:
+        Asn1Parser.parse_from_files(*paths, jobs=3)
+
+    assert isinstance(parallel_error.value, type(serial_error.value))
+    assert str(parallel_error.value) == str(serial_error.value)
+    assert parallel_error.value.line == serial_error.value.line
+    assert parallel_error.value.col == serial_error.value.col
+
+
+def test_grammar_fingerprint_requires_processor_sources(monkeypatch):
+    monkeypatch.setattr(Asn1Parser, "_grammar_fingerprint", None)
+    monkeypatch.setattr(inspect, "getsourcefile", lambda module: None)
+
+    with pytest.raises(FileNotFoundError, match="no source file"):
+        Asn1Parser.get_grammar_fingerprint()
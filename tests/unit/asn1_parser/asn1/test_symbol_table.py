@@ -0,0 +1,89 @@
+import pytest
+
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.asn1.validation.asn1_bundle_validator import (
+    ASN1ConsistencyError,
+)
+
+
+INPUT_ASN = [
+    """
+Module-app DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Uint8-t FROM Module-posix
+          Percent, Load FROM Module-real;
+
+  Payload-t ::= SEQUENCE {
+    count Uint8-t,
+    cpu Percent,
+    load Load
+  }
+
+END
+""".lstrip(),
+    """
+Module-posix DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Uint8-t ::= INTEGER(0..255)
+
+END
+""".lstrip(),
+    """
+Module-real DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Percent ::= REAL(0.00 .. 100.00)
+  Load ::= REAL(0.00 .. 30.00)
+
+END
+""".lstrip(),
+]
+
+
+def test_symbol_table_of_bundle():
+    bundle = ASN1BundleBuilder.build_from_texts(INPUT_ASN)
+    symbol_table = bundle.get_symbol_table()
+
+    app, posix, real = bundle.get_modules()
+    assert bundle.get_module("app") is app
+    assert bundle.get_module("real") is real
+    assert bundle.get_module("missing") is None
+    assert symbol_table.get_definition("Percent") is real.get_definitions()[0]
+    assert symbol_table.get_defining_module("Uint8-t") is posix
+    assert symbol_table.get_definition("Missing-t") is None
+    assert list(symbol_table.get_module_definitions("real")) == [
+        "Percent",
+        "Load",
+    ]
+    assert symbol_table.get_imports("app") == {
+        "posix": {"Uint8-t"},
+        "real": {"Percent", "Load"},
+    }
+    assert symbol_table.get_imports("posix") == {}
+
+
+def test_fields_are_linked_through_symbol_table():
+    bundle = ASN1BundleBuilder.build_from_texts(INPUT_ASN)
+    symbol_table = bundle.get_symbol_table()
+
+    payload = symbol_table.get_definition("Payload-t")
+    assert [
+        member.get_asn_type().get_type() for member in payload.get_children()
+    ] == [
+        symbol_table.get_definition("Uint8-t"),
+        symbol_table.get_definition("Percent"),
+        symbol_table.get_definition("Load"),
+    ]
+
+
+def test_import_of_undefined_type_is_reported():
+    input_asn = [
+        INPUT_ASN[0].replace("Load FROM", "Load, Spare FROM"),
+        *INPUT_ASN[1:],
+    ]
+
+    with pytest.raises(ASN1ConsistencyError) as error:
+        ASN1BundleBuilder.build_from_texts(input_asn)
+
+    assert str(error.value) == (
+        "Error parsing 'app': Imports {'Spare'} From 'real' not found."
+    )
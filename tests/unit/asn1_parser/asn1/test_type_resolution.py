@@ -0,0 +1,87 @@
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.asn1.grammar_elements.key_type_pair import KeyTypePair
+
+
+INPUT_ASN = [
+    """
+Module-app DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Uint8-t FROM Module-posix;
+
+  Sample-t ::= SEQUENCE {
+    low Uint8-t,
+    high Uint8-t
+  }
+
+  Packet-t ::= SEQUENCE {
+    first Sample-t,
+    second Sample-t,
+    third Sample-t,
+    history SEQUENCE (SIZE (4)) OF Sample-t
+  }
+
+  Any-t ::= CHOICE {
+    sample Sample-t,
+    raw Uint8-t
+  }
+
+  Byte-t ::= Uint8-t
+
+END
+""".lstrip(),
+    """
+Module-posix DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Uint8-t ::= INTEGER(0..255)
+
+END
+""".lstrip(),
+]
+
+
+def test_every_type_reference_is_linked():
+    bundle = ASN1BundleBuilder.build_from_texts(INPUT_ASN)
+    symbol_table = bundle.get_symbol_table()
+    sample = symbol_table.get_definition("Sample-t")
+    uint8 = symbol_table.get_definition("Uint8-t")
+
+    packet = symbol_table.get_definition("Packet-t")
+    history = packet.get_children()[3].get_asn_type().get_type()
+    assert history.get_asn_type().get_type() is sample
+
+    choice_types = [
+        member.get_asn_type().get_type()
+        for member in symbol_table.get_definition("Any-t").get_children()
+    ]
+    assert choice_types == [sample, uint8]
+
+    byte = symbol_table.get_definition("Byte-t")
+    assert byte.get_asn_type().get_type() is uint8
+    assert byte.get_size_bits() == 8
+
+    assert uint8.get_asn_type().get_type() is None
+
+
+def test_sizes_are_computed_once_per_definition(monkeypatch):
+    bundle = ASN1BundleBuilder.build_from_texts(INPUT_ASN)
+    packet = bundle.get_symbol_table().get_definition("Packet-t")
+    sized_members = []
+    get_size_bits = KeyTypePair.get_size_bits
+
+    def counting_get_size_bits(member):
+        sized_members.append(member.get_key())
+        return get_size_bits(member)
+
+    monkeypatch.setattr(KeyTypePair, "get_size_bits", counting_get_size_bits)
+
+    assert packet.get_size_bits() == 3 * 16 + 4 * 8
+    assert packet.get_size_bits() == 3 * 16 + 4 * 8
+    # Sample-t is sized once, not once per field of its type
+    assert sized_members == [
+        "first",
+        "low",
+        "high",
+        "second",
+        "third",
+        "history",
+    ]
@@ -0,0 +1,34 @@
+import pickle
+
+from textx.exceptions import TextXSemanticError
+
+from asn1_parser.asn1.worker_error import WorkerError
+
+
+def _round_trip(exception):
+    return pickle.loads(pickle.dumps(WorkerError(exception))).get_exception()
+
+
+def test_textx_error_is_rebuilt():
+    error = TextXSemanticError("unknown type", line=3, col=7, filename="a")
+
+    rebuilt = _round_trip(error)
+
+    assert isinstance(rebuilt, TextXSemanticError)
+    assert str(rebuilt) == str(error)
+
+
+def test_picklable_exception_is_kept():
+    rebuilt = _round_trip(IndexError("list index out of range"))
+
+    assert isinstance(rebuilt, IndexError)
+    assert rebuilt.args == ("list index out of range",)
+
+
+def test_unpicklable_exception_becomes_runtime_error():
+    error = ValueError(lambda: None)
+
+    rebuilt = _round_trip(error)
+
+    assert isinstance(rebuilt, RuntimeError)
+    assert str(rebuilt).startswith("ValueError: ")
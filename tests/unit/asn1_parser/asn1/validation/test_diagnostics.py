@@ -0,0 +1,210 @@
+import json
+
+import pytest
+
+from asn1_parser.asn1.parse_cache import ParseCache
+from asn1_parser.asn1.validation.diagnostics import DiagnosticsCollector
+
+
+INPUT_FILES = {
+    "app.asn": """
+Module-app DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Uint8-t, Spare-t FROM Module-types;
+
+  Header-t ::= SEQUENCE {
+    id Uint8-t
+  }
+
+  Packet-t ::= SEQUENCE {
+    header Header-t (WITH COMPONENTS {version (1)})
+  }
+
+END
+""".lstrip(),
+    "types.asn": """
+Module-types DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Uint8-t ::= INTEGER(0..255)
+
+  Header-t ::= BOOLEAN
+
+END
+""".lstrip(),
+    "broken.asn": """
+Module-broken DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Broken-t ::= SEQUENCE {
+    id INTEGER(0..255)
+
+END
+""".lstrip(),
+    "undefined.asn": """
+Module-undefined DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Undefined-t ::= SEQUENCE {
+    id Unknown-t
+  }
+
+END
+""".lstrip(),
+    "orphan.asn": """
+Module-orphan DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Gone-t FROM Module-gone;
+
+  Orphan-t ::= SEQUENCE {
+    gone Gone-t
+  }
+
+END
+""".lstrip(),
+}
+
+
+@pytest.fixture(name="input_dir")
+def fixture_input_dir(tmp_path):
+    for file_name, input_text in INPUT_FILES.items():
+        (tmp_path / file_name).write_text(input_text)
+    return tmp_path
+
+
+def _report(diagnostics, input_dir):
+    return [
+        str(diagnostic).replace(f"{input_dir}/", "")
+        for diagnostic in diagnostics
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_every_error_is_collected(input_dir, jobs):
+    diagnostics = DiagnosticsCollector.collect([str(input_dir)], jobs=jobs)
+
+    assert _report(diagnostics, input_dir) == [
+        "app.asn:1: Error parsing 'app': Imports {'Spare-t'} From 'types' "
+        "not found.",
+        "app.asn:10: Packet-t: 'version' in 'Packet-t' is not a valid key",
+        "broken.asn:6:1: Expected ',' or '(WITH COMPONENTS {' or '}' at "
+        "position (6, 1) => '(0..255)  *END '.",
+        "orphan.asn:1: Module 'orphan' uses undeclared dependencies "
+        "{'gone'}",
+        "types.asn:5: Header-t: The type Header-t was already defined in "
+        "app and types",
+        "undefined.asn:4: Undefined-t: Type 'Unknown-t' used in 'undefined' "
+        "is not defined",
+    ]
+
+
+def test_valid_modules_have_no_diagnostics(input_dir):
+    diagnostics = DiagnosticsCollector.collect(
+        [str(input_dir / "types.asn")], jobs=2
+    )
+
+    assert not diagnostics
+
+
+def test_diagnostics_are_written_as_json(input_dir, tmp_path):
+    diagnostics = DiagnosticsCollector.collect(
+        [str(input_dir / "undefined.asn")]
+    )
+    DiagnosticsCollector.write_json(diagnostics, str(tmp_path / "out.json"))
+
+    with open(tmp_path / "out.json", encoding="utf8") as json_file:
+        assert json.load(json_file) == [
+            {
+                "file": str(input_dir / "undefined.asn"),
+                "line": 4,
+                "column": None,
+                "module": "undefined",
+                "definition": "Undefined-t",
+                "message": "Type 'Unknown-t' used in 'undefined' is not "
+                "defined",
+            }
+        ]
+
+
+def test_changed_files_scope_the_errors(input_dir):
+    diagnostics = DiagnosticsCollector.collect(
+        [str(input_dir)], changed_file_paths=[str(input_dir / "types.asn")]
+    )
+
+    # app.asn imports the module of types.asn
+    assert _report(diagnostics, input_dir) == [
+        "app.asn:1: Error parsing 'app': Imports {'Spare-t'} From 'types' "
+        "not found.",
+        "app.asn:10: Packet-t: 'version' in 'Packet-t' is not a valid key",
+        "types.asn:5: Header-t: The type Header-t was already defined in "
+        "app and types",
+    ]
+
+    assert not DiagnosticsCollector.collect(
+        [str(input_dir)], changed_file_paths=["README.md"]
+    )
+
+
+def test_cached_modules_have_the_same_diagnostics(input_dir, tmp_path):
+    expected = _report(
+        DiagnosticsCollector.collect([str(input_dir)]), input_dir
+    )
+
+    # broken.asn and undefined.asn do not parse
+    for hits in (0, 3):
+        parse_cache = ParseCache(str(tmp_path / "cache"), 1024 * 1024)
+        diagnostics = DiagnosticsCollector.collect(
+            [str(input_dir)], jobs=2, parse_cache=parse_cache
+        )
+        assert _report(diagnostics, input_dir) == expected
+        assert parse_cache.get_hits() == hits
+
+
+def test_every_error_of_a_module_is_located_at_its_field(tmp_path):
+    (tmp_path / "undefined.asn").write_text(
+        """
+Module-undefined DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Packet-t ::= SEQUENCE {
+    first Unknown-t,
+    id INTEGER(0..255),
+    second Missing-t
+  }
+
+  Status-t ::= CHOICE {
+    mode Mode-t
+  }
+
+END
+""".lstrip()
+    )
+    (tmp_path / "keys.asn").write_text(
+        """
+Module-keys DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Header-t ::= SEQUENCE {
+    id INTEGER(0..255),
+    flags INTEGER(0..255)
+  }
+
+  Packet-t ::= SEQUENCE {
+    header Header-t (WITH COMPONENTS {
+      version (1),
+      flags (2),
+      size (3)
+    })
+  }
+
+END
+""".lstrip()
+    )
+
+    diagnostics = DiagnosticsCollector.collect([str(tmp_path)], jobs=2)
+
+    assert _report(diagnostics, tmp_path) == [
+        "keys.asn:10: Packet-t: 'version' in 'Packet-t' is not a valid key",
+        "keys.asn:12: Packet-t: 'size' in 'Packet-t' is not a valid key",
+        "undefined.asn:4: Packet-t: Type 'Unknown-t' used in 'undefined' "
+        "is not defined",
+        "undefined.asn:6: Packet-t: Type 'Missing-t' used in 'undefined' "
+        "is not defined",
+        "undefined.asn:10: Status-t: Type 'Mode-t' used in 'undefined' "
+        "is not defined",
+    ]
@@ -0,0 +1,43 @@
+import pytest
+
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.asn1.validation.asn1_bundle_validator import (
+    ASN1ConsistencyError,
+)
+
+
+def test_import_cycle_is_rejected():
+    input_asn = [
+        """
+Module-ping DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Pong-t FROM Module-pong;
+
+  Ping-t ::= SEQUENCE {
+    pong Pong-t
+  }
+
+END
+""".lstrip(),
+        """
+Module-pong DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Ping-t FROM Module-ping;
+
+  Pong-t ::= INTEGER(0..255)
+
+  Echo-t ::= SEQUENCE {
+    ping Ping-t
+  }
+
+END
+""".lstrip(),
+    ]
+
+    with pytest.raises(ASN1ConsistencyError) as key_error:
+        ASN1BundleBuilder.build_from_texts(input_asn)
+
+    assert (
+        key_error.value.args[0]
+        == "Modules import each other: ping -> pong -> ping"
+    )
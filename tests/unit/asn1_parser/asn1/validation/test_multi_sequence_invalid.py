@@ -182,3 +182,46 @@ END
         key_error.value.args[0]
         == "'packet-type-is-cmd' in 'Sandbox-hk-pc-t' is not a valid key"
     )
+
+
+def test_sequence_defined_twice_with_components_not_found():
+    input_asn = [
+        """
+Module-packets DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Header-t FROM Module-header-a;
+
+  Packet-t ::= SEQUENCE {
+    header Header-t (WITH COMPONENTS {id (1)})
+  }
+
+END
+""".lstrip(),
+        """
+Module-header-a DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Header-t ::= SEQUENCE {
+    id INTEGER(0..255)
+  }
+
+END
+""".lstrip(),
+        """
+Module-header-b DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Header-t ::= SEQUENCE {
+    id INTEGER(0..255)
+  }
+
+END
+""".lstrip(),
+    ]
+
+    with pytest.raises(ASN1ConsistencyError) as key_error:
+        ASN1BundleBuilder.build_from_texts(input_asn)
+
+    # the WITH COMPONENTS cannot tell which definition it constrains
+    assert (
+        key_error.value.args[0]
+        == "used type 'Header-t' in 'Packet-t' is not defined"
+    )
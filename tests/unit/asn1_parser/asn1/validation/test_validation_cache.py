@@ -0,0 +1,102 @@
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.asn1.parser import Asn1Parser
+from asn1_parser.asn1.validation.asn1_bundle_validator import (
+    ASN1BundleValidator,
+)
+from asn1_parser.asn1.validation.validation_cache import ValidationCache
+
+
+TYPES_ASN = """
+Module-types DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Uint8-t ::= INTEGER(0..255)
+
+  Header-t ::= SEQUENCE {
+    id Uint8-t
+  }
+
+END
+"""
+
+APP_ASN = """
+Module-app DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Uint8-t, Header-t FROM Module-types;
+
+  Packet-t ::= SEQUENCE {
+    header Header-t (WITH COMPONENTS {id (1)}),
+    length Uint8-t
+  }
+
+END
+"""
+
+OTHER_ASN = """
+Module-other DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Other-t ::= BOOLEAN
+
+END
+"""
+
+
+def _validate(texts, cache_dir):
+    bundle = ASN1BundleBuilder.build(
+        Asn1Parser.parse_from_text_multimodule(texts)
+    )
+    validation_cache = ValidationCache.create_in_dir(str(cache_dir))
+    errors = ASN1BundleValidator.collect_errors(bundle, validation_cache)
+    return (
+        [str(error) for error in errors],
+        validation_cache.get_hits(),
+        validation_cache.get_misses(),
+    )
+
+
+def test_unchanged_modules_are_not_checked_again(tmp_path):
+    texts = [TYPES_ASN, APP_ASN, OTHER_ASN]
+
+    assert _validate(texts, tmp_path) == ([], 0, 3)
+    assert _validate(texts, tmp_path) == ([], 3, 0)
+
+
+def test_modules_importing_a_changed_module_are_checked_again(tmp_path):
+    _validate([TYPES_ASN, APP_ASN, OTHER_ASN], tmp_path)
+
+    types_asn = TYPES_ASN.replace("id Uint8-t", "version Uint8-t")
+    errors, hits, misses = _validate([types_asn, APP_ASN, OTHER_ASN], tmp_path)
+
+    assert errors == ["'id' in 'Packet-t' is not a valid key"]
+    assert (hits, misses) == (1, 2)
+
+
+def test_definitions_defined_twice_are_found_from_the_index(tmp_path):
+    texts = [TYPES_ASN, APP_ASN, OTHER_ASN]
+    _validate(texts, tmp_path)
+
+    other_asn = OTHER_ASN.replace("Other-t", "Header-t")
+    errors, _, misses = _validate([TYPES_ASN, APP_ASN, other_asn], tmp_path)
+    assert errors == [
+        "The type Header-t was already defined in types and other"
+    ]
+    # the WITH COMPONENTS of every module depend on the duplicates
+    assert misses == 3
+
+    assert _validate(texts, tmp_path)[:2] == ([], 3)
+
+
+def test_cached_errors_are_the_errors_of_a_full_check(tmp_path):
+    texts = [
+        TYPES_ASN.replace("id Uint8-t", "version Uint8-t"),
+        APP_ASN,
+        OTHER_ASN.replace("Other-t", "Header-t"),
+    ]
+    bundle = ASN1BundleBuilder.build(
+        Asn1Parser.parse_from_text_multimodule(texts)
+    )
+    expected = [
+        str(error) for error in ASN1BundleValidator.collect_errors(bundle)
+    ]
+
+    assert _validate(texts, tmp_path)[0] == expected
+    assert _validate(texts, tmp_path) == (expected, 3, 0)
@@ -0,0 +1,85 @@
+import json
+import os
+
+import pytest
+
+from asn1_parser.cli.cli_arg_parser import (
+    GenerateBinaryCommandConfig,
+    GenerateCFSCommandConfig,
+    GenerateCosmosCommandConfig,
+)
+from asn1_parser.cli.manifest import Manifest, ManifestError
+
+
+def _load(tmp_path, content):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps(content))
+    return Manifest.load(str(manifest_path), "root", fast_parser=False)
+
+
+def test_jobs_are_read_relative_to_the_manifest(tmp_path):
+    manifest = _load(
+        tmp_path,
+        {
+            "input_paths": ["asn1"],
+            "jobs": [
+                {"generator": "cfs", "asn1_modules": ["module"]},
+                {
+                    "generator": "binary",
+                    "asn1_modules": ["module"],
+                    "endianness": "big-endian",
+                    "output_dir": "bin",
+                },
+                {
+                    "generator": "cosmos",
+                    "asn1_module": "module",
+                    "asn1_messages": ["Packet"],
+                    "output_file_name": "packet",
+                    "output_archive": "cosmos.zip",
+                },
+            ],
+        },
+    )
+
+    input_paths = [os.path.join(tmp_path, "asn1")]
+    assert manifest.get_input_paths() == input_paths
+    cfs, binary, cosmos = manifest.get_job_configs()
+    assert isinstance(cfs, GenerateCFSCommandConfig)
+    assert cfs.input_paths == input_paths
+    assert cfs.output_dir == os.path.join(tmp_path, "output/cfs")
+    assert cfs.output_archive_path is None
+    assert isinstance(binary, GenerateBinaryCommandConfig)
+    assert binary.endianness == "big-endian"
+    assert binary.output_dir == os.path.join(tmp_path, "bin")
+    assert isinstance(cosmos, GenerateCosmosCommandConfig)
+    assert cosmos.asn1_modules == ["module"]
+    assert cosmos.output_archive_path == os.path.join(tmp_path, "cosmos.zip")
+
+
+@pytest.mark.parametrize(
+    "job, message",
+    [
+        ({"generator": "java"}, "'generator' must be one of"),
+        ({"generator": "c"}, "'asn1_modules' must be a list of strings"),
+        (
+            {"generator": "binary", "asn1_modules": ["module"]},
+            "'endianness' must be a string",
+        ),
+        (
+            {
+                "generator": "c",
+                "asn1_modules": ["module"],
+                "output_archive": "c.rar",
+            },
+            "'output_archive' must end with one of",
+        ),
+    ],
+)
+def test_invalid_jobs_are_reported(tmp_path, job, message):
+    with pytest.raises(ManifestError, match=r"jobs\[0\]: " + message):
+        _load(tmp_path, {"input_paths": ["asn1"], "jobs": [job]})
+
+
+def test_unreadable_manifests_are_reported(tmp_path):
+    with pytest.raises(ManifestError, match="cannot read the manifest"):
+        Manifest.load(str(tmp_path / "missing.json"), "root", False)
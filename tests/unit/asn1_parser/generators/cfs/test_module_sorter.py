@@ -0,0 +1,188 @@
+import time
+
+import pytest
+
+from asn1_parser.asn1.asn1_bundle import ASN1Bundle
+from asn1_parser.asn1.grammar_elements.asn1_module import Asn1Module
+from asn1_parser.asn1.grammar_elements.import_item import ImportItem
+from asn1_parser.asn1.parser import Asn1Parser
+from asn1_parser.asn1.validation.asn1_bundle_validator import (
+    ASN1ConsistencyError,
+)
+from asn1_parser.generators.cfs.module_sorter import ModuleSorter
+
+INPUT_ASN = """
+Module-test-sorter DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Uint8-t FROM Module-posix;
+
+  Packet-t ::= SEQUENCE {
+    header Header-t,
+    samples SEQUENCE (SIZE (4)) OF Sample-t
+  }
+
+  Sample-t ::= CHOICE {
+    raw Uint8-t,
+    mode Mode-t
+  }
+
+  Header-t ::= SEQUENCE {
+    length Uint8-t,
+    mode Mode-t
+  }
+
+  Mode-t ::= ENUMERATED {
+    idle,
+    busy
+  }
+
+  Flags-t ::= INTEGER(0..15)
+
+END
+""".lstrip()
+
+
+def _module(name, *imported_names):
+    import_items = [
+        ImportItem([], imported_name, None, None)
+        for imported_name in imported_names
+    ]
+    return Asn1Module(name, [], None, None, import_items)
+
+
+def _names(modules):
+    return [module.get_module_name() for module in modules]
+
+
+def test_modules_come_before_their_imports():
+    modules = [
+        _module("posix"),
+        _module("header", "posix"),
+        _module("app", "header", "posix", "missing"),
+        _module("other", "posix"),
+    ]
+
+    ordered = ModuleSorter.create_ordered_import_list(modules)
+
+    assert _names(ordered) == ["app", "other", "header", "posix"]
+
+
+def test_definitions_come_after_the_definitions_they_use():
+    module = Asn1Parser.parse_from_text(INPUT_ASN)
+
+    ordered = ModuleSorter.get_definitions_sorted_by_dependency(module)
+
+    # the passes over the definitions: Mode-t and Flags-t, then the
+    # definitions using Mode-t, then Packet-t
+    assert [definition.get_type_name() for definition in ordered] == [
+        "Mode-t",
+        "Flags-t",
+        "Sample-t",
+        "Header-t",
+        "Packet-t",
+    ]
+
+
+@pytest.mark.parametrize(
+    "replaced, replacement, cycle",
+    [
+        ("length Uint8-t", "inner Header-t", "Header-t -> Header-t"),
+        (
+            "raw Uint8-t",
+            "packet SEQUENCE (SIZE (2)) OF Packet-t",
+            "Packet-t -> Sample-t -> Packet-t",
+        ),
+    ],
+)
+def test_recursive_definitions_are_reported(replaced, replacement, cycle):
+    module = Asn1Parser.parse_from_text(
+        INPUT_ASN.replace(replaced, replacement)
+    )
+
+    with pytest.raises(ASN1ConsistencyError) as error:
+        ModuleSorter.get_definitions_sorted_by_dependency(module)
+
+    assert str(error.value) == (
+        f"Recursive definitions in 'test-sorter': {cycle}"
+    )
+
+
+def test_long_definition_chain_is_sorted_in_linear_time():
+    # each definition uses the next one: one per pass for the fixpoint loop
+    count = 5000
+    definitions = "".join(
+        f"  Type{index}-t ::= SEQUENCE {{\n    next Type{index + 1}-t\n  }}\n"
+        for index in range(count)
+    )
+    module = Asn1Parser.parse_from_text(
+        "Module-test-chain DEFINITIONS AUTOMATIC TAGS ::= BEGIN\n"
+        + definitions
+        + f"  Type{count}-t ::= INTEGER(0..255)\n"
+        + "END\n",
+        use_fast_parser=True,
+    )
+
+    start = time.perf_counter()
+    ordered = ModuleSorter.get_definitions_sorted_by_dependency(module)
+    elapsed = time.perf_counter() - start
+
+    assert [definition.get_type_name() for definition in ordered] == [
+        f"Type{index}-t" for index in reversed(range(count + 1))
+    ]
+    assert elapsed < 2
+
+
+@pytest.mark.parametrize(
+    "modules, cycle",
+    [
+        ([_module("a", "a")], "a -> a"),
+        (
+            [_module("a", "b"), _module("b", "c"), _module("c", "a")],
+            "a -> b -> c -> a",
+        ),
+        (
+            # c is left behind the cycle, without being on it
+            [_module("app", "a"), _module("a", "b"), _module("b", "a", "c")]
+            + [_module("c")],
+            "a -> b -> a",
+        ),
+    ],
+)
+def test_import_cycle_is_reported(modules, cycle):
+    with pytest.raises(ASN1ConsistencyError) as error:
+        ModuleSorter.create_ordered_import_list(modules)
+
+    assert str(error.value) == f"Modules import each other: {cycle}"
+
+
+def test_long_import_chain_is_ordered_in_linear_time():
+    count = 20000
+    modules = [_module("m0")] + [
+        _module(f"m{index}", f"m{index - 1}") for index in range(1, count)
+    ]
+
+    start = time.perf_counter()
+    ordered = ModuleSorter.create_ordered_import_list(modules)
+    elapsed = time.perf_counter() - start
+
+    assert _names(ordered) == [f"m{index}" for index in reversed(range(count))]
+    assert elapsed < 2
+
+
+def test_order_is_computed_once_per_bundle():
+    bundle = ASN1Bundle([_module("posix"), _module("app", "posix")], {})
+
+    ordered = bundle.get_modules_ordered()
+
+    assert _names(ordered) == ["app", "posix"]
+    assert bundle.get_modules_ordered() is ordered
+
+
+def test_definitions_order_is_computed_once_per_module():
+    module = Asn1Parser.parse_from_text(INPUT_ASN)
+    bundle = ASN1Bundle([module], {})
+
+    ordered = bundle.get_definitions_ordered(module)
+
+    assert ordered[0].get_type_name() == "Mode-t"
+    assert bundle.get_definitions_ordered(module) is ordered
@@ -0,0 +1,150 @@
+import os
+
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.cli.cli_arg_parser import (
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+)
+from asn1_parser.generators.binary.generator import BinaryGenerator
+from asn1_parser.generators.c.generator import CGenerator
+from asn1_parser.generators.generation_cache import GenerationCache
+from asn1_parser.output_sink import MemorySink
+
+
+HEADER_ASN = """
+Module-header DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Header-t ::= SEQUENCE {
+    id INTEGER(0..255),
+    length INTEGER(0..65535)
+  }
+
+  Unused-t ::= SEQUENCE {
+    value INTEGER(0..255)
+  }
+
+END
+"""
+
+PACKET_ASN = """
+Module-packet DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Header-t FROM Module-header;
+
+  Mode-t ::= ENUMERATED {
+    off,
+    on
+  }
+
+  Value-t ::= CHOICE {
+    mode Mode-t,
+    raw INTEGER(0..255)
+  }
+
+  Packet-t ::= SEQUENCE {
+    header Header-t (WITH COMPONENTS {id (7), length (3)}),
+    mode Mode-t
+  }
+
+END
+"""
+
+MODULE_NAMES = ["header", "packet"]
+DEFINITION_COUNT = 5
+
+
+def _generate_c(cache_dir, header_asn=HEADER_ASN, jobs=1):
+    """
+    Returns the generated files, and the hits and misses of the cache.
+    """
+    config = GenerateCCommandConfig(
+        "", [], MODULE_NAMES, "output", jobs=jobs, cache_dir=cache_dir
+    )
+    sink = MemorySink()
+    generator = CGenerator(
+        config,
+        ASN1BundleBuilder.build_from_texts([header_asn, PACKET_ASN], config),
+    )
+    generator.generate(sink)
+    return sink.get_files(), _get_counts(generator)
+
+
+def _get_counts(generator):
+    cache = generator.get_generation_cache()
+    if cache is None:
+        return None
+    return cache.get_hits(), cache.get_misses()
+
+
+def test_unchanged_definitions_are_taken_from_the_cache(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    outputs, _ = _generate_c(None)
+
+    assert _generate_c(cache_dir) == (outputs, (0, DEFINITION_COUNT))
+    assert _generate_c(cache_dir) == (outputs, (DEFINITION_COUNT, 0))
+
+
+def test_edited_definition_and_its_users_are_rendered_again(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    _generate_c(cache_dir)
+
+    # Packet-t uses Header-t, the other definitions are unchanged
+    header_asn = HEADER_ASN.replace("INTEGER(0..65535)", "INTEGER(0..4095)")
+    outputs, _ = _generate_c(None, header_asn)
+    assert _generate_c(cache_dir, header_asn) == (
+        outputs,
+        (DEFINITION_COUNT - 2, 2),
+    )
+
+    # nothing uses Unused-t
+    header_asn = header_asn.replace(
+        "INTEGER(0..255)\n  }", "INTEGER(0..1)\n  }"
+    )
+    _, counts = _generate_c(cache_dir, header_asn)
+    assert counts == (DEFINITION_COUNT - 1, 1)
+
+
+def test_fragments_rendered_by_workers_are_stored(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    outputs, counts = _generate_c(cache_dir, jobs=2)
+    assert counts == (0, DEFINITION_COUNT)
+
+    assert _generate_c(cache_dir) == (outputs, (DEFINITION_COUNT, 0))
+
+
+def test_each_endianness_has_its_own_fragments(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    outputs = {}
+    for endianness in ["big-endian", "little-endian"]:
+        config = GenerateBinaryCommandConfig(
+            "", [], MODULE_NAMES, "output", endianness, cache_dir=cache_dir
+        )
+        sink = MemorySink()
+        generator = BinaryGenerator(
+            config,
+            ASN1BundleBuilder.build_from_texts(
+                [HEADER_ASN, PACKET_ASN], config
+            ),
+        )
+        generator.generate(sink)
+        assert _get_counts(generator) == (0, DEFINITION_COUNT)
+        outputs[endianness] = sink.get_files()
+
+    assert outputs["big-endian"] != outputs["little-endian"]
+    assert sorted(
+        os.listdir(os.path.join(cache_dir, GenerationCache.DIR_NAME))
+    ) == [
+        "BinaryGenerator-big-endian.pickle",
+        "BinaryGenerator-little-endian.pickle",
+    ]
+
+
+def test_unreadable_cache_file_is_discarded(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    outputs, _ = _generate_c(cache_dir)
+    generation_dir = os.path.join(cache_dir, GenerationCache.DIR_NAME)
+    for file_name in os.listdir(generation_dir):
+        with open(os.path.join(generation_dir, file_name), "wb") as file:
+            file.write(b"truncated")
+
+    assert _generate_c(cache_dir) == (outputs, (0, DEFINITION_COUNT))
@@ -0,0 +1,127 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.cli.cli_arg_parser import (
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+    GenerateCFSCommandConfig,
+)
+from asn1_parser.generators.batch_generator import BatchGenerator
+from asn1_parser.generators.binary.generator import BinaryGenerator
+from asn1_parser.generators.c.generator import CGenerator
+from asn1_parser.generators.cfs.generator import CFSGenerator
+from asn1_parser.output_sink import MemorySink
+
+
+HEADER_ASN = """
+Module-header DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Uint16-t ::= INTEGER(0..65535)
+
+  Header-t ::= SEQUENCE {
+    id INTEGER(0..255),
+    length Uint16-t
+  }
+
+END
+"""
+
+
+def _packet_asn(index):
+    return f"""
+Module-packet-{index} DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Header-t, Uint16-t FROM Module-header;
+
+  Mode-{index}-t ::= ENUMERATED {{
+    off,
+    on
+  }}
+
+  Packet-{index}-t ::= SEQUENCE {{
+    header Header-t (WITH COMPONENTS {{id ({index}), length (3)}}),
+    mode Mode-{index}-t,
+    value Uint16-t
+  }}
+
+END
+"""
+
+
+MODULE_NAMES = ["header"] + [f"packet-{index}" for index in range(6)]
+
+
+@pytest.fixture(name="bundle")
+def fixture_bundle():
+    return ASN1BundleBuilder.build_from_texts(
+        [HEADER_ASN] + [_packet_asn(index) for index in range(6)]
+    )
+
+
+def _read_outputs(output_dir):
+    outputs = {}
+    for file_name in sorted(os.listdir(output_dir)):
+        with open(os.path.join(output_dir, file_name), "rb") as output_file:
+            outputs[file_name] = output_file.read()
+    return outputs
+
+
+@pytest.mark.parametrize(
+    "generate",
+    [
+        lambda output_dir, jobs, bundle: CFSGenerator(
+            GenerateCFSCommandConfig(
+                "", [], MODULE_NAMES, output_dir, jobs=jobs
+            ),
+            bundle,
+        ).generate(),
+        lambda output_dir, jobs, bundle: CGenerator(
+            GenerateCCommandConfig("", [], MODULE_NAMES, output_dir, jobs=jobs),
+            bundle,
+        ).generate(),
+        lambda output_dir, jobs, bundle: BinaryGenerator(
+            GenerateBinaryCommandConfig(
+                "", [], MODULE_NAMES, output_dir, "big-endian", jobs=jobs
+            ),
+            bundle,
+        ).generate(),
+    ],
+    ids=["cfs", "c", "binary"],
+)
+def test_parallel_generation_matches_serial_generation(
+    bundle, tmp_path, generate
+):
+    generate(str(tmp_path / "serial"), 1, bundle)
+    generate(str(tmp_path / "parallel"), 3, bundle)
+
+    serial_outputs = _read_outputs(str(tmp_path / "serial"))
+    assert len(serial_outputs) > len(MODULE_NAMES)
+    assert _read_outputs(str(tmp_path / "parallel")) == serial_outputs
+
+
+def test_generators_run_concurrently_in_threads(bundle):
+    configs = [
+        GenerateBinaryCommandConfig(
+            "", [], MODULE_NAMES, "output", "little-endian"
+        ),
+        GenerateBinaryCommandConfig(
+            "", [], MODULE_NAMES, "output", "big-endian"
+        ),
+        GenerateCFSCommandConfig("", [], MODULE_NAMES, "output"),
+        GenerateCCommandConfig("", [], MODULE_NAMES, "output"),
+    ]
+
+    def generate(config):
+        sink = MemorySink()
+        BatchGenerator.run_job(config, bundle, sink)
+        return sink.get_files()
+
+    serial_outputs = [generate(config) for config in configs] * 4
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outputs = list(executor.map(generate, configs * 4))
+
+    assert outputs == serial_outputs
+    assert outputs[0] != outputs[1]
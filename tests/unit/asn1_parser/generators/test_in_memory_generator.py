@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.cli.cli_arg_parser import (
+    GenerateBinaryCommandConfig,
+    GenerateCCommandConfig,
+    GenerateCFSCommandConfig,
+)
+from asn1_parser.generators.batch_generator import BatchGenerator
+from asn1_parser.generators.in_memory_generator import InMemoryGenerator
+
+
+HEADER_ASN = """
+Module-header DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Uint16-t ::= INTEGER(0..65535)
+
+  Header-t ::= SEQUENCE {
+    id INTEGER(0..255),
+    length Uint16-t
+  }
+
+END
+"""
+
+PACKET_ASN = """
+Module-packet DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Header-t, Uint16-t FROM Module-header;
+
+  Mode-t ::= ENUMERATED {
+    off,
+    on
+  }
+
+  Packet-t ::= SEQUENCE {
+    header Header-t (WITH COMPONENTS {id (7), length (3)}),
+    mode Mode-t,
+    value Uint16-t
+  }
+
+END
+"""
+
+MODULE_NAMES = ["header", "packet"]
+
+
+def _read_outputs(output_dir):
+    outputs = {}
+    for folder, _, file_names in os.walk(output_dir):
+        for file_name in file_names:
+            file_path = os.path.join(folder, file_name)
+            with open(file_path, "rb") as output_file:
+                outputs[
+                    os.path.relpath(file_path, output_dir)
+                ] = output_file.read()
+    return outputs
+
+
+@pytest.mark.parametrize(
+    "make_config",
+    [
+        lambda output_dir: GenerateCFSCommandConfig(
+            "", [], MODULE_NAMES, output_dir
+        ),
+        lambda output_dir: GenerateCCommandConfig(
+            "", [], MODULE_NAMES, output_dir
+        ),
+        lambda output_dir: GenerateBinaryCommandConfig(
+            "", [], MODULE_NAMES, output_dir, "big-endian"
+        ),
+    ],
+    ids=["cfs", "c", "binary"],
+)
+def test_in_memory_generation_matches_written_files(tmp_path, make_config):
+    in_memory_dir = str(tmp_path / "in-memory")
+    outputs = InMemoryGenerator.generate_from_texts(
+        make_config(in_memory_dir), [HEADER_ASN, PACKET_ASN]
+    )
+    assert not os.path.exists(in_memory_dir)
+
+    written_dir = str(tmp_path / "written")
+    config = make_config(written_dir)
+    BatchGenerator.run_job(
+        config,
+        ASN1BundleBuilder.build_from_texts([HEADER_ASN, PACKET_ASN], config),
+    )
+
+    assert len(outputs) > len(MODULE_NAMES)
+    assert outputs == _read_outputs(written_dir)
@@ -0,0 +1,74 @@
+from asn1_parser.c_emitter import CEmitter
+
+
+def test_structs_are_packed():
+    emitter = CEmitter()
+    emitter.write_line(CEmitter.comment("a packet"))
+    emitter.write_struct_typedef(
+        "Packet_t",
+        [
+            CEmitter.line_comment("[m] "),
+            CEmitter.declaration("uint8_t", "flag : 1"),
+            CEmitter.declaration("char", "name", 16),
+        ],
+    )
+
+    assert str(emitter) == (
+        "/* a packet */\n"
+        "typedef struct\n"
+        "{\n"
+        "  // [m]\n"
+        "  uint8_t flag : 1;\n"
+        "  char name[16];\n"
+        "} __attribute__((packed)) Packet_t;"
+    )
+
+
+def test_enums_and_unions_have_one_item_per_line():
+    emitter = CEmitter()
+    emitter.write_enum_typedef(
+        "Mode_t",
+        [
+            CEmitter.enumerator("idle", 0, "waiting"),
+            CEmitter.enumerator("on", 1),
+        ],
+    )
+    emitter.write_union(
+        "Value_t",
+        "value_t",
+        [CEmitter.member("uint8_t", "raw", ""), CEmitter.member("float", "f")],
+    )
+
+    assert str(emitter) == (
+        "typedef enum {\n"
+        "  idle = 0,     // waiting\n"
+        "  on = 1,\n"
+        "} __attribute__((packed)) Mode_t;\n"
+        "union Value_t {\n"
+        "  uint8_t raw;     //\n"
+        "  float f;\n"
+        "} value_t;"
+    )
+
+
+def test_designated_initializers_are_indented_by_level():
+    emitter = CEmitter()
+    emitter.write_line("Packet_t packet_t = {")
+    emitter.open_initializer("header", 1)
+    emitter.write_line(CEmitter.designator("id", "3"), 2)
+    emitter.close_initializer(1)
+    emitter.write_line("};")
+
+    assert str(emitter) == (
+        "Packet_t packet_t = {\n"
+        "  .header = {\n"
+        "    .id = 3,\n"
+        "  },\n"
+        "};"
+    )
+
+
+def test_preprocessor_lines():
+    assert CEmitter.include("stdint.h") == "#include <stdint.h>"
+    assert CEmitter.include("a.h", system=False) == '#include "a.h"'
+    assert CEmitter.define("A_MID", "(0x0801)") == "#define A_MID (0x0801)"
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+
+from asn1_parser.asn1.asn1_bundle_builder import ASN1BundleBuilder
+from asn1_parser.cli.cli_arg_parser import GenerateCCommandConfig
+from asn1_parser.dependency_sink import DependencySink, GeneratedOutput
+from asn1_parser.generators.c.generator import CGenerator
+from asn1_parser.output_sink import MemorySink
+
+
+HEADER_ASN = """
+Module-header DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  Header-t ::= SEQUENCE {
+    id INTEGER(0..255)
+  }
+
+END
+"""
+
+PACKET_ASN = """
+Module-packet DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+
+  IMPORTS Header-t FROM Module-header;
+
+  Packet-t ::= SEQUENCE {
+    header Header-t
+  }
+
+END
+"""
+
+
+def test_outputs_depend_on_the_modules_they_import(tmp_path):
+    header_path = tmp_path / "header.asn"
+    packet_path = tmp_path / "packet.asn"
+    header_path.write_text(HEADER_ASN)
+    packet_path.write_text(PACKET_ASN)
+    config = GenerateCCommandConfig(
+        "", [str(packet_path), str(header_path)], ["packet", "header"], "output"
+    )
+    memory_sink = MemorySink()
+    sink = DependencySink(memory_sink, "output")
+
+    CGenerator(config, ASN1BundleBuilder.build_from_c_config(config)).generate(
+        sink
+    )
+
+    inputs = {
+        output.get_path(): output.get_input_paths()
+        for output in sink.get_outputs()
+    }
+    assert inputs == {
+        "output/header.h": [str(header_path)],
+        "output/header.c": [str(header_path)],
+        "output/packet.h": [str(header_path), str(packet_path)],
+        "output/packet.c": [str(header_path), str(packet_path)],
+    }
+    for output in sink.get_outputs():
+        content = memory_sink.get_files()[
+            os.path.relpath(output.get_path(), "output")
+        ]
+        assert output.get_sha256() == hashlib.sha256(content).hexdigest()
+
+
+def test_depfile_escapes_the_paths(tmp_path):
+    depfile_path = str(tmp_path / "output.d")
+    outputs = [
+        GeneratedOutput("out/b.h", "0", ["my dir/b.asn"]),
+        GeneratedOutput("out/a$.h", "0", ["a#.asn", "b.asn"]),
+    ]
+
+    DependencySink.write_depfile(outputs, depfile_path)
+
+    with open(depfile_path, encoding="utf-8") as depfile:
+        assert depfile.read() == (
+            "out/a$$.h: a\\#.asn b.asn\n" "out/b.h: my\\ dir/b.asn\n"
+        )
+
+
+def test_manifest_lists_the_outputs_by_path(tmp_path):
+    manifest_path = str(tmp_path / "outputs.json")
+    outputs = [
+        GeneratedOutput("out/b.h", "2", ["b.asn"]),
+        GeneratedOutput("out/a.h", "1", []),
+    ]
+
+    DependencySink.write_manifest(outputs, manifest_path)
+
+    with open(manifest_path, encoding="utf-8") as manifest_file:
+        assert json.load(manifest_file) == {
+            "outputs": [
+                {"path": "out/a.h", "sha256": "1", "inputs": []},
+                {"path": "out/b.h", "sha256": "2", "inputs": ["b.asn"]},
+            ]
+        }
@@ -0,0 +1,191 @@
+import os
+import tarfile
+import threading
+import zipfile
+
+import pytest
+
+from asn1_parser.output_sink import (
+    ArchiveSink,
+    BackgroundSink,
+    DirectorySink,
+    MemorySink,
+    OutputSink,
+)
+
+
+class _BlockedSink(MemorySink):
+    def __init__(self) -> None:
+        super().__init__()
+        self.unblocked = threading.Event()
+
+    def write(self, relative_path, content):
+        self.unblocked.wait()
+        super().write(relative_path, content)
+
+
+class _FailingSink(OutputSink):
+    def __init__(self) -> None:
+        self.written = []
+        self.is_discarded = False
+
+    def write(self, relative_path, content):
+        self.written.append(relative_path)
+        raise OSError(f"cannot write {relative_path}")
+
+    def discard(self):
+        self.is_discarded = True
+
+
+def test_files_are_written_once_closed():
+    memory_sink = MemorySink()
+    sink = BackgroundSink(memory_sink)
+
+    for index in range(100):
+        sink.write_text(f"module_{index}.h", f"// {index}\n")
+    sink.close()
+
+    assert len(memory_sink.get_files()) == 100
+    assert memory_sink.get_files()["module_42.h"] == b"// 42\n"
+    assert sink.get_write_time() >= 0
+
+
+def test_generator_waits_for_the_writer_when_files_are_pending():
+    blocked_sink = _BlockedSink()
+    sink = BackgroundSink(blocked_sink, max_pending=1)
+
+    def generate():
+        for index in range(3):
+            sink.write(f"packet_{index}.bin", b"\x00")
+
+    generator = threading.Thread(target=generate)
+    generator.start()
+    # one file is being written and one is pending: the third one waits
+    generator.join(0.2)
+    assert generator.is_alive()
+
+    blocked_sink.unblocked.set()
+    generator.join()
+    sink.close()
+    assert len(blocked_sink.get_files()) == 3
+    assert sink.get_wait_time() > 0
+
+
+def test_failed_write_stops_the_generation():
+    failing_sink = _FailingSink()
+    sink = BackgroundSink(failing_sink, max_pending=1)
+
+    # the error is set once the writer takes the second file, at the latest
+    with pytest.raises(OSError, match="cannot write module_0.h"):
+        for index in range(10):
+            sink.write(f"module_{index}.h", b"")
+    # already raised by write
+    sink.close()
+
+    assert failing_sink.written == ["module_0.h"]
+
+
+def test_failed_write_is_raised_by_close():
+    failing_sink = _FailingSink()
+    sink = BackgroundSink(failing_sink)
+    sink.write("module.h", b"")
+
+    with pytest.raises(OSError, match="cannot write module.h"):
+        sink.close()
+    assert failing_sink.is_discarded
+
+
+def test_each_directory_sink_counts_its_files(tmp_path):
+    first = BackgroundSink(DirectorySink(str(tmp_path)))
+    first.write_text("module.h", "#define A 1\n")
+    first.write_text("module.c", '#include "module.h"\n')
+    first.close()
+
+    second = BackgroundSink(DirectorySink(str(tmp_path)))
+    second.write_text("module.h", "#define A 2\n")
+    second.write_text("module.c", '#include "module.h"\n')
+    second.close()
+
+    assert (first.get_written(), first.get_unchanged()) == (2, 0)
+    assert (second.get_written(), second.get_unchanged()) == (1, 1)
+
+
+def _write_archive(archive_path, sink=None):
+    if sink is None:
+        sink = ArchiveSink(archive_path)
+    sink.write_text("module.h", "#define A 1\n")
+    sink.write_text("module.c", '#include "module.h"\n')
+    sink.close()
+    with open(archive_path, "rb") as archive_file:
+        return archive_file.read()
+
+
+@pytest.mark.parametrize("extension", ArchiveSink.EXTENSIONS)
+def test_same_files_give_the_same_archive(tmp_path, extension):
+    first = _write_archive(str(tmp_path / "first" / f"output{extension}"))
+    second = _write_archive(str(tmp_path / "second" / f"output{extension}"))
+
+    assert first == second
+    # only the archive is written
+    assert os.listdir(str(tmp_path / "first")) == [f"output{extension}"]
+
+
+def test_tar_archive_holds_the_files_in_their_order(tmp_path):
+    archive_path = str(tmp_path / "output.tar.xz")
+    _write_archive(archive_path)
+
+    with tarfile.open(archive_path) as tar_file:
+        members = tar_file.getmembers()
+        assert [member.name for member in members] == ["module.h", "module.c"]
+        assert tar_file.extractfile(members[0]).read() == b"#define A 1\n"
+    assert {(member.mtime, member.mode, member.uid) for member in members} == {
+        (ArchiveSink.TIMESTAMP, 0o644, 0)
+    }
+
+
+def test_zip_archive_holds_the_deflated_files(tmp_path):
+    archive_path = str(tmp_path / "output.zip")
+    _write_archive(archive_path)
+
+    with zipfile.ZipFile(archive_path) as zip_file:
+        infos = zip_file.infolist()
+        assert [info.filename for info in infos] == ["module.h", "module.c"]
+        assert zip_file.read("module.h") == b"#define A 1\n"
+    assert {(info.date_time, info.compress_type) for info in infos} == {
+        (ArchiveSink.DATE_TIME, zipfile.ZIP_DEFLATED)
+    }
+
+
+def test_unchanged_archive_is_not_written_again(tmp_path):
+    archive_path = str(tmp_path / "output.tgz")
+    _write_archive(archive_path)
+    os.utime(archive_path, (0, 0))
+
+    sink = ArchiveSink(archive_path)
+    _write_archive(archive_path, sink)
+
+    assert os.path.getmtime(archive_path) == 0
+    assert (sink.get_written(), sink.get_unchanged()) == (0, 1)
+    assert os.listdir(str(tmp_path)) == ["output.tgz"]
+
+
+def test_discarded_archive_is_not_written(tmp_path):
+    sink = ArchiveSink(str(tmp_path / "output.tar"))
+    sink.write("module.h", b"")
+    sink.discard()
+
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_file_written_twice_into_an_archive_is_rejected(tmp_path):
+    sink = ArchiveSink(str(tmp_path / "output.zip"))
+    sink.write("module.h", b"")
+
+    with pytest.raises(ValueError, match="'module.h' is written twice"):
+        sink.write("module.h", b"")
+    sink.discard()
+
+
+def test_archive_format_is_given_by_its_extension(tmp_path):
+    with pytest.raises(ValueError, match="must end with one of .tar"):
+        ArchiveSink(str(tmp_path / "output.rar"))
@@ -0,0 +1,36 @@
+import os
+
+from asn1_parser.output_writer import OutputWriter
+
+
+def test_unchanged_files_are_not_written_again(tmp_path):
+    file_path = str(tmp_path / "module.h")
+
+    assert OutputWriter.write_text(file_path, "int a;\n")
+    os.utime(file_path, (0, 0))
+    assert not OutputWriter.write_text(file_path, "int a;\n")
+
+    assert os.path.getmtime(file_path) == 0
+
+
+def test_changed_files_are_replaced(tmp_path):
+    file_path = str(tmp_path / "packet.bin")
+    OutputWriter.write(file_path, b"\x01\x02")
+
+    assert OutputWriter.write(file_path, b"\x01\x03")
+
+    with open(file_path, "rb") as file:
+        assert file.read() == b"\x01\x03"
+    # no temporary file is left behind
+    assert os.listdir(tmp_path) == ["packet.bin"]
+
+
+def test_files_are_created_with_the_default_permissions(tmp_path):
+    file_path = str(tmp_path / "module.c")
+    default_path = str(tmp_path / "default.c")
+    with open(default_path, "w", encoding="utf-8"):
+        pass
+
+    OutputWriter.write_text(file_path, "")
+
+    assert os.stat(file_path).st_mode == os.stat(default_path).st_mode